@@ -2,12 +2,76 @@
 
 from __future__ import annotations
 
+import functools
+import hashlib
+import json
+import logging
+from pathlib import Path
+from typing import Mapping
+
+import matplotlib
 import matplotlib.pyplot as plt
 import pandas as pd
 
 from .io_utils import resolve_path
 
 
+RENDER_KEY_SUFFIX = ".render-key"
+
+
+def render_key(data_path: Path, chart: str, params: Mapping) -> str:
+    """Hash of the plotted data file, the chart (name and layout version) and its parameters."""
+
+    digest = hashlib.sha256()
+    header = {"chart": chart, "params": params, "matplotlib": matplotlib.__version__}
+    digest.update(json.dumps(header, sort_keys=True, default=str).encode("utf-8"))
+    with data_path.open("rb") as fh:
+        for chunk in iter(lambda: fh.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cached_render(version: int = 1):
+    """Skip re-rendering a chart whose data and parameters are unchanged.
+
+    The decorated ``plot(data_filename, output_filename, *, plt_module=None, **params)``
+    runs only when the render key differs from the one recorded next to the
+    output (``<output>.render-key``), or when the output was replaced or
+    removed since. Bump ``version`` when the chart layout changes; pass
+    ``force=True`` to render regardless.
+    """
+
+    def decorator(plot):
+        @functools.wraps(plot)
+        def wrapper(data_filename, output_filename, *, plt_module=None, force: bool = False, **params):
+            output_path = resolve_path(output_filename)
+            marker_path = output_path.with_name(output_path.name + RENDER_KEY_SUFFIX)
+            try:
+                key = render_key(resolve_path(data_filename), f"{plot.__name__}:v{version}", params)
+            except FileNotFoundError:
+                key = None
+
+            if key is not None and not force and output_path.exists() and marker_path.exists():
+                try:
+                    marker = json.loads(marker_path.read_text(encoding="utf-8"))
+                except json.JSONDecodeError:
+                    marker = {}
+                if marker == {"key": key, "mtime_ns": output_path.stat().st_mtime_ns}:
+                    logging.info("Chart %s is up to date; not re-rendering", output_path)
+                    return None
+
+            result = plot(data_filename, output_filename, plt_module=plt_module, **params)
+            if key is not None and output_path.exists():
+                marker = {"key": key, "mtime_ns": output_path.stat().st_mtime_ns}
+                marker_path.write_text(json.dumps(marker), encoding="utf-8")
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+@cached_render()
 def plot_velocity_cycle_time(
     data_filename: str,
     output_filename: str,
@@ -43,3 +107,106 @@ def plot_velocity_cycle_time(
     fig.tight_layout()
     fig.legend(loc="upper right", bbox_to_anchor=(1, 1), bbox_transform=ax1.transAxes)
     plt_mod.savefig(output_path)
+
+
+@cached_render()
+def plot_burndown(
+    data_filename: str,
+    output_filename: str,
+    *,
+    plt_module=None,
+) -> None:
+    data_path = resolve_path(data_filename)
+    output_path = resolve_path(output_filename)
+
+    with data_path.open("r", encoding="utf-8") as fh:
+        data = json.load(fh)
+
+    days = data["date"]
+    plt_mod = plt_module or plt
+
+    fig, ax = plt_mod.subplots(figsize=(8, 5))
+    ax.plot(days, data["remaining"], color="#d62728", marker="o", linewidth=2, label="Remaining (burndown)")
+    ax.plot(days, data["ideal"], color="#7f7f7f", linestyle="--", label="Ideal")
+    ax.plot(days, data["completed"], color="#2ca02c", marker="o", linewidth=2, label="Completed (burnup)")
+    ax.step(days, data["scope"], color="#1f77b4", where="post", label="Scope")
+    ax.set_ylabel("Story Points")
+    ax.set_xlabel("Day")
+    ax.tick_params(axis="x", rotation=90)
+    ax.set_ylim(0, max(data["scope"] + [1]) * 1.15)
+
+    ax.set_title(f"Sprint Burndown & Burnup: {data.get('sprint') or ''}".rstrip(": "))
+    ax.legend(loc="upper right")
+    fig.tight_layout()
+    plt_mod.savefig(output_path)
+
+
+@cached_render()
+def plot_cumulative_flow(
+    data_filename: str,
+    output_filename: str,
+    *,
+    plt_module=None,
+) -> None:
+    data_path = resolve_path(data_filename)
+    output_path = resolve_path(output_filename)
+
+    with data_path.open("r", encoding="utf-8") as fh:
+        data = json.load(fh)
+
+    days = data["date"]
+    # Stack the last workflow status (Done) at the bottom, as CFDs are usually read.
+    statuses = list(reversed(data["statuses"]))
+    plt_mod = plt_module or plt
+
+    fig, ax = plt_mod.subplots(figsize=(10, 5))
+    ax.stackplot(days, *[data["counts"][status] for status in statuses], labels=statuses)
+    ax.set_ylabel("Issues")
+    ax.set_xlabel("Day")
+    ax.tick_params(axis="x", rotation=90)
+
+    ax.set_title("Cumulative Flow")
+    ax.legend(loc="upper left")
+    fig.tight_layout()
+    plt_mod.savefig(output_path)
+
+
+@cached_render()
+def plot_cycle_time_distribution(
+    data_filename: str,
+    output_filename: str,
+    *,
+    plt_module=None,
+) -> None:
+    data_path = resolve_path(data_filename)
+    output_path = resolve_path(output_filename)
+
+    with data_path.open("r", encoding="utf-8") as fh:
+        data = json.load(fh)
+
+    edges = data["histogram"]["edges"]
+    totals = data["histogram"]["total"]
+    sprints = data["sprints"]
+    plt_mod = plt_module or plt
+
+    fig, (ax1, ax2) = plt_mod.subplots(1, 2, figsize=(12, 5))
+
+    widths = [high - low for low, high in zip(edges, edges[1:])]
+    ax1.bar(edges[:-1], totals, width=widths, align="edge", color="#1f77b4", edgecolor="white")
+    ax1.set_xlabel("Cycle Time (days)")
+    ax1.set_ylabel("Issues")
+    ax1.set_title("Cycle Time Histogram")
+
+    for index, sprint in enumerate(sprints):
+        ax2.scatter([index] * len(sprint["cycle_times"]), sprint["cycle_times"], color="#1f77b4", alpha=0.5, s=12)
+    positions = list(range(len(sprints)))
+    for q, color in zip(data["percentiles"], ("#2ca02c", "#ff7f0e", "#d62728")):
+        ax2.plot(positions, data["rolling"][f"p{q}"], color=color, linewidth=2, label=f"Rolling p{q}")
+    ax2.set_xticks(positions)
+    ax2.set_xticklabels([sprint["name"] for sprint in sprints], rotation=90)
+    ax2.set_ylabel("Cycle Time (days)")
+    ax2.set_title("Cycle Time per Sprint")
+    ax2.legend(loc="upper right")
+
+    fig.tight_layout()
+    plt_mod.savefig(output_path)
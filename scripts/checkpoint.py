@@ -0,0 +1,82 @@
+"""Resumable progress checkpoints for long extractions."""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+
+from .io_utils import resolve_path
+
+
+DEFAULT_CHECKPOINT_FILE = "checkpoint.json"
+
+
+class Checkpoint:
+    """Results of finished work units, persisted after each unit.
+
+    Units are grouped in sections (one per task, e.g. ``sprints_dataset``)
+    and keyed by their id (sprint id, epic key). The state is tied to a run
+    ``signature`` so a resume with different parameters starts over instead
+    of mixing results. Writes go to a temporary file that replaces the
+    checkpoint, so an interrupted write never leaves a truncated file.
+    """
+
+    def __init__(self, path, signature: dict, sections: dict | None = None):
+        self.path = path
+        self.signature = signature
+        self.sections: dict[str, dict] = sections or {}
+        self.resumed = 0
+
+    @classmethod
+    def open(cls, filename=DEFAULT_CHECKPOINT_FILE, signature: dict | None = None, *, resume: bool = False):
+        path = resolve_path(filename)
+        signature = signature or {}
+        if resume and path.exists():
+            try:
+                state = json.loads(path.read_text(encoding="utf-8"))
+            except json.JSONDecodeError:
+                logging.warning("Ignoring unreadable checkpoint %s", path)
+            else:
+                if state.get("signature") == signature:
+                    return cls(path, signature, state.get("sections"))
+                logging.warning("Checkpoint %s belongs to a run with other parameters; starting over", path)
+        elif resume:
+            logging.warning("No checkpoint found at %s; starting from the beginning", path)
+        return cls(path, signature)
+
+    def get(self, section: str, key):
+        value = self.sections.get(section, {}).get(str(key))
+        if value is not None:
+            self.resumed += 1
+        return value
+
+    def put(self, section: str, key, value) -> None:
+        self.sections.setdefault(section, {})[str(key)] = value
+        self.save()
+
+    def save(self) -> None:
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with tmp_path.open("w", encoding="utf-8") as fh:
+            json.dump({"signature": self.signature, "sections": self.sections}, fh, default=str)
+        os.replace(tmp_path, self.path)
+
+    def clear(self) -> None:
+        """Forget all progress once the run has finished.
+
+        The file is only removed when it holds this run's signature; a
+        checkpoint left by an interrupted run with other parameters is kept so
+        that run can still be resumed.
+        """
+
+        self.sections = {}
+        if not self.path.exists():
+            return
+        try:
+            stored = json.loads(self.path.read_text(encoding="utf-8")).get("signature")
+        except (json.JSONDecodeError, AttributeError):
+            stored = None
+        if stored != self.signature:
+            logging.warning("Keeping checkpoint %s: it belongs to a run with other parameters", self.path)
+            return
+        self.path.unlink()
@@ -2,13 +2,18 @@
 
 from __future__ import annotations
 
+import json
 import logging
 import os
 import sys
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable
 
 from dotenv import load_dotenv
 
+from .io_utils import _config_dir
+
 
 load_dotenv()
 
@@ -61,3 +66,114 @@ def load_runtime_config() -> JiraRuntimeConfig:
         story_points_field=story_points_field,
         sample_issue_key=sample_issue_key,
     )
+
+
+class FieldAccessor:
+    """Read an issue field that may live under one of several names.
+
+    Candidates are probed in order on every call and the first one holding a
+    value wins. Nothing is remembered between calls: accessors are shared by
+    every board using the default mapping, and an issue may leave the usual
+    field empty while a later candidate holds the value.
+    """
+
+    def __init__(self, candidates: Iterable[str]):
+        self.candidates = tuple(candidates)
+
+    def __call__(self, fields):
+        for name in self.candidates:
+            value = getattr(fields, name, None)
+            if value:
+                return value
+        return None
+
+
+@dataclass(frozen=True)
+class WorkflowMapping:
+    """Board workflow statuses and custom field names, compiled for constant-time lookups."""
+
+    in_progress_statuses: frozenset[str] = frozenset({"Analysis", "Kickoff", "In Progress"})
+    done_statuses: frozenset[str] = frozenset({"Closed", "Release Ready"})
+    blocked_statuses: frozenset[str] = frozenset({"Blocked"})
+    epic_field: FieldAccessor = field(
+        default_factory=lambda: FieldAccessor(("epic", "epicLink", "customfield_10902", "customfield_10014"))
+    )
+    join_assignee_field: FieldAccessor = field(default_factory=lambda: FieldAccessor(("customfield_17801",)))
+    # Empty means "look the Sprint field up by its schema" where it is needed.
+    sprint_field: FieldAccessor = field(default_factory=lambda: FieldAccessor(()))
+    excluded_key_fragments: tuple[str, ...] = ("ACXRM",)
+
+    def is_excluded(self, key: str | None) -> bool:
+        return bool(key) and any(fragment in key for fragment in self.excluded_key_fragments)
+
+
+DEFAULT_WORKFLOW = WorkflowMapping()
+
+_STATUS_KEYS = ("in_progress_statuses", "done_statuses", "blocked_statuses")
+_FIELD_KEYS = ("epic_field", "join_assignee_field", "sprint_field")
+_WORKFLOW_KEYS = (*_STATUS_KEYS, *_FIELD_KEYS, "excluded_key_fragments")
+
+
+def _string_list(name: str, value) -> list[str]:
+    if isinstance(value, str):
+        value = [value]
+    if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+        logging.error("Workflow mapping '%s' must be a string or a list of strings.", name)
+        sys.exit(1)
+    return value
+
+
+def compile_workflow_mapping(settings: dict) -> WorkflowMapping:
+    """Build a ``WorkflowMapping`` from raw settings, keeping defaults for missing keys."""
+
+    unknown = sorted(set(settings) - set(_WORKFLOW_KEYS))
+    if unknown:
+        logging.error("Unknown workflow mapping key(s): %s", ", ".join(unknown))
+        sys.exit(1)
+
+    compiled = {}
+    for key in _STATUS_KEYS:
+        if key in settings:
+            compiled[key] = frozenset(_string_list(key, settings[key]))
+    for key in _FIELD_KEYS:
+        if key in settings:
+            compiled[key] = FieldAccessor(_string_list(key, settings[key]))
+    if "excluded_key_fragments" in settings:
+        compiled["excluded_key_fragments"] = tuple(_string_list("excluded_key_fragments", settings["excluded_key_fragments"]))
+    return WorkflowMapping(**compiled)
+
+
+def _section(content: dict, name: str, path: Path) -> dict:
+    section = content.get(name, {})
+    if not isinstance(section, dict):
+        logging.error("Workflow mapping section '%s' must be an object: %s", name, path)
+        sys.exit(1)
+    return section
+
+
+def load_workflow_mapping(board_id: int | None = None, filename: str | os.PathLike = "workflow.json") -> WorkflowMapping:
+    """Load the workflow mapping for ``board_id`` from the config directory.
+
+    The file holds a ``default`` section and optional per-board sections under
+    ``boards``; a board section overrides the default key by key. Without a
+    file the built-in mapping is used.
+    """
+
+    path = Path(filename)
+    if not path.is_absolute():
+        path = _config_dir() / path
+    if not path.exists():
+        return WorkflowMapping()
+
+    try:
+        content = json.loads(path.read_text(encoding="utf-8"))
+    except json.JSONDecodeError:
+        logging.error("Workflow mapping file is not valid JSON: %s", path)
+        sys.exit(1)
+    if not isinstance(content, dict):
+        logging.error("Workflow mapping file must contain an object: %s", path)
+        sys.exit(1)
+
+    default = _section(content, "default", path)
+    board = _section(_section(content, "boards", path), str(board_id), path)
+    return compile_workflow_mapping({**default, **board})
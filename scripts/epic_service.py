@@ -2,25 +2,41 @@
 
 from __future__ import annotations
 
+from .config import DEFAULT_WORKFLOW, WorkflowMapping
 from .jira_client import JiraService
 
 
-def get_epics_dataset(service: JiraService, epic_keys: list[str]) -> list[dict]:
+def get_epics_dataset(
+    service: JiraService,
+    epic_keys: list[str],
+    store=None,
+    workflow: WorkflowMapping = DEFAULT_WORKFLOW,
+    checkpoint=None,
+) -> list[dict]:
     base_url = service.client_info()
     dataset = []
 
     for key in epic_keys:
+        if checkpoint is not None:
+            record = checkpoint.get("epics_dataset", key)
+            if record is not None:
+                dataset.append(record)
+                continue
         try:
             epic = service.issue(key)
             issues_in_epic = service.search_issues(
                 f'parent = "{key}" OR "Epic Link" = "{key}"', maxResults=False
             )
 
+            if store is not None:
+                store.record_epic(epic.key, epic.fields.summary, f"{base_url}/browse/{epic.key}")
+                store.record_issues(issues_in_epic, None, epic_key=epic.key)
+
             total = len(issues_in_epic)
             stats = {"To Do": 0, "In Progress": 0, "Done": 0}
 
             for issue in issues_in_epic:
-                if "ACXRM" in getattr(issue, "key", ""):
+                if workflow.is_excluded(getattr(issue, "key", "")):
                     total -= 1
                     continue
                 category = issue.fields.status.statusCategory.name
@@ -30,23 +46,36 @@ def get_epics_dataset(service: JiraService, epic_keys: list[str]) -> list[dict]:
             def calc_pct(count):
                 return round((count / total) * 100, 2) if total > 0 else 0
 
-            dataset.append(
-                {
-                    "issue_number": epic.key,
-                    "title": epic.fields.summary,
-                    "link": f"{base_url}/browse/{epic.key}",
-                    "total_issues": total,
-                    "completed": stats["Done"],
-                    "inprogress": stats["In Progress"],
-                    "todo": stats["To Do"],
-                    "percentage_done": calc_pct(stats["Done"]),
-                    "percentage_inprogress": calc_pct(stats["In Progress"]),
-                    "percentage_todo": calc_pct(stats["To Do"]),
-                }
-            )
+            record = {
+                "issue_number": epic.key,
+                "title": epic.fields.summary,
+                "link": f"{base_url}/browse/{epic.key}",
+                "total_issues": total,
+                "completed": stats["Done"],
+                "inprogress": stats["In Progress"],
+                "todo": stats["To Do"],
+                "percentage_done": calc_pct(stats["Done"]),
+                "percentage_inprogress": calc_pct(stats["In Progress"]),
+                "percentage_todo": calc_pct(stats["To Do"]),
+            }
+            dataset.append(record)
+            if checkpoint is not None:
+                if store is not None:
+                    store.commit()
+                checkpoint.put("epics_dataset", key, record)
 
         except Exception as exc:  # pragma: no cover - network error path
             print(f"Error processing Epic {key}: {exc}")
             continue
 
+    if store is not None:
+        store.commit()
     return dataset
+
+
+def get_epics_dataset_from_store(
+    store, epic_keys: list[str], base_url: str | None = None, workflow: WorkflowMapping = DEFAULT_WORKFLOW
+) -> list[dict]:
+    """Answer ``get_epics_dataset`` from the local store without calling Jira."""
+
+    return store.epic_metrics(epic_keys, base_url, excluded_key_fragments=workflow.excluded_key_fragments)
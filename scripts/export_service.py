@@ -0,0 +1,234 @@
+"""Compact, size-budgeted exports of the datasets fed to the insight workflows."""
+
+from __future__ import annotations
+
+import json
+import os
+from collections import defaultdict
+from pathlib import Path
+from typing import Callable, Iterable, Mapping
+
+
+DEFAULT_TOKEN_BUDGET = 8000
+# Rough size of a token in JSON text; the budget only needs to be in the right ballpark.
+CHARS_PER_TOKEN = 4
+CATEGORY_RANK = {"In Progress": 0, "To Do": 1, "Done": 2}
+
+
+def dump_compact(data) -> str:
+    return json.dumps(data, separators=(",", ":"), default=str, ensure_ascii=False)
+
+
+def compact_output_name(filename: str | os.PathLike) -> str:
+    """``active_sprint.json`` -> ``active_sprint.compact.json``."""
+
+    path = Path(filename)
+    return str(path.with_name(f"{path.stem}.compact.json"))
+
+
+def to_table(rows: Iterable[Mapping], columns: Iterable[str] | None = None) -> dict:
+    """Encode records as a header of column names plus one value list per row.
+
+    Without explicit ``columns`` every key seen is a column, except those that
+    are empty in every row.
+    """
+
+    rows = list(rows)
+    if columns is None:
+        seen: dict[str, None] = {}
+        for row in rows:
+            for name, value in row.items():
+                if value is not None and value != "":
+                    seen.setdefault(name, None)
+        columns = seen
+    columns = list(columns)
+    return {"columns": columns, "rows": [[row.get(name) for name in columns] for row in rows]}
+
+
+def fit_rows(rows: list[dict], budget_chars: int | None, priority: Callable) -> tuple[list[dict], list[dict]]:
+    """Split ``rows`` into those that fit ``budget_chars`` and the omitted tail.
+
+    Rows are admitted by ``priority`` (lowest first) while their encoded size
+    fits; kept rows stay in their original order.
+    """
+
+    if budget_chars is None:
+        return rows, []
+    ranked = sorted(range(len(rows)), key=lambda index: priority(rows[index]))
+    kept, omitted = set(), []
+    remaining = budget_chars
+    for index in ranked:
+        size = len(dump_compact(list(rows[index].values()))) + 1
+        if size <= remaining:
+            kept.add(index)
+            remaining -= size
+        else:
+            omitted.append(rows[index])
+    return [row for index, row in enumerate(rows) if index in kept], omitted
+
+
+def _row_budget(document: dict, token_budget: int | None) -> int | None:
+    if not token_budget:
+        return None
+    return max(0, token_budget * CHARS_PER_TOKEN - len(dump_compact(document)))
+
+
+def _number(value) -> float:
+    try:
+        return float(value or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _issue_priority(issue: Mapping):
+    # Blocked and aging work first; finished work is the long tail.
+    return (
+        CATEGORY_RANK.get(issue.get("category"), 1),
+        not issue.get("is_blocked"),
+        not issue.get("is_creep"),
+        -_number(issue.get("days_in_status")),
+    )
+
+
+def compact_sprint_insights(dataset: Mapping, *, token_budget: int | None = DEFAULT_TOKEN_BUDGET) -> dict:
+    """Compact form of the active sprint dataset.
+
+    Issues become a table with epic titles moved to an ``epics`` lookup, and
+    per-assignee and per-epic totals are precomputed. Issues that do not fit
+    ``token_budget`` are dropped (done issues first) and counted in ``omitted``.
+    """
+
+    issues = list(dataset.get("issue_collection", []))
+    epics: dict[str, str | None] = {}
+    by_assignee: dict[str, dict] = defaultdict(lambda: {"issues": 0, "points": 0.0, "done_points": 0.0, "blocked": 0})
+    by_epic: dict[str, dict] = defaultdict(lambda: {"issues": 0, "points": 0.0, "done_points": 0.0})
+    rows = []
+    for issue in issues:
+        points = _number(issue.get("points"))
+        done = issue.get("category") == "Done"
+        assignee = by_assignee[issue.get("assignee") or "Unassigned"]
+        assignee["issues"] += 1
+        assignee["points"] += points
+        assignee["done_points"] += points if done else 0.0
+        assignee["blocked"] += 1 if issue.get("is_blocked") else 0
+        epic_key = issue.get("epic_key")
+        if epic_key:
+            epics.setdefault(epic_key, issue.get("epic_title"))
+            epic = by_epic[epic_key]
+            epic["issues"] += 1
+            epic["points"] += points
+            epic["done_points"] += points if done else 0.0
+        rows.append({name: value for name, value in issue.items() if name != "epic_title"})
+
+    document = {
+        "sprint_info": dataset.get("sprint_info"),
+        "metrics": dataset.get("metrics"),
+        "stages": dataset.get("stages"),
+        "points": dataset.get("points"),
+        "summary": {
+            "by_assignee": to_table(
+                [{"assignee": name, **totals} for name, totals in by_assignee.items()],
+                ("assignee", "issues", "points", "done_points", "blocked"),
+            ),
+            "by_epic": to_table(
+                [{"epic_key": key, **totals} for key, totals in by_epic.items()],
+                ("epic_key", "issues", "points", "done_points"),
+            ),
+            "blocked": sum(1 for issue in issues if issue.get("is_blocked")),
+            "reopened": sum(1 for issue in issues if issue.get("reopen_count")),
+        },
+        "epics": epics,
+        "creep_issues": to_table(dataset.get("creep_issues", []), ("key", "added_at", "points")),
+    }
+    header = to_table(rows)
+    document["issues"] = {"columns": header["columns"], "rows": []}
+    # Reserve room for the largest possible omitted summary.
+    document["omitted"] = {
+        "issues": len(rows),
+        "points": sum(_number(issue.get("points")) for issue in rows),
+        "by_category": {issue.get("category") or "Unknown": len(rows) for issue in rows},
+    }
+
+    kept, omitted = fit_rows(
+        [dict(zip(header["columns"], values)) for values in header["rows"]],
+        _row_budget(document, token_budget),
+        _issue_priority,
+    )
+    document["issues"]["rows"] = to_table(kept, header["columns"])["rows"]
+    del document["omitted"]
+    if omitted:
+        by_category: dict[str, int] = defaultdict(int)
+        for issue in omitted:
+            by_category[issue.get("category") or "Unknown"] += 1
+        document["omitted"] = {
+            "issues": len(omitted),
+            "points": sum(_number(issue.get("points")) for issue in omitted),
+            "by_category": dict(by_category),
+        }
+    return document
+
+
+def _epic_priority(epic: Mapping):
+    done = _number(epic.get("percentage_done"))
+    return (done >= 100, done)
+
+
+def compact_initiatives(groups: Iterable[Mapping], *, token_budget: int | None = DEFAULT_TOKEN_BUDGET) -> dict:
+    """Compact form of the enriched initiatives written by the epics dataset task.
+
+    Epics of every group become one table with a ``group`` column; duplicate
+    fields (``issue_number``, ``total``) are dropped and links shortened to a
+    ``link_template``. Per-group totals are precomputed, and epics that do not
+    fit ``token_budget`` are dropped (finished epics first) and counted in
+    ``omitted``.
+    """
+
+    rows = []
+    link_bases = set()
+    summary = []
+    for group in groups:
+        totals = {"group": group.get("group"), "epics": 0, "total": 0.0, "completed": 0.0, "inprogress": 0.0, "todo": 0.0}
+        for epic in group.get("epics", []):
+            row = {"group": group.get("group")}
+            row.update((name, value) for name, value in epic.items() if name not in ("issue_number", "total"))
+            link, key = row.get("link"), row.get("key")
+            if isinstance(link, str) and key and link.endswith(key):
+                link_bases.add(link[: -len(key)])
+            rows.append(row)
+            totals["epics"] += 1
+            totals["total"] += _number(epic.get("total_issues"))
+            for name in ("completed", "inprogress", "todo"):
+                totals[name] += _number(epic.get(name))
+        totals["percentage_done"] = round(totals["completed"] / totals["total"] * 100, 2) if totals["total"] else 0
+        summary.append(totals)
+
+    document = {
+        "summary": to_table(summary, ("group", "epics", "total", "completed", "inprogress", "todo", "percentage_done"))
+    }
+    if len(link_bases) == 1:
+        document["link_template"] = f"{link_bases.pop()}{{key}}"
+        for row in rows:
+            row.pop("link", None)
+    header = to_table(rows)
+    document["epics"] = {"columns": header["columns"], "rows": []}
+    # Reserve room for the largest possible omitted summary.
+    document["omitted"] = {
+        "epics": len(rows),
+        "total_issues": sum(_number(epic.get("total_issues")) for epic in rows),
+        "completed": sum(_number(epic.get("completed")) for epic in rows),
+    }
+
+    kept, omitted = fit_rows(
+        [dict(zip(header["columns"], values)) for values in header["rows"]],
+        _row_budget(document, token_budget),
+        _epic_priority,
+    )
+    document["epics"]["rows"] = to_table(kept, header["columns"])["rows"]
+    del document["omitted"]
+    if omitted:
+        document["omitted"] = {
+            "epics": len(omitted),
+            "total_issues": sum(_number(epic.get("total_issues")) for epic in omitted),
+            "completed": sum(_number(epic.get("completed")) for epic in omitted),
+        }
+    return document
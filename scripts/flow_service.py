@@ -0,0 +1,388 @@
+"""Flow metrics reconstructed from Jira changelog event streams."""
+
+from __future__ import annotations
+
+import bisect
+import datetime
+from typing import Iterable, Sequence
+
+import numpy as np
+from dateutil import parser
+
+from .config import DEFAULT_WORKFLOW, WorkflowMapping
+from .jira_client import JiraService, fetch_closed_sprints
+from .local_store import parse_sprint_ids
+from .sync_service import search_all_pages
+
+
+DAY_SECONDS = 86400
+
+
+def _epoch_seconds(value) -> float:
+    dt = value if isinstance(value, datetime.datetime) else parser.parse(str(value))
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=datetime.timezone.utc)
+    return dt.timestamp()
+
+
+def _day_start(epoch: float) -> float:
+    return epoch - (epoch % DAY_SECONDS)
+
+
+def _points(issue, sp_field_id: str) -> float:
+    value = getattr(getattr(issue, "fields", None), sp_field_id, 0) or 0
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _status_name(issue) -> str | None:
+    return getattr(getattr(getattr(issue, "fields", None), "status", None), "name", None)
+
+
+def _done_status_names(issues: Sequence, done_statuses: Iterable[str]) -> frozenset:
+    """Statuses that count as done: the mapped ones plus any Jira files under the Done category.
+
+    Changelog items carry status names only, so the category of a status is
+    learned from the issues currently in it.
+    """
+
+    done = set(done_statuses)
+    for issue in issues:
+        category = getattr(getattr(getattr(getattr(issue, "fields", None), "status", None), "statusCategory", None), "name", None)
+        if category == "Done" and _status_name(issue):
+            done.add(_status_name(issue))
+    return frozenset(done)
+
+
+def _issue_events(issue, sprint_id: int, done_statuses: frozenset) -> tuple[bool, bool, list[tuple[float, str, bool]]]:
+    """Return initial membership/done flags and time-ordered state changes for one issue."""
+
+    changes: list[tuple[float, str, bool]] = []
+    first_membership_change = None
+    first_status_change = None
+    histories = getattr(getattr(issue, "changelog", None), "histories", []) or []
+    for history in histories:
+        created = getattr(history, "created", None)
+        if not created:
+            continue
+        at = _epoch_seconds(created)
+        for item in getattr(history, "items", []) or []:
+            field = (getattr(item, "field", "") or "").lower()
+            if field == "status":
+                changes.append((at, "done", getattr(item, "toString", None) in done_statuses))
+                if first_status_change is None or at < first_status_change[0]:
+                    first_status_change = (at, getattr(item, "fromString", None))
+            elif field == "sprint":
+                before = parse_sprint_ids(getattr(item, "from", None))
+                after = parse_sprint_ids(getattr(item, "to", None))
+                if sprint_id in after and sprint_id not in before:
+                    changes.append((at, "member", True))
+                    first_membership_change = first_membership_change or "added"
+                elif sprint_id in before and sprint_id not in after:
+                    changes.append((at, "member", False))
+                    first_membership_change = first_membership_change or "removed"
+
+    changes.sort(key=lambda change: change[0])
+    # Issues with no membership events were in the sprint from the start; an
+    # issue whose first event removes it was a member until then.
+    initially_member = first_membership_change in (None, "removed")
+    # Like the cumulative flow, the starting status is the one the first
+    # transition left; without transitions it is the current status.
+    initial_status = first_status_change[1] if first_status_change else _status_name(issue)
+    return initially_member, initial_status in done_statuses, changes
+
+
+def compute_burndown(
+    issues: Iterable,
+    sprint,
+    sp_field_id: str,
+    *,
+    done_statuses: Iterable[str],
+    now: datetime.datetime | None = None,
+) -> dict:
+    """Per-day scope, completed and remaining points for a sprint.
+
+    Every issue contributes a short, time-ordered list of membership and
+    done-state changes; these become point deltas that are bucketed by day and
+    prefix-summed once, so the cost is linear in the number of events rather
+    than days x issues. Returns a columnar mapping ready for JSON output.
+
+    A status counts as done when it is in ``done_statuses`` or Jira files it
+    under the Done category, the rule the active sprint's completed points use.
+    """
+
+    issues = list(issues)
+    done = _done_status_names(issues, done_statuses)
+    sprint_id = getattr(sprint, "id", None)
+    start = _day_start(_epoch_seconds(sprint.startDate))
+    end_value = getattr(sprint, "completeDate", None) or getattr(sprint, "endDate", None)
+    end = _epoch_seconds(end_value) if end_value else start
+    now_epoch = (now or datetime.datetime.now(datetime.timezone.utc)).timestamp()
+    end = max(start, min(end, now_epoch))
+    n_days = int((_day_start(end) - start) // DAY_SECONDS) + 1
+
+    times: list[float] = []
+    scope_deltas: list[float] = []
+    completed_deltas: list[float] = []
+    for issue in issues:
+        points = _points(issue, sp_field_id)
+        member, is_done, changes = _issue_events(issue, sprint_id, done)
+        scope, completed = points * member, points * (member and is_done)
+        times.append(start)
+        scope_deltas.append(scope)
+        completed_deltas.append(completed)
+        for at, kind, value in changes:
+            if kind == "member":
+                member = value
+            else:
+                is_done = value
+            new_scope, new_completed = points * member, points * (member and is_done)
+            if new_scope != scope or new_completed != completed:
+                times.append(at)
+                scope_deltas.append(new_scope - scope)
+                completed_deltas.append(new_completed - completed)
+                scope, completed = new_scope, new_completed
+
+    scope_by_day = np.zeros(n_days)
+    completed_by_day = np.zeros(n_days)
+    if times:
+        day_index = ((np.asarray(times) - start) // DAY_SECONDS).astype(np.int64)
+        np.clip(day_index, 0, None, out=day_index)
+        in_range = day_index < n_days
+        np.add.at(scope_by_day, day_index[in_range], np.asarray(scope_deltas)[in_range])
+        np.add.at(completed_by_day, day_index[in_range], np.asarray(completed_deltas)[in_range])
+    scope_by_day = np.cumsum(scope_by_day)
+    completed_by_day = np.cumsum(completed_by_day)
+
+    planned_end = getattr(sprint, "endDate", None)
+    planned_days = (
+        max(int((_day_start(_epoch_seconds(planned_end)) - start) // DAY_SECONDS), 1) if planned_end else max(n_days - 1, 1)
+    )
+    ideal = np.maximum(scope_by_day[0] * (1 - np.arange(n_days) / planned_days), 0)
+
+    dates = [
+        datetime.datetime.fromtimestamp(start + day * DAY_SECONDS, datetime.timezone.utc).strftime("%Y-%m-%d")
+        for day in range(n_days)
+    ]
+    return {
+        "sprint_id": sprint_id,
+        "sprint": getattr(sprint, "name", None),
+        "date": dates,
+        "scope": scope_by_day.round(2).tolist(),
+        "completed": completed_by_day.round(2).tolist(),
+        "remaining": (scope_by_day - completed_by_day).round(2).tolist(),
+        "ideal": ideal.round(2).tolist(),
+    }
+
+
+def get_sprint_burndown(
+    service: JiraService, board_id: int, sp_field_id: str, workflow: WorkflowMapping = DEFAULT_WORKFLOW
+) -> dict | None:
+    """Burndown of the board's active sprint, or of its latest closed sprint if none is active."""
+
+    sprints = service.sprints(board_id, state="active")
+    if not sprints:
+        sprints = fetch_closed_sprints(service, board_id)
+    if not sprints:
+        return None
+
+    sprint = sprints[0]
+    issues = service.search_issues(f"sprint = {sprint.id}", expand="changelog", maxResults=False)
+    return compute_burndown(issues, sprint, sp_field_id, done_statuses=workflow.done_statuses)
+
+
+def _status_rank(status: str, in_progress: frozenset, done: frozenset) -> tuple[int, str]:
+    if status in done:
+        return (2, status)
+    if status in in_progress:
+        return (1, status)
+    return (0, status)
+
+
+def compute_cumulative_flow(
+    issues: Iterable,
+    *,
+    start: datetime.datetime,
+    end: datetime.datetime,
+    in_progress_statuses: Iterable[str] = (),
+    done_statuses: Iterable[str] = (),
+    status_order: list[str] | None = None,
+) -> dict:
+    """Per-day count of issues in each status between ``start`` and ``end``.
+
+    Issue creation and every status transition become +1/-1 events on a
+    (status x day) NumPy grid; a single cumulative sum along the day axis then
+    yields the counts, so cost grows with events, not with days x issues.
+    """
+
+    start_day = _day_start(_epoch_seconds(start))
+    n_days = int((_day_start(_epoch_seconds(end)) - start_day) // DAY_SECONDS) + 1
+
+    status_index: dict[str, int] = {}
+    event_status: list[int] = []
+    event_time: list[float] = []
+    event_delta: list[int] = []
+
+    def _emit(status, at, delta):
+        if status is None:
+            return
+        index = status_index.setdefault(status, len(status_index))
+        event_status.append(index)
+        event_time.append(at)
+        event_delta.append(delta)
+
+    for issue in issues:
+        fields = getattr(issue, "fields", None)
+        transitions = []
+        histories = getattr(getattr(issue, "changelog", None), "histories", []) or []
+        for history in histories:
+            for item in getattr(history, "items", []) or []:
+                if (getattr(item, "field", "") or "").lower() == "status":
+                    transitions.append(
+                        (_epoch_seconds(history.created), getattr(item, "fromString", None), getattr(item, "toString", None))
+                    )
+        transitions.sort(key=lambda transition: transition[0])
+
+        current = getattr(getattr(fields, "status", None), "name", None)
+        initial = transitions[0][1] if transitions else current
+        created = getattr(fields, "created", None)
+        _emit(initial, _epoch_seconds(created) if created else start_day, 1)
+        for at, from_status, to_status in transitions:
+            _emit(from_status, at, -1)
+            _emit(to_status, at, 1)
+
+    if status_order is None:
+        in_progress, done = frozenset(in_progress_statuses), frozenset(done_statuses)
+        status_order = sorted(status_index, key=lambda status: _status_rank(status, in_progress, done))
+    else:
+        status_order = list(status_order) + [status for status in status_index if status not in status_order]
+
+    grid = np.zeros((len(status_index), n_days), dtype=np.int64)
+    if event_time:
+        day_index = ((np.asarray(event_time) - start_day) // DAY_SECONDS).astype(np.int64)
+        np.clip(day_index, 0, None, out=day_index)
+        in_range = day_index < n_days
+        np.add.at(
+            grid,
+            (np.asarray(event_status)[in_range], day_index[in_range]),
+            np.asarray(event_delta)[in_range],
+        )
+    grid = np.cumsum(grid, axis=1)
+
+    dates = [
+        datetime.datetime.fromtimestamp(start_day + day * DAY_SECONDS, datetime.timezone.utc).strftime("%Y-%m-%d")
+        for day in range(n_days)
+    ]
+    return {
+        "date": dates,
+        "statuses": status_order,
+        "counts": {
+            status: (grid[status_index[status]].tolist() if status in status_index else [0] * n_days)
+            for status in status_order
+        },
+    }
+
+
+def get_cumulative_flow(
+    service: JiraService, project_key: str, days: int = 365, workflow: WorkflowMapping = DEFAULT_WORKFLOW
+) -> dict:
+    """Cumulative flow of ``project_key`` over the last ``days`` days.
+
+    Every issue created by the end of the window is read, not only those
+    updated inside it: an issue that sat untouched in one status still counts
+    in that status every day, and its changelog places it before any change.
+    """
+
+    end = datetime.datetime.now(datetime.timezone.utc)
+    start = end - datetime.timedelta(days=days)
+    issues = search_all_pages(
+        service,
+        f'project = {project_key} AND created <= "{end:%Y/%m/%d %H:%M}"',
+        fields="status,created",
+        expand="changelog",
+    )
+    return compute_cumulative_flow(
+        issues,
+        start=start,
+        end=end,
+        in_progress_statuses=workflow.in_progress_statuses,
+        done_statuses=workflow.done_statuses,
+    )
+
+
+def percentile_of_sorted(values: Sequence[float], q: float) -> float | None:
+    """Linear-interpolated percentile (NumPy's default method) of an already sorted sequence."""
+
+    if not values:
+        return None
+    rank = (len(values) - 1) * q / 100
+    low = int(rank)
+    high = min(low + 1, len(values) - 1)
+    return float(values[low] + (values[high] - values[low]) * (rank - low))
+
+
+class CycleTimeDistribution:
+    """Collects per-sprint cycle times and summarizes their distribution.
+
+    Each sprint's cycle times are kept as a compact float32 array. Rolling
+    percentiles over ``window`` consecutive sprints maintain one sorted list
+    that sprints are inserted into and removed from as the window slides,
+    instead of re-sorting every window.
+    """
+
+    def __init__(self, window: int = 3, percentiles: Sequence[int] = (50, 85, 95), bins: int = 10):
+        self.window = window
+        self.percentiles = tuple(percentiles)
+        self.bins = bins
+        self._sprints: list[tuple[str, str, np.ndarray]] = []
+
+    def add(self, sprint, cycle_times: Iterable[float]) -> None:
+        self._sprints.append(
+            (
+                getattr(sprint, "name", "N/A"),
+                getattr(sprint, "completeDate", None) or getattr(sprint, "endDate", None) or "",
+                np.asarray(list(cycle_times), dtype=np.float32),
+            )
+        )
+
+    def summary(self) -> dict:
+        ordered = sorted(self._sprints, key=lambda entry: entry[1])
+        everything = np.concatenate([times for _, _, times in ordered]) if ordered else np.zeros(0, np.float32)
+        upper = float(everything.max()) if everything.size else 1.0
+        edges = np.linspace(0.0, max(upper, 1.0), self.bins + 1)
+
+        sprints = []
+        histogram = {}
+        for name, _, times in ordered:
+            stats = np.percentile(times, self.percentiles) if times.size else [None] * len(self.percentiles)
+            entry = {"name": name, "count": int(times.size)}
+            for q, value in zip(self.percentiles, stats):
+                entry[f"p{q}"] = None if value is None else round(float(value), 2)
+            entry["cycle_times"] = np.round(times, 2).tolist()
+            sprints.append(entry)
+            histogram[name] = np.histogram(times, bins=edges)[0].tolist()
+
+        rolling = {f"p{q}": [] for q in self.percentiles}
+        window_values: list[float] = []
+        for index, (_, _, times) in enumerate(ordered):
+            for value in times.tolist():
+                bisect.insort(window_values, value)
+            if index >= self.window:
+                for value in ordered[index - self.window][2].tolist():
+                    del window_values[bisect.bisect_left(window_values, value)]
+            for q in self.percentiles:
+                value = percentile_of_sorted(window_values, q)
+                rolling[f"p{q}"].append(None if value is None else round(value, 2))
+
+        return {
+            "percentiles": list(self.percentiles),
+            "sprints": sprints,
+            "histogram": {
+                "edges": np.round(edges, 2).tolist(),
+                "counts": histogram,
+                "total": np.histogram(everything, bins=edges)[0].tolist(),
+            },
+            "rolling": {"window": self.window, **rolling},
+        }
@@ -0,0 +1,217 @@
+"""Monte Carlo delivery forecasts for epics and initiatives."""
+
+from __future__ import annotations
+
+import csv
+import datetime
+import json
+import math
+import os
+from typing import Iterable, Mapping, Sequence
+
+import numpy as np
+from dateutil import parser
+
+from .io_utils import resolve_path
+
+
+DEFAULT_TRIALS = 10_000
+DEFAULT_PERCENTILES = (50, 85, 95)
+DEFAULT_SPRINT_LENGTH_DAYS = 14.0
+THROUGHPUT_COLUMN = "CompletedIssues"
+# Trials that have not finished after this many sprints are reported as
+# open-ended rather than extending the simulation indefinitely.
+MAX_HORIZON_SPRINTS = 520
+
+
+def load_sprint_rows(filename: str | os.PathLike) -> list[dict]:
+    """Read the sprint dataset CSV written by the sprints_dataset task."""
+
+    with resolve_path(filename).open("r", newline="", encoding="utf-8") as fh:
+        return list(csv.DictReader(fh))
+
+
+def load_epic_groups(filename: str | os.PathLike) -> list[dict]:
+    """Read the enriched initiatives JSON written by the epics_dataset task."""
+
+    with resolve_path(filename).open("r", encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+def sprint_throughput(rows: Iterable[Mapping], column: str = THROUGHPUT_COLUMN) -> np.ndarray:
+    """Return the per-sprint throughput samples found in ``column``."""
+
+    samples = []
+    for row in rows:
+        value = row.get(column)
+        try:
+            samples.append(float(value))
+        except (TypeError, ValueError):
+            continue
+    return np.asarray(samples, dtype=np.float64)
+
+
+def sprint_length_days(rows: Iterable[Mapping], default: float = DEFAULT_SPRINT_LENGTH_DAYS) -> float:
+    """Median calendar length of the sprints in the dataset, in days."""
+
+    lengths = []
+    for row in rows:
+        try:
+            start = parser.parse(row["StartDate"])
+            end = parser.parse(row["EndDate"])
+        except (KeyError, TypeError, ValueError, OverflowError):
+            continue
+        days = (end - start).total_seconds() / 86400
+        if days > 0:
+            lengths.append(days)
+    return float(np.median(lengths)) if lengths else default
+
+
+def simulate_sprints_to_complete(
+    remaining: Sequence[float],
+    throughput: Sequence[float],
+    *,
+    trials: int = DEFAULT_TRIALS,
+    horizon: int | None = None,
+    rng: np.random.Generator | None = None,
+) -> np.ndarray:
+    """Sample how many sprints each backlog in ``remaining`` needs to finish.
+
+    Every trial draws one sequence of sprint throughputs (with replacement from
+    the historical samples) shared by all backlogs, so the whole simulation is a
+    single ``trials x horizon`` cumulative sum. Rows are shifted by a per-trial
+    offset so the flattened sums stay sorted, which lets one ``searchsorted``
+    call find the finishing sprint of every backlog in every trial at once.
+
+    Returns a ``trials x len(remaining)`` float array; trials that do not finish
+    within ``horizon`` sprints are ``inf``.
+    """
+
+    remaining = np.asarray(remaining, dtype=np.float64)
+    samples = np.asarray(throughput, dtype=np.float64)
+    result = np.zeros((trials, remaining.size), dtype=np.float64)
+    if remaining.size == 0:
+        return result
+    if samples.size == 0 or samples.max() <= 0:
+        result[:, remaining > 0] = np.inf
+        return result
+
+    if horizon is None:
+        horizon = math.ceil(2 * remaining.max() / samples.mean()) + 10
+    horizon = max(1, min(horizon, MAX_HORIZON_SPRINTS))
+
+    rng = rng if rng is not None else np.random.default_rng()
+    cumulative = np.cumsum(rng.choice(samples, size=(trials, horizon)), axis=1)
+
+    span = max(cumulative[:, -1].max(), remaining.max()) + 1
+    offsets = np.arange(trials, dtype=np.float64)[:, None] * span
+    positions = np.searchsorted((cumulative + offsets).ravel(), remaining[None, :] + offsets, side="left")
+    positions -= np.arange(trials)[:, None] * horizon
+
+    result[:] = positions + 1
+    result[positions >= horizon] = np.inf
+    result[:, remaining <= 0] = 0
+    return result
+
+
+def _summarize(
+    sprints: np.ndarray,
+    percentiles: Sequence[int],
+    start: datetime.date,
+    length_days: float,
+) -> tuple[dict, dict]:
+    by_sprints = {}
+    by_date = {}
+    values = np.percentile(sprints, percentiles, method="higher") if sprints.size else [np.inf] * len(percentiles)
+    for q, value in zip(percentiles, values):
+        if np.isfinite(value):
+            by_sprints[f"p{q}"] = int(value)
+            by_date[f"p{q}"] = (start + datetime.timedelta(days=float(value) * length_days)).isoformat()
+        else:
+            by_sprints[f"p{q}"] = None
+            by_date[f"p{q}"] = None
+    return by_sprints, by_date
+
+
+def _remaining(epic: Mapping) -> float:
+    total = epic.get("total_issues", epic.get("total")) or 0
+    completed = epic.get("completed") or 0
+    return max(0.0, float(total) - float(completed))
+
+
+def forecast_delivery(
+    epic_groups: Iterable[Mapping],
+    sprint_rows: Sequence[Mapping],
+    *,
+    trials: int = DEFAULT_TRIALS,
+    percentiles: Sequence[int] = DEFAULT_PERCENTILES,
+    column: str = THROUGHPUT_COLUMN,
+    start: datetime.date | None = None,
+    seed: int | None = None,
+) -> dict:
+    """Forecast completion dates of every epic and initiative group.
+
+    Each epic is forecast as if the team's sampled throughput went to it alone;
+    an initiative pools the remaining issues of its epics, so its forecast is
+    when the team would finish all of them. Epics shared by several groups are
+    simulated once.
+    """
+
+    groups = list(epic_groups)
+    start = start or datetime.date.today()
+    length_days = sprint_length_days(sprint_rows)
+    throughput = sprint_throughput(sprint_rows, column)
+
+    epics: dict[str, Mapping] = {}
+    for group in groups:
+        for epic in group.get("epics", []):
+            key = epic.get("key")
+            if key and key not in epics:
+                epics[key] = epic
+    group_members = [list(dict.fromkeys(e.get("key") for e in g.get("epics", []) if e.get("key"))) for g in groups]
+
+    epic_remaining = {key: _remaining(epic) for key, epic in epics.items()}
+    remaining = [*epic_remaining.values()]
+    remaining += [sum(epic_remaining[key] for key in members) for members in group_members]
+
+    simulated = simulate_sprints_to_complete(
+        remaining, throughput, trials=trials, rng=np.random.default_rng(seed)
+    )
+
+    epic_forecasts = []
+    for index, (key, epic) in enumerate(epics.items()):
+        by_sprints, by_date = _summarize(simulated[:, index], percentiles, start, length_days)
+        epic_forecasts.append(
+            {
+                "key": key,
+                "title": epic.get("title"),
+                "link": epic.get("link"),
+                "remaining": epic_remaining[key],
+                "sprints": by_sprints,
+                "dates": by_date,
+            }
+        )
+
+    initiative_forecasts = []
+    for offset, (group, members) in enumerate(zip(groups, group_members)):
+        column_index = len(epics) + offset
+        by_sprints, by_date = _summarize(simulated[:, column_index], percentiles, start, length_days)
+        initiative_forecasts.append(
+            {
+                "group": group.get("group", group.get("name")),
+                "epics": members,
+                "remaining": remaining[column_index],
+                "sprints": by_sprints,
+                "dates": by_date,
+            }
+        )
+
+    return {
+        "start": start.isoformat(),
+        "trials": trials,
+        "percentiles": list(percentiles),
+        "sprint_length_days": round(length_days, 2),
+        "throughput": {"column": column, "samples": throughput.tolist()},
+        "epics": epic_forecasts,
+        "initiatives": initiative_forecasts,
+    }
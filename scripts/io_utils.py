@@ -6,7 +6,6 @@ import csv
 import json
 import os
 from pathlib import Path
-from copy import deepcopy
 from typing import Iterable, Mapping
 
 
@@ -81,17 +80,25 @@ def write_dataset_to_csv(dataset: list[Mapping], filename: str | os.PathLike) ->
             writer.writerow(row)
 
 
-def write_dataset_to_json(data, filename: str | os.PathLike) -> bool:
+def write_dataset_to_json(data, filename: str | os.PathLike, *, compact: bool = False) -> bool:
+    """Write ``data`` as indented JSON, or on a single line without spaces when ``compact``."""
+
     filepath = resolve_path(filename)
+    layout = {"separators": (",", ":")} if compact else {"indent": 4}
     try:
         with filepath.open("w", encoding="utf-8") as fh:
-            json.dump(data, fh, indent=4, default=str, ensure_ascii=False)
+            json.dump(data, fh, default=str, ensure_ascii=False, **layout)
         return True
     except Exception as exc:  # pragma: no cover - IO edge case
         print(f"Error saving JSON: {exc}")
         return False
 
 
+def read_dataset_from_json(filename: str | os.PathLike):
+    with resolve_path(filename).open("r", encoding="utf-8") as fh:
+        return json.load(fh)
+
+
 def load_initiatives(filename: str | os.PathLike = "initiatives.json") -> list[dict]:
     """Load and validate the initiatives structure from disk."""
 
@@ -105,59 +112,73 @@ def load_epic_keys_from_initiatives(
 
     content = _load_and_validate_initiatives(_resolve_initiatives_path(filename))
 
-    epic_keys: list[str] = []
-    for group in content:
-        epics = group.get("epics", [])
-        for epic in epics:
-            key = epic["key"]
-            if key not in epic_keys:
-                epic_keys.append(key)
-
+    epic_keys = collect_epic_keys([content])
     if not epic_keys:
         raise InitiativeLoadError("No epic keys found in initiatives file")
 
     return epic_keys
 
 
+def collect_epic_keys(initiative_sets: Iterable[Iterable[Mapping]]) -> list[str]:
+    """Return the unique epic keys of one or more initiatives structures, in first-seen order."""
+
+    keys: dict[str, None] = {}
+    for initiatives in initiative_sets:
+        for group in initiatives:
+            for epic in group.get("epics", []):
+                key = epic.get("key")
+                if key:
+                    keys.setdefault(key, None)
+    return list(keys)
+
+
+def index_epic_metrics(epic_dataset: Iterable[Mapping]) -> dict[str, dict]:
+    """Map each epic key to the metric fields merged into initiative epics."""
+
+    index: dict[str, dict] = {}
+    for metrics in epic_dataset:
+        key = metrics.get("issue_number")
+        if not key:
+            continue
+        index[key] = {
+            "issue_number": key,
+            "title": metrics.get("title"),
+            "link": metrics.get("link"),
+            "total": metrics.get("total_issues"),
+            "total_issues": metrics.get("total_issues"),
+            "completed": metrics.get("completed"),
+            "inprogress": metrics.get("inprogress"),
+            "todo": metrics.get("todo"),
+            "percentage_done": metrics.get("percentage_done"),
+            "percentage_inprogress": metrics.get("percentage_inprogress"),
+            "percentage_todo": metrics.get("percentage_todo"),
+        }
+    return index
+
+
 def merge_initiatives_with_epic_metrics(
     initiatives: Iterable[Mapping],
-    epic_dataset: Iterable[Mapping],
+    epic_dataset: Iterable[Mapping] = (),
+    *,
+    epic_index: Mapping[str, Mapping] | None = None,
 ) -> list[dict]:
-    """Return a deep-copied initiatives structure enriched with epic metrics."""
+    """Return a copy of the initiatives structure enriched with epic metrics.
 
-    epic_by_key = {}
-    for entry in epic_dataset:
-        key = entry.get("issue_number")
-        if not key:
-            continue
-        epic_by_key[key] = entry
+    Groups and epics are copied shallowly; the input is never modified. Pass a
+    prebuilt ``epic_index`` from ``index_epic_metrics`` to enrich several
+    initiatives structures from the same metrics.
+    """
 
-    enriched_groups: list[dict] = []
+    if epic_index is None:
+        epic_index = index_epic_metrics(epic_dataset)
 
+    enriched_groups: list[dict] = []
     for group in initiatives:
-        group_copy = {k: deepcopy(v) for k, v in group.items() if k != "epics"}
+        group_copy = {k: v for k, v in group.items() if k != "epics"}
         group_epics = []
         for epic in group.get("epics", []):
-            epic_copy = dict(epic)
-            epic_key = epic_copy.get("key")
-            metrics = epic_by_key.get(epic_key)
-            if metrics:
-                epic_copy.update(
-                    {
-                        "issue_number": metrics.get("issue_number", epic_key),
-                        "title": metrics.get("title"),
-                        "link": metrics.get("link"),
-                        "total": metrics.get("total_issues"),
-                        "total_issues": metrics.get("total_issues"),
-                        "completed": metrics.get("completed"),
-                        "inprogress": metrics.get("inprogress"),
-                        "todo": metrics.get("todo"),
-                        "percentage_done": metrics.get("percentage_done"),
-                        "percentage_inprogress": metrics.get("percentage_inprogress"),
-                        "percentage_todo": metrics.get("percentage_todo"),
-                    }
-                )
-            group_epics.append(epic_copy)
+            metrics = epic_index.get(epic.get("key"))
+            group_epics.append({**epic, **metrics} if metrics else dict(epic))
         group_copy["epics"] = group_epics
         enriched_groups.append(group_copy)
 
@@ -2,38 +2,276 @@
 
 from __future__ import annotations
 
+import json
 import logging
 import sys
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from threading import Lock
+from types import SimpleNamespace
 
 from jira import JIRA
 
 
+RAW_SEARCH_PAGE_SIZE = 100
+CHANGELOG_PAGE_SIZE = 100
+DEFAULT_CHANGELOG_WORKERS = 4
+DEFAULT_MEMO_SIZE = 256
+# Same precedence the jira library uses to render a resource as text.
+_READABLE_IDS = ("displayName", "key", "name", "accountId", "filename", "value", "scope", "votes", "id", "mimeType", "closed")
+
+
+class RawRecord(SimpleNamespace):
+    """Compact stand-in for a jira ``Resource`` decoded straight from JSON.
+
+    Fields are plain attributes, so the services' ``getattr`` reads run at
+    native speed, and ``str()`` renders like a ``Resource`` (display name,
+    key, name, ...).
+    """
+
+    __slots__ = ()
+
+    def __str__(self) -> str:
+        values = vars(self)
+        for name in _READABLE_IDS:
+            if name in values:
+                return str(values[name])
+        return repr(self)
+
+
+def _raw_record(values: dict) -> RawRecord:
+    return RawRecord(**values)
+
+
+class MemoCache:
+    """Size-bounded LRU of request results with single-flight loading.
+
+    The first caller of a missing key runs the loader; concurrent callers of
+    the same key wait for that call instead of issuing their own. Failures are
+    not cached, so the next caller retries.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MEMO_SIZE):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self._entries = OrderedDict()
+        self._inflight: dict = {}
+        self._lock = Lock()
+
+    def get(self, key, loader):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
+                self.misses += 1
+            else:
+                self.coalesced += 1
+        if not owner:
+            return future.result()
+
+        try:
+            value = loader()
+        except BaseException as exc:
+            with self._lock:
+                del self._inflight[key]
+            future.set_exception(exc)
+            raise
+        with self._lock:
+            del self._inflight[key]
+            if self.max_entries > 0:
+                self._entries[key] = value
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        future.set_result(value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def counters(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "coalesced": self.coalesced, "size": len(self._entries)}
+
+
 class JiraService:
-    """Thin wrapper over the jira client to simplify dependency injection."""
+    """Thin wrapper over the jira client to simplify dependency injection.
+
+    With ``raw_search`` enabled, ``search_issues`` reads the REST search
+    endpoint directly and returns ``RawRecord`` objects instead of building
+    ``Resource`` trees. Clients without an HTTP session (test doubles) and
+    failed raw requests fall back to the jira library's object path.
 
-    def __init__(self, client: JIRA):
+    Jira truncates changelogs expanded on search results. Searches that
+    expand ``changelog`` therefore check every issue's ``total`` against the
+    histories returned and complete the short ones through the paged
+    changelog endpoint, ``changelog_workers`` issues at a time;
+    ``changelog_counters`` records how often that was needed.
+
+    Issues, projects, sprint lists, fields and client info are memoized in a
+    ``memo_size`` LRU for the life of the service, with concurrent requests for
+    the same resource coalesced into one; ``clear_memo`` drops them.
+    """
+
+    def __init__(
+        self,
+        client: JIRA,
+        *,
+        raw_search: bool = True,
+        changelog_workers: int = DEFAULT_CHANGELOG_WORKERS,
+        memo_size: int = DEFAULT_MEMO_SIZE,
+    ):
         self._client = client
+        self._http = hasattr(client, "_session") and hasattr(client, "_get_url")
+        self._raw_search = raw_search and self._http
+        self._changelog_workers = changelog_workers
+        self.changelog_counters = {"checked": 0, "truncated": 0, "histories_fetched": 0, "fallbacks": 0}
+        self._memo = MemoCache(memo_size)
 
     @property
     def client(self) -> JIRA:
         return self._client
 
-    def project(self, key: str):  # pragma: no cover - pass-through
-        return self._client.project(key)
+    @property
+    def memo_counters(self) -> dict:
+        return self._memo.counters()
+
+    def clear_memo(self) -> None:
+        self._memo.clear()
+
+    def project(self, key: str):
+        return self._memo.get(("project", key), lambda: self._client.project(key))
 
-    def issue(self, key: str, expand: str | None = None):  # pragma: no cover
+    def issue(self, key: str, expand: str | None = None):
         if expand is None:
-            return self._client.issue(key)
-        return self._client.issue(key, expand=expand)
+            return self._memo.get(("issue", key, None), lambda: self._client.issue(key))
+        return self._memo.get(("issue", key, expand), lambda: self._client.issue(key, expand=expand))
+
+    def search_issues(self, *args, **kwargs):
+        issues = None
+        if self._raw_search:
+            try:
+                issues = self.search_issues_raw(*args, **kwargs)
+            except Exception as exc:
+                logging.warning("Raw Jira search failed, using the jira client instead: %s", exc)
+                self._raw_search = False
+        if issues is None:
+            issues = self._client.search_issues(*args, **kwargs)
+        if "changelog" in (kwargs.get("expand") or ""):
+            self.complete_changelogs(issues)
+        return issues
+
+    def complete_changelogs(self, issues) -> int:
+        """Fetch the missing histories of issues whose changelog was truncated.
+
+        Returns the number of issues that needed it.
+        """
+
+        truncated = []
+        for issue in issues:
+            changelog = getattr(issue, "changelog", None)
+            total = getattr(changelog, "total", None)
+            self.changelog_counters["checked"] += 1
+            if isinstance(total, int) and total > len(getattr(changelog, "histories", None) or []):
+                truncated.append(issue)
+        if not truncated:
+            return 0
+
+        with ThreadPoolExecutor(max_workers=max(1, self._changelog_workers)) as pool:
+            fetched = list(pool.map(lambda issue: self._fetch_changelog(issue.key), truncated))
+
+        for issue, (histories, paged) in zip(truncated, fetched):
+            merged = {getattr(history, "id", None) or id(history): history for history in issue.changelog.histories}
+            for history in histories:
+                merged.setdefault(getattr(history, "id", None) or id(history), history)
+            issue.changelog.histories = sorted(merged.values(), key=lambda history: history.created)
+            self.changelog_counters["histories_fetched"] += len(histories)
+            if not paged:
+                self.changelog_counters["fallbacks"] += 1
+        self.changelog_counters["truncated"] += len(truncated)
+        logging.info("Completed truncated changelogs of %d issue(s)", len(truncated))
+        return len(truncated)
+
+    def issue_changelog(self, key: str) -> list:
+        """Every changelog history of an issue."""
+
+        return self._fetch_changelog(key)[0]
+
+    def _fetch_changelog(self, key: str) -> tuple[list, bool]:
+        # The paged endpoint is missing on older Jira Server releases; re-reading
+        # the single issue with expand=changelog is not truncated there.
+        if self._http:
+            try:
+                url = self._client._get_url(f"issue/{key}/changelog")
+                histories: list = []
+                while True:
+                    response = self._client._session.get(
+                        url, params={"startAt": len(histories), "maxResults": CHANGELOG_PAGE_SIZE}
+                    )
+                    response.raise_for_status()
+                    page = json.loads(response.content, object_hook=_raw_record)
+                    values = getattr(page, "values", [])
+                    histories.extend(values)
+                    if not values or getattr(page, "isLast", False) or len(histories) >= getattr(page, "total", 0):
+                        return histories, True
+            except Exception as exc:
+                logging.debug("Paged changelog unavailable for %s: %s", key, exc)
+        issue = self._client.issue(key, expand="changelog")
+        return list(getattr(getattr(issue, "changelog", None), "histories", []) or []), False
+
+    def search_issues_raw(
+        self,
+        jql_str: str,
+        startAt: int = 0,
+        maxResults: int | bool = 50,
+        fields: str | list[str] | None = None,
+        expand: str | None = None,
+    ) -> list[RawRecord]:
+        """Search through ``/rest/api/2/search`` and decode pages straight into ``RawRecord``.
+
+        Mirrors ``JIRA.search_issues`` paging: ``maxResults=False`` (or 0)
+        fetches every match, otherwise at most ``maxResults`` issues.
+        """
+
+        limit = None if not maxResults else int(maxResults)
+        if isinstance(fields, (list, tuple)):
+            fields = ",".join(fields)
+        url = self._client._get_url("search")
+        session = self._client._session
+
+        records: list[RawRecord] = []
+        start = startAt
+        while limit is None or len(records) < limit:
+            page_size = RAW_SEARCH_PAGE_SIZE if limit is None else min(RAW_SEARCH_PAGE_SIZE, limit - len(records))
+            params = {"jql": jql_str, "startAt": start, "maxResults": page_size, "fields": fields or "*all"}
+            if expand:
+                params["expand"] = expand
+            response = session.get(url, params=params)
+            response.raise_for_status()
+            # The C decoder builds the records in the same pass via object_hook.
+            page = json.loads(response.content, object_hook=_raw_record)
+            issues = getattr(page, "issues", [])
+            records.extend(issues)
+            start += len(issues)
+            if not issues or start >= getattr(page, "total", 0):
+                break
+        return records
 
-    def search_issues(self, *args, **kwargs):  # pragma: no cover
-        return self._client.search_issues(*args, **kwargs)
+    def sprints(self, *args, **kwargs):
+        key = ("sprints", args, tuple(sorted(kwargs.items())))
+        return self._memo.get(key, lambda: self._client.sprints(*args, **kwargs))
 
-    def sprints(self, *args, **kwargs):  # pragma: no cover
-        return self._client.sprints(*args, **kwargs)
+    def client_info(self):
+        return self._memo.get(("client_info",), self._client.client_info)
 
-    def client_info(self):  # pragma: no cover
-        return self._client.client_info()
+    def fields(self):
+        return self._memo.get(("fields",), self._client.fields)
 
 
 def connect_jira(base_url: str, pat_token: str, *, jira_cls=JIRA) -> JiraService:
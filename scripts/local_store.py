@@ -0,0 +1,510 @@
+"""Local SQLite store holding normalized Jira extraction data.
+
+Extraction tasks record what they fetch (sprints, issues, status transitions,
+sprint membership events and epics) so follow-up questions can be answered by
+local queries instead of another round trip to Jira.
+"""
+
+from __future__ import annotations
+
+import datetime
+import os
+import re
+import sqlite3
+from typing import Iterable, Sequence
+
+from dateutil import parser
+
+from .io_utils import resolve_path
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sprints (
+    id INTEGER PRIMARY KEY,
+    board_id INTEGER,
+    name TEXT,
+    state TEXT,
+    start_date TEXT,
+    end_date TEXT,
+    complete_date TEXT,
+    goal TEXT
+);
+CREATE TABLE IF NOT EXISTS issues (
+    key TEXT PRIMARY KEY,
+    summary TEXT,
+    status TEXT,
+    status_category TEXT,
+    assignee TEXT,
+    points REAL,
+    epic_key TEXT,
+    created TEXT,
+    updated TEXT
+);
+CREATE TABLE IF NOT EXISTS sprint_issues (
+    sprint_id INTEGER NOT NULL,
+    issue_key TEXT NOT NULL,
+    PRIMARY KEY (sprint_id, issue_key)
+);
+CREATE TABLE IF NOT EXISTS status_transitions (
+    issue_key TEXT NOT NULL,
+    changed_at TEXT NOT NULL,
+    from_status TEXT,
+    to_status TEXT
+);
+CREATE TABLE IF NOT EXISTS sprint_events (
+    issue_key TEXT NOT NULL,
+    sprint_id INTEGER NOT NULL,
+    changed_at TEXT NOT NULL,
+    action TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS epics (
+    key TEXT PRIMARY KEY,
+    summary TEXT,
+    link TEXT
+);
+CREATE TABLE IF NOT EXISTS sync_state (
+    board_id INTEGER PRIMARY KEY,
+    watermark TEXT
+);
+CREATE TABLE IF NOT EXISTS sprint_checks (
+    board_id INTEGER PRIMARY KEY,
+    checked_at TEXT
+);
+CREATE TABLE IF NOT EXISTS sprint_snapshots (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    sprint_id INTEGER NOT NULL,
+    taken_at TEXT NOT NULL,
+    keyframe INTEGER NOT NULL,
+    payload BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_sprints_board ON sprints (board_id);
+CREATE INDEX IF NOT EXISTS idx_issues_epic ON issues (epic_key);
+CREATE INDEX IF NOT EXISTS idx_sprint_issues_issue ON sprint_issues (issue_key);
+CREATE INDEX IF NOT EXISTS idx_transitions_issue ON status_transitions (issue_key, changed_at);
+CREATE INDEX IF NOT EXISTS idx_transitions_time ON status_transitions (changed_at);
+CREATE INDEX IF NOT EXISTS idx_sprint_events_sprint ON sprint_events (sprint_id, changed_at);
+CREATE INDEX IF NOT EXISTS idx_sprint_events_issue ON sprint_events (issue_key);
+CREATE INDEX IF NOT EXISTS idx_sprint_snapshots_sprint ON sprint_snapshots (sprint_id, keyframe, taken_at);
+"""
+
+_SPRINT_ID_RE = re.compile(r"\d+")
+
+
+def to_utc_timestamp(value) -> str | None:
+    """Normalize a Jira timestamp to a sortable UTC ``YYYY-MM-DDTHH:MM:SS`` string."""
+
+    if not value:
+        return None
+    dt = value if isinstance(value, datetime.datetime) else parser.parse(str(value))
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=datetime.timezone.utc)
+    return dt.astimezone(datetime.timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+
+
+def parse_sprint_ids(value) -> set[int]:
+    """Return the sprint ids referenced by a sprint changelog ``from``/``to`` value."""
+
+    if not value:
+        return set()
+    return {int(match) for match in _SPRINT_ID_RE.findall(str(value))}
+
+
+def _placeholders(values: Sequence) -> str:
+    return ",".join("?" for _ in values)
+
+
+class LocalStore:
+    """Normalized tables of sprints, issues, transitions and epics backed by SQLite."""
+
+    def __init__(self, connection: sqlite3.Connection):
+        self._conn = connection
+        self._conn.row_factory = sqlite3.Row
+        self._conn.executescript(_SCHEMA)
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        return self._conn
+
+    def commit(self) -> None:
+        self._conn.commit()
+
+    def close(self) -> None:
+        self._conn.commit()
+        self._conn.close()
+
+    # -- population -----------------------------------------------------
+
+    def record_sprint(self, sprint, board_id: int | None = None) -> None:
+        self._conn.execute(
+            """
+            INSERT INTO sprints (id, board_id, name, state, start_date, end_date, complete_date, goal)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(id) DO UPDATE SET
+                board_id = COALESCE(excluded.board_id, sprints.board_id),
+                name = excluded.name,
+                state = excluded.state,
+                start_date = excluded.start_date,
+                end_date = excluded.end_date,
+                complete_date = excluded.complete_date,
+                goal = excluded.goal
+            """,
+            (
+                getattr(sprint, "id", None),
+                board_id if board_id is not None else getattr(sprint, "originBoardId", None),
+                getattr(sprint, "name", None),
+                getattr(sprint, "state", None),
+                to_utc_timestamp(getattr(sprint, "startDate", None)),
+                to_utc_timestamp(getattr(sprint, "endDate", None)),
+                to_utc_timestamp(getattr(sprint, "completeDate", None)),
+                getattr(sprint, "goal", None),
+            ),
+        )
+
+    def record_epic(self, key: str, summary: str | None, link: str | None = None) -> None:
+        self._conn.execute(
+            """
+            INSERT INTO epics (key, summary, link) VALUES (?, ?, ?)
+            ON CONFLICT(key) DO UPDATE SET summary = excluded.summary, link = excluded.link
+            """,
+            (key, summary, link),
+        )
+
+    def record_issue(
+        self,
+        issue,
+        sp_field_id: str | None,
+        *,
+        sprint_id: int | None = None,
+        epic_key: str | None = None,
+    ) -> None:
+        """Upsert an issue and replace its transitions with the ones in its changelog."""
+
+        key = getattr(issue, "key", None)
+        if not key:
+            return
+        fields = getattr(issue, "fields", None)
+        status = getattr(fields, "status", None)
+        assignee = getattr(fields, "assignee", None)
+        points = getattr(fields, sp_field_id, None) if fields and sp_field_id else None
+        try:
+            points = float(points) if points is not None else None
+        except (TypeError, ValueError):
+            points = None
+
+        self._conn.execute(
+            """
+            INSERT INTO issues (key, summary, status, status_category, assignee, points, epic_key, created, updated)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(key) DO UPDATE SET
+                summary = excluded.summary,
+                status = excluded.status,
+                status_category = excluded.status_category,
+                assignee = excluded.assignee,
+                points = COALESCE(excluded.points, issues.points),
+                epic_key = COALESCE(excluded.epic_key, issues.epic_key),
+                created = excluded.created,
+                updated = excluded.updated
+            """,
+            (
+                key,
+                getattr(fields, "summary", None),
+                getattr(status, "name", None),
+                getattr(getattr(status, "statusCategory", None), "name", None),
+                str(assignee) if assignee else None,
+                points,
+                epic_key,
+                to_utc_timestamp(getattr(fields, "created", None)),
+                to_utc_timestamp(getattr(fields, "updated", None)),
+            ),
+        )
+        if sprint_id is not None:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO sprint_issues (sprint_id, issue_key) VALUES (?, ?)",
+                (sprint_id, key),
+            )
+
+        changelog = getattr(issue, "changelog", None)
+        if changelog is None:
+            return
+
+        transitions = []
+        events = []
+        for history in getattr(changelog, "histories", []) or []:
+            changed_at = to_utc_timestamp(getattr(history, "created", None))
+            if changed_at is None:
+                continue
+            for item in getattr(history, "items", []) or []:
+                field = (getattr(item, "field", "") or "").lower()
+                if field == "status":
+                    transitions.append(
+                        (key, changed_at, getattr(item, "fromString", None), getattr(item, "toString", None))
+                    )
+                elif field == "sprint":
+                    before = parse_sprint_ids(getattr(item, "from", None))
+                    after = parse_sprint_ids(getattr(item, "to", None))
+                    events.extend((key, sid, changed_at, "added") for sid in after - before)
+                    events.extend((key, sid, changed_at, "removed") for sid in before - after)
+
+        self._conn.execute("DELETE FROM status_transitions WHERE issue_key = ?", (key,))
+        self._conn.execute("DELETE FROM sprint_events WHERE issue_key = ?", (key,))
+        self._conn.executemany(
+            "INSERT INTO status_transitions (issue_key, changed_at, from_status, to_status) VALUES (?, ?, ?, ?)",
+            transitions,
+        )
+        self._conn.executemany(
+            "INSERT INTO sprint_events (issue_key, sprint_id, changed_at, action) VALUES (?, ?, ?, ?)",
+            events,
+        )
+
+    def record_issues(
+        self,
+        issues: Iterable,
+        sp_field_id: str | None,
+        *,
+        sprint_id: int | None = None,
+        epic_key: str | None = None,
+    ) -> None:
+        for issue in issues:
+            self.record_issue(issue, sp_field_id, sprint_id=sprint_id, epic_key=epic_key)
+
+    def get_watermark(self, board_id: int) -> str | None:
+        row = self._conn.execute("SELECT watermark FROM sync_state WHERE board_id = ?", (board_id,)).fetchone()
+        return row["watermark"] if row else None
+
+    def set_watermark(self, board_id: int, watermark: str) -> None:
+        self._conn.execute(
+            """
+            INSERT INTO sync_state (board_id, watermark) VALUES (?, ?)
+            ON CONFLICT(board_id) DO UPDATE SET watermark = excluded.watermark
+            """,
+            (board_id, watermark),
+        )
+
+    def set_sprint_check(self, board_id: int, checked_at: str) -> None:
+        self._conn.execute(
+            """
+            INSERT INTO sprint_checks (board_id, checked_at) VALUES (?, ?)
+            ON CONFLICT(board_id) DO UPDATE SET checked_at = excluded.checked_at
+            """,
+            (board_id, checked_at),
+        )
+
+    def close_stale_active_sprints(self, board_id: int, active_ids: Sequence[int]) -> None:
+        """Mark stored active sprints of the board that Jira no longer lists as active as closed."""
+
+        self._conn.execute(
+            "UPDATE sprints SET state = 'closed' WHERE board_id = ? AND state = 'active'"
+            f" AND id NOT IN ({_placeholders(active_ids)})",
+            (board_id, *active_ids),
+        )
+
+    def prune_sprint_issues(self, sprint_id: int, member_keys: Iterable[str]) -> int:
+        """Drop sprint membership rows of issues no longer in the sprint; returns how many."""
+
+        keys = list(member_keys)
+        cursor = self._conn.execute(
+            f"DELETE FROM sprint_issues WHERE sprint_id = ? AND issue_key NOT IN ({_placeholders(keys)})",
+            (sprint_id, *keys),
+        )
+        return cursor.rowcount
+
+    def record_snapshot_payload(self, sprint_id: int, taken_at: str, keyframe: bool, payload: bytes) -> None:
+        self._conn.execute(
+            "INSERT INTO sprint_snapshots (sprint_id, taken_at, keyframe, payload) VALUES (?, ?, ?, ?)",
+            (sprint_id, taken_at, int(keyframe), payload),
+        )
+
+    # -- queries --------------------------------------------------------
+
+    def get_sprint_check(self, board_id: int) -> str | None:
+        row = self._conn.execute("SELECT checked_at FROM sprint_checks WHERE board_id = ?", (board_id,)).fetchone()
+        return row["checked_at"] if row else None
+
+    def snapshot_count(self, sprint_id: int) -> int:
+        row = self._conn.execute("SELECT COUNT(*) AS n FROM sprint_snapshots WHERE sprint_id = ?", (sprint_id,)).fetchone()
+        return row["n"]
+
+    def snapshot_payloads(self, sprint_id: int, until: str | None = None) -> list[sqlite3.Row]:
+        """Snapshots of a sprint from the last keyframe taken at or before ``until`` up to ``until``."""
+
+        until = until or "9999"
+        return self._conn.execute(
+            """
+            SELECT taken_at, keyframe, payload FROM sprint_snapshots
+            WHERE sprint_id = ? AND taken_at <= ? AND id >= COALESCE(
+                (SELECT MAX(id) FROM sprint_snapshots WHERE sprint_id = ? AND keyframe = 1 AND taken_at <= ?), 0
+            )
+            ORDER BY id
+            """,
+            (sprint_id, until, sprint_id, until),
+        ).fetchall()
+
+    def has_sprint_issues(self, sprint_id: int) -> bool:
+        row = self._conn.execute("SELECT 1 FROM sprint_issues WHERE sprint_id = ? LIMIT 1", (sprint_id,)).fetchone()
+        return row is not None
+
+    def sprints(self, board_id: int | None = None, state: str | None = None) -> list[sqlite3.Row]:
+        clauses, params = [], []
+        if board_id is not None:
+            clauses.append("board_id = ?")
+            params.append(board_id)
+        if state is not None:
+            clauses.append("state = ?")
+            params.append(state)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return self._conn.execute(
+            f"SELECT * FROM sprints {where} ORDER BY start_date DESC", params
+        ).fetchall()
+
+    def sprint_dataset(
+        self,
+        sprint_ids: Sequence[int],
+        *,
+        in_progress_statuses: Sequence[str],
+        done_statuses: Sequence[str],
+    ) -> list[dict]:
+        """Rebuild ``get_sprint_dataset`` rows for the given sprints from local data."""
+
+        if not sprint_ids:
+            return []
+        rows = self._conn.execute(
+            f"""
+            SELECT si.sprint_id AS sprint_id,
+                   i.points AS points,
+                   (SELECT MIN(t.changed_at) FROM status_transitions t
+                     WHERE t.issue_key = i.key AND t.to_status IN ({_placeholders(in_progress_statuses)})) AS started,
+                   (SELECT MAX(t.changed_at) FROM status_transitions t
+                     WHERE t.issue_key = i.key AND t.to_status IN ({_placeholders(done_statuses)})) AS finished
+            FROM sprint_issues si
+            JOIN issues i ON i.key = si.issue_key
+            WHERE si.sprint_id IN ({_placeholders(sprint_ids)}) AND i.status_category = 'Done'
+            """,
+            [*in_progress_statuses, *done_statuses, *sprint_ids],
+        ).fetchall()
+
+        totals: dict[int, float] = {}
+        counts: dict[int, int] = {}
+        cycle_times: dict[int, list[float]] = {}
+        for row in rows:
+            sid = row["sprint_id"]
+            totals[sid] = totals.get(sid, 0.0) + (row["points"] or 0.0)
+            counts[sid] = counts.get(sid, 0) + 1
+            if row["started"] and row["finished"]:
+                started = datetime.datetime.fromisoformat(row["started"])
+                finished = datetime.datetime.fromisoformat(row["finished"])
+                cycle_times.setdefault(sid, []).append(max(0, (finished - started).total_seconds() / 86400))
+
+        sprints = {
+            row["id"]: row
+            for row in self._conn.execute(
+                f"SELECT * FROM sprints WHERE id IN ({_placeholders(sprint_ids)})", list(sprint_ids)
+            )
+        }
+        results = []
+        for sid in sprint_ids:
+            sprint = sprints.get(sid)
+            times = cycle_times.get(sid)
+            results.append(
+                {
+                    "Name": sprint["name"] if sprint else "N/A",
+                    "StartDate": sprint["start_date"] if sprint else "N/A",
+                    "EndDate": sprint["end_date"] if sprint else "N/A",
+                    "CompletedDate": sprint["complete_date"] if sprint else "N/A",
+                    "CompletedStoryPoints": totals.get(sid, 0.0),
+                    "CompletedIssues": counts.get(sid, 0),
+                    "AverageCycleTime": sum(times) / len(times) if times else "N/A",
+                }
+            )
+        return results
+
+    def sprint_creep(self, sprint_id: int) -> list[dict]:
+        """Return issues added to the sprint after it started, newest addition per issue."""
+
+        rows = self._conn.execute(
+            """
+            SELECT e.issue_key AS key, MAX(e.changed_at) AS added_at, i.points AS points
+            FROM sprint_events e
+            JOIN sprints s ON s.id = e.sprint_id
+            LEFT JOIN issues i ON i.key = e.issue_key
+            WHERE e.sprint_id = ? AND e.action = 'added'
+            GROUP BY e.issue_key
+            HAVING MAX(e.changed_at) > MAX(s.start_date)
+            ORDER BY e.issue_key
+            """,
+            (sprint_id,),
+        ).fetchall()
+        return [
+            {
+                "key": row["key"],
+                "added_at": row["added_at"][:16].replace("T", " "),
+                "points": row["points"] or 0,
+            }
+            for row in rows
+        ]
+
+    def epic_metrics(
+        self,
+        epic_keys: Sequence[str],
+        base_url: str | None,
+        *,
+        excluded_key_fragments: Sequence[str] = (),
+    ) -> list[dict]:
+        """Rebuild ``get_epics_dataset`` rows from locally stored epic children."""
+
+        if not epic_keys:
+            return []
+        exclusions = "".join(" AND i.key NOT LIKE ?" for _ in excluded_key_fragments)
+        rows = self._conn.execute(
+            f"""
+            SELECT i.epic_key AS epic_key, i.status_category AS category, COUNT(*) AS n
+            FROM issues i
+            WHERE i.epic_key IN ({_placeholders(epic_keys)}){exclusions}
+            GROUP BY i.epic_key, i.status_category
+            """,
+            [*epic_keys, *(f"%{fragment}%" for fragment in excluded_key_fragments)],
+        ).fetchall()
+        counts: dict[str, dict[str, int]] = {}
+        for row in rows:
+            counts.setdefault(row["epic_key"], {})[row["category"]] = row["n"]
+
+        epics = {
+            row["key"]: row
+            for row in self._conn.execute(
+                f"SELECT * FROM epics WHERE key IN ({_placeholders(epic_keys)})", list(epic_keys)
+            )
+        }
+        dataset = []
+        for key in epic_keys:
+            epic = epics.get(key)
+            if epic is None:
+                continue
+            stats = counts.get(key, {})
+            total = sum(stats.values())
+
+            def calc_pct(count):
+                return round((count / total) * 100, 2) if total > 0 else 0
+
+            dataset.append(
+                {
+                    "issue_number": key,
+                    "title": epic["summary"],
+                    "link": epic["link"] or f"{base_url}/browse/{key}",
+                    "total_issues": total,
+                    "completed": stats.get("Done", 0),
+                    "inprogress": stats.get("In Progress", 0),
+                    "todo": stats.get("To Do", 0),
+                    "percentage_done": calc_pct(stats.get("Done", 0)),
+                    "percentage_inprogress": calc_pct(stats.get("In Progress", 0)),
+                    "percentage_todo": calc_pct(stats.get("To Do", 0)),
+                }
+            )
+        return dataset
+
+
+def open_store(filename: str | os.PathLike = "team_beacon.sqlite3") -> LocalStore:
+    """Open (or create) the local store, resolving relative paths against the data dir."""
+
+    target = str(filename)
+    if target != ":memory:":
+        target = str(resolve_path(filename))
+    return LocalStore(sqlite3.connect(target, check_same_thread=False))
@@ -5,38 +5,160 @@ Usage:
     python -m scripts.main [OPTIONS]
 
 Options:
-    --task {all,project,issue,sprints_dataset,epics_dataset,active_sprint}
+    --task {all,project,issue,sprints_dataset,epics_dataset,active_sprint,sync,burndown,cfd,forecast,merge,export,report}
                         Select a specific task to run (default: all tasks)
     --sprint-out PATH   Output path for sprint dataset CSV (default: sprint_dataset.csv)
     --epics-out PATH    Output path for epics dataset JSON (default: epics_dataset.json)
     --active-sprint-out PATH
                         Output path for active sprint JSON (default: active_sprint.json)
     --chart-out PATH    Output path for velocity/cycle PNG chart (default: velocity_cycle_time.png)
+    --burndown-out PATH Output path for the burndown columnar JSON (default: burndown.json)
+    --burndown-chart-out PATH
+                        Output path for the burndown/burnup PNG chart (default: burndown.png)
+    --cfd-days N        History window of the cumulative flow diagram in days (default: 365)
+    --cfd-out PATH      Output path for the cumulative flow columnar JSON (default: cumulative_flow.json)
+    --cfd-chart-out PATH
+                        Output path for the cumulative flow PNG chart (default: cumulative_flow.png)
+    --store PATH        Record extracted sprints, issues, transitions and epics into a local
+                        SQLite store (relative paths resolve against the data directory)
+    --from-store        Answer sprints_dataset/epics_dataset from the local store instead of Jira
+    --sprint-count N    Number of most recent closed sprints in the sprint dataset (default: 10)
+    --sprint-batch-size N
+                        Fetch the done issues of N sprints per "sprint in (...)" search and
+                        regroup them by Sprint field (default: 0, one search per sprint);
+                        cannot be combined with --with-creep
+    --with-creep        Add scope-creep columns to the sprint dataset from the same extraction pass
+    --cycle-distribution
+                        Also write cycle-time percentiles (p50/p85/p95), histogram and rolling
+                        percentiles per sprint, plus a histogram/scatter chart
+    --cycle-window N    Number of sprints in the rolling cycle-time percentile window (default: 3)
+    --cycle-distribution-out PATH
+                        Output path for the cycle-time distribution JSON (default: cycle_time_distribution.json)
+    --cycle-distribution-chart-out PATH
+                        Output path for the cycle-time distribution chart (default: cycle_time_distribution.png)
+    --forecast-trials N Monte Carlo trials per epic and initiative in the forecast (default: 10000)
+    --forecast-out PATH Output path for the delivery forecast JSON (default: forecast.json)
+    --export-budget TOKENS
+                        Approximate size budget of each compact export; rows beyond it are
+                        summarized, least relevant first (default: 8000, 0 for no limit)
+    --initiatives FILE [FILE ...]
+                        Initiatives files for epics_dataset (default: initiatives.json in the
+                        config directory). With several files every epic is fetched once and
+                        each file gets its own output named <epics-out stem>_<file stem>.json,
+                        so the file names (without extension) must differ
+    --no-raw-search     Build the jira library's Resource objects for search results instead of
+                        decoding raw REST search pages into compact records
+    --changelog-workers N
+                        Concurrent requests used to fetch the rest of changelogs Jira truncated
+                        on search results (default: 4)
+    --resume            Continue an interrupted run: sprints and epics finished before the
+                        failure are read from the checkpoint in the data directory
+                        (checkpoint.json, removed after a successful run) instead of Jira
+    --shard i/N         Extract only shard i of N: each sprint and epic key is assigned to one
+                        shard by a stable hash of its id, and the shard writes partial outputs
+                        (e.g. sprints_dataset.shard-1-of-4.csv) for the merge task to combine
+    --workflow PATH     Workflow mapping file with per-board status groups and custom field
+                        names (default: workflow.json in the config directory; built-in
+                        defaults apply when it does not exist)
+    --as-of TIMESTAMP   With --task active_sprint and --store, rebuild the active sprint JSON as
+                        it was recorded at TIMESTAMP (e.g. 2024-03-06T12:00) instead of
+                        reading Jira; every active_sprint run and watch update with --store
+                        records a compressed delta snapshot of the sprint
+    --watch INTERVAL    With --task active_sprint, keep running and refresh the active sprint
+                        JSON every INTERVAL seconds, rewriting it only when it changes
 
 When --task is omitted or set to "all", the CLI runs the full pipeline in the
 following order: project, issue, sprints_dataset, epics_dataset, active_sprint. Specifying a
-single task runs only that portion.
+single task runs only that portion. The "sync" task is never part of "all": it
+merges issues of the board's active sprints updated since the last sync into the
+local store (requires --store) and is cheap enough to poll every few minutes.
+The "burndown" task is not part of "all" either: it replays the changelogs of the
+active sprint (or the latest closed one) into per-day scope/completed/remaining
+points and a burndown/burnup chart. The "cfd" task (also not part of "all") counts
+project issues per status per day over the last --cfd-days days and charts the
+cumulative flow. The "forecast" task (not part of "all") reads the sprint dataset CSV
+and the epics dataset JSON written by the other tasks, samples historical sprint
+throughput (completed issues per sprint) and writes p50/p85/p95 completion sprints
+and dates for every epic and initiative.
+
+Large boards can be extracted by several processes or machines sharing the data
+directory: run "--shard i/N" once for every i in 1..N (with "all", a shard runs only
+sprints_dataset and epics_dataset; checkpoints are kept per shard), then run the
+"merge" task to combine the partial outputs into the sprint dataset CSV, its chart and
+the epics JSON file(s). The merge refuses to write while a shard's output is missing
+and deletes the partial outputs once they are merged.
+
+The "export" task (not part of "all") rewrites the active sprint JSON and the epics
+JSON file(s) as <name>.compact.json for the insight workflows: one-line JSON with
+tables encoded as a column header plus value rows, per-assignee/epic/initiative
+totals, and the lowest-priority rows (finished work first) summarized once the
+--export-budget is reached.
+
+The "report" task (not part of "all") renders the tabular sections of the sprint, team
+and initiative insight reports straight from those datasets into the reports directory
+(TEAM_BEACON_REPORTS_DIR, default ./reports), ready for scripts/publish_report.py.
+Narrative sections are left as <!-- narrative: ... --> markers for the insight
+workflows; templates in <config dir>/templates/ override the built-in layouts.
+
+The forecast, merge, export and report tasks only read files written by earlier
+runs, so they neither need Jira credentials nor connect to Jira.
 
 Examples:
     python -m scripts.main                               # run entire pipeline
     python -m scripts.main --task epics_dataset          # run only the epics dataset
     python -m scripts.main --task sprints_dataset --sprint-out my_sprints.csv
+    python -m scripts.main --store team_beacon.sqlite3   # run pipeline and populate the store
+    python -m scripts.main --task sprints_dataset --store team_beacon.sqlite3 --from-store
+    python -m scripts.main --task sync --store team_beacon.sqlite3
+    python -m scripts.main --task active_sprint --watch 300
+    python -m scripts.main --task forecast --forecast-trials 20000
+    python -m scripts.main --shard 2/4                   # second of four extraction shards
+    python -m scripts.main --task merge                  # combine the shard outputs
+    python -m scripts.main --task export --export-budget 4000
+    python -m scripts.main --task report
 
 Environment variables JIRA_BASE_URL, JIRA_PAT, JIRA_PROJECT_KEY, and JIRA_BOARD_ID must be set or provided via a config file.
 """
 
 import logging
+from pathlib import Path
+from typing import Sequence
 
 import matplotlib.pyplot as plt
 from jira import JIRA
 
-from .charting import plot_velocity_cycle_time as _plot_velocity_cycle_time
-from .config import get_jira_credentials, load_runtime_config
-from .epic_service import get_epics_dataset as _build_epics_dataset
+from .checkpoint import DEFAULT_CHECKPOINT_FILE, Checkpoint
+from .charting import (
+    plot_burndown as _plot_burndown,
+    plot_cumulative_flow as _plot_cumulative_flow,
+    plot_cycle_time_distribution as _plot_cycle_time_distribution,
+    plot_velocity_cycle_time as _plot_velocity_cycle_time,
+)
+from .config import DEFAULT_WORKFLOW, get_jira_credentials, load_runtime_config, load_workflow_mapping
+from .epic_service import (
+    get_epics_dataset as _build_epics_dataset,
+    get_epics_dataset_from_store,
+)
+from .export_service import (
+    DEFAULT_TOKEN_BUDGET,
+    compact_initiatives,
+    compact_output_name,
+    compact_sprint_insights,
+)
+from .forecast_service import forecast_delivery, load_epic_groups, load_sprint_rows
+from .flow_service import (
+    CycleTimeDistribution,
+    get_cumulative_flow as _build_cumulative_flow,
+    get_sprint_burndown as _build_sprint_burndown,
+)
 from .io_utils import (
     InitiativeLoadError,
+    collect_epic_keys,
+    index_epic_metrics,
     load_initiatives,
     merge_initiatives_with_epic_metrics,
+    read_dataset_from_json,
+    resolve_path,
     write_dataset_to_csv,
     write_dataset_to_json,
 )
@@ -47,14 +169,30 @@ from .jira_client import (
     fetch_issue,
     fetch_project,
 )
+from .local_store import open_store
+from .report_renderer import (
+    INITIATIVE_REPORT,
+    SPRINT_REPORT,
+    TEAM_REPORT,
+    copy_to_reports,
+    render_initiative_insights,
+    render_sprint_insights,
+    render_team_insights,
+    write_report,
+)
+from .sharding import ShardMergeError, merge_epic_shards, merge_sprint_shards, parse_shard, remove_shard_files
+from .snapshot_service import board_snapshot_at
 from .sprint_service import (
     compute_cycle_time,
     get_issue_data as _get_issue_payload,
     get_project_data as _get_project_payload,
     get_sprint_data as _get_sprint_data,
     get_sprint_dataset as _build_sprint_dataset,
+    get_sprint_dataset_from_store,
+    get_sprint_history_dataset as _build_sprint_history_dataset,
     get_sprint_insights_with_creep as _build_sprint_insights,
 )
+from .sync_service import sync_board, watch_active_sprint
 
 
 def _ensure_service(jira_or_service) -> JiraService:
@@ -100,19 +238,58 @@ def get_all_closed_sprints(jira, board_id):
     return fetch_closed_sprints(service, board_id)
 
 
-def get_sprint_dataset(sprints, jira, story_points_field="customfield_10004"):
+def get_sprint_dataset(
+    sprints,
+    jira,
+    story_points_field="customfield_10004",
+    store=None,
+    distribution=None,
+    workflow=DEFAULT_WORKFLOW,
+    batch_size=0,
+    checkpoint=None,
+):
     service = _ensure_service(jira)
-    return _build_sprint_dataset(service, sprints, story_points_field)
+    return _build_sprint_dataset(
+        service,
+        sprints,
+        story_points_field,
+        store=store,
+        distribution=distribution,
+        workflow=workflow,
+        batch_size=batch_size,
+        checkpoint=checkpoint,
+    )
 
 
-def get_epics_dataset(jira_client, epic_keys):
+def get_sprint_history_dataset(
+    sprints,
+    jira,
+    story_points_field="customfield_10004",
+    store=None,
+    distribution=None,
+    workflow=DEFAULT_WORKFLOW,
+    checkpoint=None,
+):
+    service = _ensure_service(jira)
+    return _build_sprint_history_dataset(
+        service,
+        sprints,
+        story_points_field,
+        store=store,
+        distribution=distribution,
+        workflow=workflow,
+        checkpoint=checkpoint,
+    )
+
+
+def get_epics_dataset(jira_client, epic_keys, store=None, workflow=DEFAULT_WORKFLOW, checkpoint=None):
     service = _ensure_service(jira_client)
-    return _build_epics_dataset(service, epic_keys)
+    return _build_epics_dataset(service, epic_keys, store=store, workflow=workflow, checkpoint=checkpoint)
 
 
-def get_sprint_insights_with_creep(jira_client, board_id, sp_field_id):
+def get_sprint_insights_with_creep(jira_client, board_id, sp_field_id, store=None, workflow=DEFAULT_WORKFLOW):
     service = _ensure_service(jira_client)
-    return _build_sprint_insights(service, board_id, sp_field_id)
+    return _build_sprint_insights(service, board_id, sp_field_id, store=store, workflow=workflow)
 
 
 def plot_velocity_cycle_time(data_filename="sprint_dataset.csv", output_filename="velocity_cycle_time.png"):
@@ -123,9 +300,59 @@ def plot_velocity_cycle_time(data_filename="sprint_dataset.csv", output_filename
     )
 
 
+def get_sprint_burndown(jira_client, board_id, sp_field_id, workflow=DEFAULT_WORKFLOW):
+    service = _ensure_service(jira_client)
+    return _build_sprint_burndown(service, board_id, sp_field_id, workflow=workflow)
+
+
+def plot_burndown(data_filename="burndown.json", output_filename="burndown.png"):
+    return _plot_burndown(
+        data_filename=data_filename,
+        output_filename=output_filename,
+        plt_module=plt,
+    )
+
+
+def get_cumulative_flow(jira_client, project_key, days=365, workflow=DEFAULT_WORKFLOW):
+    service = _ensure_service(jira_client)
+    return _build_cumulative_flow(service, project_key, days, workflow=workflow)
+
+
+def plot_cumulative_flow(data_filename="cumulative_flow.json", output_filename="cumulative_flow.png"):
+    return _plot_cumulative_flow(
+        data_filename=data_filename,
+        output_filename=output_filename,
+        plt_module=plt,
+    )
+
+
+def plot_cycle_time_distribution(
+    data_filename="cycle_time_distribution.json", output_filename="cycle_time_distribution.png"
+):
+    return _plot_cycle_time_distribution(
+        data_filename=data_filename,
+        output_filename=output_filename,
+        plt_module=plt,
+    )
+
+
 import argparse
 
-TASK_CHOICES = ("all", "project", "issue", "sprints_dataset", "epics_dataset", "active_sprint")
+TASK_CHOICES = ("all", "project", "issue", "sprints_dataset", "epics_dataset", "active_sprint", "sync", "burndown", "cfd", "forecast", "merge", "export", "report")
+SHARDED_TASKS = ("sprints_dataset", "epics_dataset")
+# Tasks that record finished units in the checkpoint and can be resumed.
+CHECKPOINTED_TASKS = ("sprints_dataset", "epics_dataset")
+# Tasks that only read earlier outputs, so they run without Jira credentials.
+FILE_TASKS = ("forecast", "merge", "export", "report")
+
+
+def clashing_initiative_stems(initiatives_files: Sequence[str]) -> list[str]:
+    """File stems shared by several initiatives files, whose outputs would overwrite each other."""
+
+    if len(initiatives_files) < 2:
+        return []
+    stems = [Path(initiatives_file).stem for initiatives_file in initiatives_files]
+    return sorted({stem for stem in stems if stems.count(stem) > 1})
 
 
 def run_cli(
@@ -134,18 +361,86 @@ def run_cli(
     epics_out: str = "epics_dataset.json",
     active_sprint_out: str = "active_sprint.json",
     chart_out: str = "velocity_cycle_time.png",
+    burndown_out: str = "burndown.json",
+    burndown_chart_out: str = "burndown.png",
+    cfd_days: int = 365,
+    cfd_out: str = "cumulative_flow.json",
+    cfd_chart_out: str = "cumulative_flow.png",
+    store_path: str | None = None,
+    from_store: bool = False,
+    watch_interval: float | None = None,
+    sprint_count: int = 10,
+    with_creep: bool = False,
+    cycle_distribution: bool = False,
+    cycle_window: int = 3,
+    cycle_distribution_out: str = "cycle_time_distribution.json",
+    cycle_distribution_chart_out: str = "cycle_time_distribution.png",
+    forecast_trials: int = 10000,
+    forecast_out: str = "forecast.json",
+    workflow_file: str = "workflow.json",
+    initiatives_files: Sequence[str] = ("initiatives.json",),
+    raw_search: bool = True,
+    sprint_batch_size: int = 0,
+    changelog_workers: int = 4,
+    resume: bool = False,
+    shard: str | None = None,
+    export_budget: int = DEFAULT_TOKEN_BUDGET,
+    as_of: str | None = None,
 ):
     logging.basicConfig(level=logging.WARN)
     logging.info("Starting JIRA Data Extraction...")
 
+    if from_store and not store_path:
+        raise ValueError("--from-store requires --store")
+    if as_of and not store_path:
+        raise ValueError("--as-of requires --store")
+    if sprint_batch_size and with_creep:
+        raise ValueError("--sprint-batch-size cannot be combined with --with-creep")
+    clashing = clashing_initiative_stems(initiatives_files)
+    if clashing:
+        raise ValueError(f"--initiatives files must have distinct names; repeated: {', '.join(clashing)}")
+    shard_spec = parse_shard(shard) if shard else None
+    if shard_spec is not None and task not in ("all", *SHARDED_TASKS):
+        raise ValueError(f"--shard applies to {', '.join(SHARDED_TASKS)} (or all), not '{task}'")
+    if shard_spec is not None and cycle_distribution:
+        logging.warning("--cycle-distribution is skipped with --shard: it needs every sprint's cycle times")
+        cycle_distribution = False
+
     runtime_config = load_runtime_config()
-    jira_url, jira_pat = get_jira_credentials()
-    jira_client = connect_jira(jira_url, jira_pat)
-    jira_service = _ensure_service(jira_client)
+    workflow = load_workflow_mapping(runtime_config.board_id, workflow_file)
+    jira_service = None
+    if task not in FILE_TASKS:
+        jira_url, jira_pat = get_jira_credentials()
+        jira_client = connect_jira(jira_url, jira_pat)
+        jira_service = (
+            jira_client
+            if isinstance(jira_client, JiraService)
+            else JiraService(jira_client, raw_search=raw_search, changelog_workers=changelog_workers)
+        )
+    store = open_store(store_path) if store_path else None
 
     selected_tasks = [task]
     if task == "all":
         selected_tasks = ["project", "issue", "sprints_dataset", "epics_dataset", "active_sprint"]
+    if shard_spec is not None:
+        selected_tasks = [name for name in selected_tasks if name in SHARDED_TASKS]
+
+    # Only the resumable extractions keep a checkpoint; every other task must
+    # leave one written by an interrupted extraction alone.
+    checkpoint = None
+    if any(name in CHECKPOINTED_TASKS for name in selected_tasks):
+        checkpoint = Checkpoint.open(
+            shard_spec.filename(DEFAULT_CHECKPOINT_FILE) if shard_spec else DEFAULT_CHECKPOINT_FILE,
+            signature={
+                "tasks": selected_tasks,
+                "shard": str(shard_spec) if shard_spec else None,
+                "board_id": runtime_config.board_id,
+                "sprint_count": sprint_count,
+                "with_creep": with_creep,
+                "initiatives": list(initiatives_files),
+            },
+            resume=resume,
+        )
 
     def run_project():
         project = get_project(jira_service, runtime_config.project_key)
@@ -156,13 +451,51 @@ def run_cli(
         issue = get_issue(jira_service, runtime_config.sample_issue_key)
         issue_data = get_issue_data(issue, runtime_config.story_points_field)
         print("Issue Data:", issue_data)
-        cycle_time = compute_cycle_time(issue)
+        cycle_time = compute_cycle_time(issue, workflow)
         print(f"Cycle time (days): {cycle_time}")
 
     def run_sprints_dataset():
-        sprints = get_all_closed_sprints(jira_service, runtime_config.board_id)
-        print(f"Total closed sprints: {len(sprints)}")
-        sprint_data = get_sprint_dataset(sprints[:10], jira_service, runtime_config.story_points_field)
+        if from_store:
+            stored = store.sprints(runtime_config.board_id, state="closed")
+            print(f"Total closed sprints in store: {len(stored)}")
+            sprint_ids = [row["id"] for row in stored[:sprint_count]]
+            if shard_spec is not None:
+                sprint_ids = shard_spec.select(sprint_ids)
+            sprint_data = get_sprint_dataset_from_store(store, sprint_ids, workflow)
+        else:
+            sprints = get_all_closed_sprints(jira_service, runtime_config.board_id)
+            print(f"Total closed sprints: {len(sprints)}")
+            sprints = sprints[:sprint_count]
+            if shard_spec is not None:
+                sprints = shard_spec.select(sprints, key=lambda sprint: getattr(sprint, "id", None))
+            distribution = CycleTimeDistribution(window=cycle_window) if cycle_distribution else None
+            dataset_options = {
+                "store": store,
+                "distribution": distribution,
+                "workflow": workflow,
+                "checkpoint": checkpoint,
+            }
+            if with_creep:
+                build_dataset = get_sprint_history_dataset
+            else:
+                build_dataset = get_sprint_dataset
+                dataset_options["batch_size"] = sprint_batch_size
+            sprint_data = build_dataset(
+                sprints,
+                jira_service,
+                runtime_config.story_points_field,
+                **dataset_options,
+            )
+            if distribution is not None:
+                write_dataset_to_json(distribution.summary(), filename=cycle_distribution_out)
+                plot_cycle_time_distribution(
+                    data_filename=cycle_distribution_out,
+                    output_filename=cycle_distribution_chart_out,
+                )
+        if shard_spec is not None:
+            write_dataset_to_csv(sprint_data, filename=shard_spec.filename(sprints_out))
+            print(f"Shard {shard_spec}: {len(sprint_data)} sprint(s)")
+            return
         print("Sprint Dataset:", sprint_data)
         write_dataset_to_csv(sprint_data, filename=sprints_out)
         plot_velocity_cycle_time(
@@ -170,49 +503,245 @@ def run_cli(
             output_filename=chart_out,
         )
 
+    def epics_output_for(initiatives_file):
+        if len(initiatives_files) == 1:
+            return epics_out
+        out = Path(epics_out)
+        return str(out.with_name(f"{out.stem}_{Path(initiatives_file).stem}{out.suffix}"))
+
+    def load_initiative_files():
+        loaded = {}
+        for initiatives_file in initiatives_files:
+            try:
+                loaded[initiatives_file] = load_initiatives(initiatives_file)
+            except (FileNotFoundError, InitiativeLoadError) as exc:
+                logging.error("Cannot run epics task for %s: %s", initiatives_file, exc)
+        return loaded
+
+    def write_epic_outputs(epic_data, loaded):
+        epic_index = index_epic_metrics(epic_data)
+        for initiatives_file, initiatives in loaded.items():
+            enriched_initiatives = merge_initiatives_with_epic_metrics(initiatives, epic_index=epic_index)
+            write_dataset_to_json(enriched_initiatives, filename=epics_output_for(initiatives_file))
+
     def run_epics_dataset():
-        try:
-            initiatives = load_initiatives()
-        except FileNotFoundError as exc:
-            logging.error("Cannot run epics task: %s", exc)
-            return
-        except InitiativeLoadError as exc:
-            logging.error("Cannot run epics task: %s", exc)
+        loaded = load_initiative_files()
+        if not loaded:
             return
 
-        epic_keys: list[str] = []
-        for group in initiatives:
-            for epic in group.get("epics", []):
-                key = epic.get("key")
-                if key and key not in epic_keys:
-                    epic_keys.append(key)
-
-        epic_data = get_epics_dataset(jira_service, epic_keys)
+        epic_keys = collect_epic_keys(loaded.values())
+        if shard_spec is not None:
+            epic_keys = shard_spec.select(epic_keys)
+        if from_store:
+            epic_data = get_epics_dataset_from_store(store, epic_keys, jira_service.client_info(), workflow)
+        else:
+            epic_data = get_epics_dataset(
+                jira_service, epic_keys, store=store, workflow=workflow, checkpoint=checkpoint
+            )
+        if shard_spec is not None:
+            # Initiatives are enriched by the merge task, once every epic is in.
+            write_dataset_to_json(epic_data, filename=shard_spec.filename(epics_out))
+            print(f"Shard {shard_spec}: {len(epic_data)} epic(s)")
+            return
         print("Epics Dataset:", epic_data)
-
-        enriched_initiatives = merge_initiatives_with_epic_metrics(initiatives, epic_data)
-        write_dataset_to_json(enriched_initiatives, filename=epics_out)
+        write_epic_outputs(epic_data, loaded)
 
     def run_active_sprint():
+        if as_of:
+            snapshot = board_snapshot_at(store, runtime_config.board_id, as_of)
+            if snapshot is None:
+                logging.error("No active sprint snapshot recorded by %s", as_of)
+                return
+            write_dataset_to_json(snapshot, filename=active_sprint_out)
+            print(f"Active sprint {snapshot['sprint_info']['name']} as of {as_of}")
+            return
+        if watch_interval:
+            try:
+                watch_active_sprint(
+                    jira_service,
+                    store if store is not None else open_store(":memory:"),
+                    runtime_config.board_id,
+                    runtime_config.story_points_field,
+                    active_sprint_out,
+                    interval=watch_interval,
+                    workflow=workflow,
+                )
+            except KeyboardInterrupt:
+                print("Stopped watching the active sprint.")
+            return
+
         sprint_dataset = get_sprint_insights_with_creep(
-            jira_service, runtime_config.board_id, runtime_config.story_points_field
+            jira_service,
+            runtime_config.board_id,
+            runtime_config.story_points_field,
+            store=store,
+            workflow=workflow,
         )
         write_dataset_to_json(sprint_dataset, filename=active_sprint_out)
         print(sprint_dataset)
 
+    def run_sync():
+        if store is None:
+            logging.error("Cannot run sync task: --store is required")
+            return
+        changed = sync_board(jira_service, store, runtime_config.board_id, runtime_config.story_points_field)
+        print(f"Synced {len(changed)} changed issue(s)")
+
+    def run_burndown():
+        burndown = get_sprint_burndown(
+            jira_service, runtime_config.board_id, runtime_config.story_points_field, workflow=workflow
+        )
+        if burndown is None:
+            logging.error("Cannot run burndown task: no active or closed sprint found")
+            return
+        write_dataset_to_json(burndown, filename=burndown_out)
+        plot_burndown(data_filename=burndown_out, output_filename=burndown_chart_out)
+        print(f"Burndown for {burndown['sprint']}: {len(burndown['date'])} day(s)")
+
+    def run_cfd():
+        if not runtime_config.project_key:
+            logging.error("Cannot run cfd task: JIRA_PROJECT_KEY is not set")
+            return
+        flow = get_cumulative_flow(jira_service, runtime_config.project_key, cfd_days, workflow=workflow)
+        write_dataset_to_json(flow, filename=cfd_out)
+        plot_cumulative_flow(data_filename=cfd_out, output_filename=cfd_chart_out)
+        print(f"Cumulative flow: {len(flow['statuses'])} status(es) over {len(flow['date'])} day(s)")
+
+    def run_forecast():
+        try:
+            sprint_rows = load_sprint_rows(sprints_out)
+            epic_groups = [
+                group for initiatives_file in initiatives_files
+                for group in load_epic_groups(epics_output_for(initiatives_file))
+            ]
+        except FileNotFoundError as exc:
+            logging.error("Cannot run forecast task: %s (run sprints_dataset and epics_dataset first)", exc)
+            return
+        forecast = forecast_delivery(epic_groups, sprint_rows, trials=forecast_trials)
+        if not forecast["throughput"]["samples"]:
+            logging.warning("Sprint dataset %s has no CompletedIssues column; forecasts are open-ended", sprints_out)
+        write_dataset_to_json(forecast, filename=forecast_out)
+        print(f"Forecast {len(forecast['epics'])} epic(s) and {len(forecast['initiatives'])} initiative(s)")
+
+    def run_merge():
+        try:
+            sprint_data = merge_sprint_shards(sprints_out)
+            epic_data = merge_epic_shards(epics_out)
+        except ShardMergeError as exc:
+            logging.error("Cannot run merge task: %s", exc)
+            return
+        if sprint_data is None and epic_data is None:
+            logging.error("Cannot run merge task: no shard outputs found for %s or %s", sprints_out, epics_out)
+            return
+        # Merged partials are removed so a later merge cannot pick them up
+        # alongside the outputs of a newer, incomplete sharded run.
+        if sprint_data is not None:
+            write_dataset_to_csv(sprint_data, filename=sprints_out)
+            plot_velocity_cycle_time(data_filename=sprints_out, output_filename=chart_out)
+            remove_shard_files(sprints_out)
+            print(f"Merged {len(sprint_data)} sprint(s) into {sprints_out}")
+        if epic_data is not None:
+            loaded = load_initiative_files()
+            if not loaded:
+                return
+            write_epic_outputs(epic_data, loaded)
+            remove_shard_files(epics_out)
+            print(f"Merged {len(epic_data)} epic(s) into {len(loaded)} initiatives output(s)")
+
+    def run_export():
+        sources = [(active_sprint_out, compact_sprint_insights)]
+        sources += [(epics_output_for(initiatives_file), compact_initiatives) for initiatives_file in initiatives_files]
+        exported = 0
+        for source, compact in sources:
+            try:
+                data = read_dataset_from_json(source)
+            except FileNotFoundError:
+                logging.warning("Skipping export of %s: file not found", source)
+                continue
+            if not isinstance(data, (dict, list)):
+                logging.warning("Skipping export of %s: %s", source, data)
+                continue
+            target = compact_output_name(source)
+            write_dataset_to_json(compact(data, token_budget=export_budget or None), filename=target, compact=True)
+            exported += 1
+            print(f"Exported {target}")
+        if not exported:
+            logging.error("Cannot run export task: run active_sprint or epics_dataset first")
+
+    def run_report():
+        rendered = []
+        try:
+            active_sprint = read_dataset_from_json(active_sprint_out)
+        except FileNotFoundError:
+            active_sprint = None
+        if isinstance(active_sprint, dict):
+            rendered.append(write_report(render_sprint_insights(active_sprint), SPRINT_REPORT))
+
+        try:
+            sprint_rows = load_sprint_rows(sprints_out)
+        except FileNotFoundError:
+            sprint_rows = None
+        if sprint_rows:
+            chart = copy_to_reports(resolve_path(chart_out))
+            rendered.append(write_report(render_team_insights(sprint_rows, chart), TEAM_REPORT))
+
+        for initiatives_file in initiatives_files:
+            try:
+                groups = read_dataset_from_json(epics_output_for(initiatives_file))
+            except FileNotFoundError:
+                continue
+            report = Path(INITIATIVE_REPORT)
+            if len(initiatives_files) > 1:
+                report = report.with_name(f"{report.stem}-{Path(initiatives_file).stem}{report.suffix}")
+            rendered.append(write_report(render_initiative_insights(groups), report))
+
+        if not rendered:
+            logging.error("Cannot run report task: run active_sprint, sprints_dataset or epics_dataset first")
+        for path in rendered:
+            print(f"Rendered {path}")
+
     task_map = {
         "project": run_project,
         "issue": run_issue,
         "sprints_dataset": run_sprints_dataset,
         "epics_dataset": run_epics_dataset,
         "active_sprint": run_active_sprint,
+        "sync": run_sync,
+        "burndown": run_burndown,
+        "cfd": run_cfd,
+        "forecast": run_forecast,
+        "merge": run_merge,
+        "export": run_export,
+        "report": run_report,
     }
 
-    for name in selected_tasks:
-        task_runner = task_map.get(name)
-        if task_runner is None:
-            raise ValueError(f"Unknown task '{name}'. Expected one of {', '.join(TASK_CHOICES)}")
-        task_runner()
+    try:
+        for name in selected_tasks:
+            task_runner = task_map.get(name)
+            if task_runner is None:
+                raise ValueError(f"Unknown task '{name}'. Expected one of {', '.join(TASK_CHOICES)}")
+            task_runner()
+        if checkpoint is not None:
+            if checkpoint.resumed:
+                print(f"Resumed {checkpoint.resumed} finished unit(s) from {checkpoint.path}")
+            checkpoint.clear()
+        if jira_service is None:
+            return
+        memo = jira_service.memo_counters
+        if memo["hits"] or memo["misses"]:
+            print(
+                f"Jira request memo: {memo['hits']} hit(s), {memo['misses']} miss(es), "
+                f"{memo['coalesced']} coalesced"
+            )
+        counters = jira_service.changelog_counters
+        if counters["truncated"]:
+            print(
+                f"Completed truncated changelogs of {counters['truncated']} of {counters['checked']} issue(s) "
+                f"({counters['histories_fetched']} histories fetched, {counters['fallbacks']} via full issue reads)"
+            )
+    finally:
+        if store is not None:
+            store.close()
 
 
 def main():
@@ -244,7 +773,147 @@ def main():
         help="Active sprint JSON output file",
     )
     parser.add_argument("--chart-out", type=str, default="velocity_cycle_time.png", help="Velocity/cycle chart output file")
+    parser.add_argument("--burndown-out", type=str, default="burndown.json", help="Burndown columnar JSON output file")
+    parser.add_argument("--burndown-chart-out", type=str, default="burndown.png", help="Burndown/burnup chart output file")
+    parser.add_argument("--cfd-days", type=int, default=365, help="History window of the cumulative flow diagram in days")
+    parser.add_argument("--cfd-out", type=str, default="cumulative_flow.json", help="Cumulative flow JSON output file")
+    parser.add_argument("--cfd-chart-out", type=str, default="cumulative_flow.png", help="Cumulative flow chart output file")
+    parser.add_argument(
+        "--store",
+        dest="store_path",
+        type=str,
+        default=None,
+        help="Local SQLite store to populate with extracted data",
+    )
+    parser.add_argument(
+        "--from-store",
+        action="store_true",
+        help="Answer sprints_dataset/epics_dataset from the local store instead of Jira",
+    )
+    parser.add_argument(
+        "--sprint-count",
+        type=int,
+        default=10,
+        help="Number of most recent closed sprints in the sprint dataset",
+    )
+    parser.add_argument(
+        "--sprint-batch-size",
+        type=int,
+        default=0,
+        help="Fetch done issues of this many sprints per search and regroup them by Sprint field",
+    )
+    parser.add_argument(
+        "--with-creep",
+        action="store_true",
+        help="Add scope-creep columns to the sprint dataset from the same extraction pass",
+    )
+    parser.add_argument(
+        "--cycle-distribution",
+        action="store_true",
+        help="Also write cycle-time percentiles, histogram and rolling percentiles per sprint",
+    )
+    parser.add_argument("--cycle-window", type=int, default=3, help="Sprints in the rolling cycle-time percentile window")
+    parser.add_argument(
+        "--cycle-distribution-out",
+        type=str,
+        default="cycle_time_distribution.json",
+        help="Cycle-time distribution JSON output file",
+    )
+    parser.add_argument(
+        "--cycle-distribution-chart-out",
+        type=str,
+        default="cycle_time_distribution.png",
+        help="Cycle-time distribution chart output file",
+    )
+    parser.add_argument(
+        "--forecast-trials",
+        type=int,
+        default=10000,
+        help="Monte Carlo trials per epic and initiative in the forecast",
+    )
+    parser.add_argument("--forecast-out", type=str, default="forecast.json", help="Delivery forecast JSON output file")
+    parser.add_argument(
+        "--export-budget",
+        type=int,
+        default=DEFAULT_TOKEN_BUDGET,
+        metavar="TOKENS",
+        help="Approximate token budget of each compact export (0 for no limit)",
+    )
+    parser.add_argument(
+        "--initiatives",
+        dest="initiatives_files",
+        nargs="+",
+        default=["initiatives.json"],
+        metavar="FILE",
+        help="Initiatives file(s) for the epics dataset (relative paths resolve against the config directory)",
+    )
+    parser.add_argument(
+        "--no-raw-search",
+        dest="raw_search",
+        action="store_false",
+        help="Build jira library objects for search results instead of decoding raw REST pages",
+    )
+    parser.add_argument(
+        "--changelog-workers",
+        type=int,
+        default=4,
+        help="Concurrent requests used to complete truncated issue changelogs",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue an interrupted run from its checkpoint without re-fetching finished sprints and epics",
+    )
+    parser.add_argument(
+        "--shard",
+        type=str,
+        default=None,
+        metavar="i/N",
+        help="Extract only shard i of N of the sprints and epics, writing partial outputs for the merge task",
+    )
+    parser.add_argument(
+        "--workflow",
+        dest="workflow_file",
+        type=str,
+        default="workflow.json",
+        help="Workflow status/field mapping file (relative paths resolve against the config directory)",
+    )
+    parser.add_argument(
+        "--as-of",
+        type=str,
+        default=None,
+        metavar="TIMESTAMP",
+        help="Rebuild the active sprint JSON from the snapshots recorded in the store at TIMESTAMP",
+    )
+    parser.add_argument(
+        "--watch",
+        dest="watch_interval",
+        type=float,
+        default=None,
+        metavar="INTERVAL",
+        help="Keep refreshing the active sprint JSON every INTERVAL seconds (active_sprint task only)",
+    )
     args = parser.parse_args()
+    if args.from_store and not args.store_path:
+        parser.error("--from-store requires --store")
+    if args.watch_interval is not None and args.task != "active_sprint":
+        parser.error("--watch requires --task active_sprint")
+    if args.as_of is not None and (args.task != "active_sprint" or not args.store_path):
+        parser.error("--as-of requires --task active_sprint and --store")
+    if args.sprint_batch_size and args.with_creep:
+        # The creep pass needs every issue of each sprint with its changelog,
+        # not the done issues a batched search regroups.
+        parser.error("--sprint-batch-size cannot be combined with --with-creep")
+    clashing = clashing_initiative_stems(args.initiatives_files)
+    if clashing:
+        parser.error(f"--initiatives files must have distinct names; repeated: {', '.join(clashing)}")
+    if args.shard is not None:
+        try:
+            parse_shard(args.shard)
+        except ValueError as exc:
+            parser.error(str(exc))
+        if args.task not in ("all", *SHARDED_TASKS):
+            parser.error("--shard requires --task all, sprints_dataset or epics_dataset")
 
     run_cli(
         task=args.task,
@@ -252,6 +921,31 @@ def main():
         epics_out=args.epics_out,
         active_sprint_out=args.active_sprint_out,
         chart_out=args.chart_out,
+        burndown_out=args.burndown_out,
+        burndown_chart_out=args.burndown_chart_out,
+        cfd_days=args.cfd_days,
+        cfd_out=args.cfd_out,
+        cfd_chart_out=args.cfd_chart_out,
+        store_path=args.store_path,
+        from_store=args.from_store,
+        watch_interval=args.watch_interval,
+        sprint_count=args.sprint_count,
+        with_creep=args.with_creep,
+        cycle_distribution=args.cycle_distribution,
+        cycle_window=args.cycle_window,
+        cycle_distribution_out=args.cycle_distribution_out,
+        cycle_distribution_chart_out=args.cycle_distribution_chart_out,
+        forecast_trials=args.forecast_trials,
+        forecast_out=args.forecast_out,
+        workflow_file=args.workflow_file,
+        initiatives_files=args.initiatives_files,
+        raw_search=args.raw_search,
+        sprint_batch_size=args.sprint_batch_size,
+        changelog_workers=args.changelog_workers,
+        resume=args.resume,
+        shard=args.shard,
+        export_budget=args.export_budget,
+        as_of=args.as_of,
     )
 
 if __name__ == "__main__":
@@ -1,92 +1,427 @@
 import argparse
-from html import parser
+import hashlib
+import json
 import os
 import sys
 import re
+import tempfile
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
 from dotenv import load_dotenv
 import markdown2
+import requests
+from requests.adapters import HTTPAdapter
 from atlassian import Confluence
 
 # Load environment variables from .env file
 load_dotenv()
 
+# Marker stored in page version comments and attachment comments so the next
+# publish can tell whether the rendered content actually changed.
+HASH_MARKER = "teambeacon-sha256:"
+
+IMAGE_PATTERN = re.compile(r'!\[.*?\]\((.*?)\)')
+IMG_TAG_PATTERN = re.compile(r'<img src="([^"]*)"[^>]*>')
+
+DEFAULT_IMG_BASE_PATH = os.getenv("TEAM_BEACON_REPORTS_DIR", "./reports/")
+DEFAULT_UPLOAD_WORKERS = 4
+DEFAULT_CONCURRENCY = 4
+MARKDOWN_EXTRAS = ("tables", "fenced-code-blocks")
+HEADING_PATTERN = re.compile(r'^#{1,6}\s')
+FENCE_PATTERN = re.compile(r'^\s*(```|~~~)')
+
+
+def content_hash(data) -> str:
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return HASH_MARKER + hashlib.sha256(data).hexdigest()
+
+
+def file_hash(path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return HASH_MARKER + digest.hexdigest()
+
+
+def fetch_page_state(conf, space, title):
+    """Return the page id, content hash and attachment hashes with a single GET.
+
+    Returns None when the page does not exist yet.
+    """
+    res = conf.get(
+        "rest/api/content",
+        params={
+            "spaceKey": space,
+            "title": title,
+            "type": "page",
+            "expand": "version,children.attachment",
+        },
+    )
+    results = (res or {}).get("results") or []
+    if not results:
+        return None
+
+    page = results[0]
+    attachments = {}
+    listing = ((page.get("children") or {}).get("attachment") or {})
+    for att in listing.get("results", []):
+        comment = (att.get("metadata") or {}).get("comment") or (att.get("version") or {}).get("message")
+        attachments[att.get("title")] = comment
+    if (listing.get("_links") or {}).get("next"):
+        # The expansion is paged; only then pay for the full attachment listing.
+        start = len(listing.get("results", []))
+        while True:
+            more = conf.get_attachments_from_content(page["id"], start=start, limit=100)
+            batch = (more or {}).get("results", [])
+            for att in batch:
+                attachments[att.get("title")] = (att.get("metadata") or {}).get("comment")
+            if len(batch) < 100:
+                break
+            start += len(batch)
+
+    return {
+        "id": page["id"],
+        "hash": (page.get("version") or {}).get("message"),
+        "attachments": attachments,
+    }
+
+
+class RenderCache:
+    """Markdown-to-HTML cache keyed by the markdown hash plus the extras configuration.
+
+    Entries live in a bounded in-memory LRU and, when ``directory`` is given, in
+    ``<sha256>.html`` files so repeated publishes reuse earlier renders.
+    """
+
+    def __init__(self, directory=None, max_entries=512):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = Lock()
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(markdown_text, extras):
+        payload = json.dumps(sorted(extras)) + "\0" + markdown_text
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def render(self, markdown_text, extras=MARKDOWN_EXTRAS):
+        key = self.key(markdown_text, extras)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+
+        path = os.path.join(self.directory, f"{key}.html") if self.directory else None
+        cached = path is not None and os.path.exists(path)
+        if cached:
+            with open(path, "r", encoding="utf-8") as fh:
+                html = fh.read()
+        else:
+            html = markdown2.markdown(markdown_text, extras=list(extras))
+            if path:
+                # Write to a private temp file and rename it into place so a
+                # concurrent or interrupted publish never reads a partial render.
+                fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+                try:
+                    with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                        fh.write(html)
+                    os.replace(tmp_path, path)
+                except BaseException:
+                    os.unlink(tmp_path)
+                    raise
+
+        with self._lock:
+            if cached:
+                self.hits += 1
+            else:
+                self.misses += 1
+            self._entries[key] = html
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return html
+
+
+def iter_markdown_sections(lines):
+    """Yield markdown chunks split before each heading that is outside a code fence.
+
+    Splitting at headings keeps tables and fenced blocks intact, but the HTML
+    is not always what the whole document renders to: markdown2 nests a heading
+    that follows a list item inside that ``<li>`` and keeps some blank lines
+    only when it sees the whole document, and reference-style link definitions
+    must live in the section using them. Chunked conversion is therefore
+    opt-in, since it changes the published body and its content hash.
+    """
+    section = []
+    in_fence = False
+    for line in lines:
+        if FENCE_PATTERN.match(line):
+            in_fence = not in_fence
+        elif not in_fence and HEADING_PATTERN.match(line) and section:
+            yield "".join(section)
+            section = []
+        section.append(line)
+    if section:
+        yield "".join(section)
+
+
+def rewrite_images(html_body, replacements):
+    """Replace every <img> whose src is in ``replacements`` in a single pass."""
+    if not replacements:
+        return html_body
+    return IMG_TAG_PATTERN.sub(lambda m: replacements.get(m.group(1), m.group(0)), html_body)
+
+
+def upload_attachments(conf, page_id, uploads, max_workers=DEFAULT_UPLOAD_WORKERS):
+    """Upload (path, filename, digest) tuples concurrently with a bounded pool."""
+    if not uploads:
+        return
+
+    def _upload(upload):
+        path, filename, digest = upload
+        print(f"Uploading {filename}...")
+        conf.attach_file(path, name=filename, page_id=page_id, comment=digest)
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(uploads)))) as pool:
+        # list() re-raises the first upload failure.
+        list(pool.map(_upload, uploads))
+
+
+def publish_markdown(
+    conf,
+    md_file,
+    title,
+    space,
+    parent=None,
+    img_base_path=DEFAULT_IMG_BASE_PATH,
+    upload_workers=DEFAULT_UPLOAD_WORKERS,
+    render_cache=None,
+    chunked=False,
+):
+    """Publish a markdown file, skipping page and attachment uploads that are unchanged."""
+
+    # 1. Convert the Markdown to HTML as one document (or, when chunked, section
+    # by section), reusing cached renders of unchanged input. This runs
+    # before the page lookup so an unreadable file never leaves an empty page.
+    print(f"Reading Markdown file: {md_file}")
+    render_cache = render_cache or RenderCache()
+    html_chunks = []
+    image_paths = []
+    with open(md_file, "r", encoding="utf-8") as f:
+        sections = iter_markdown_sections(f) if chunked else [f.read()]
+        for section in sections:
+            image_paths.extend(match.group(1) for match in IMAGE_PATTERN.finditer(section))
+            html_chunks.append(render_cache.render(section))
+    print(
+        f"Converted Markdown to HTML in {len(html_chunks)} chunk(s) "
+        f"({render_cache.hits} cached, {render_cache.misses} rendered)."
+    )
+
+    # 2. Get or Create Page ID (Needed to attach files)
+    state = fetch_page_state(conf, space, title)
+    if state is None:
+        res = conf.create_page(space, title, body="", parent_id=parent)
+        state = {"id": res['id'], "hash": None, "attachments": {}}
+    page_id = state["id"]
+    print(f"Using page ID: {page_id} for updates and attachments.")
+
+    # 3. Handle Images: for each ![alt](path), collect uploads and the
+    # Confluence-specific XML
+    replacements = {}
+    uploads = []
+    for img_path in image_paths:
+        if img_path in replacements:
+            continue
+
+        local_path = os.path.join(img_base_path, img_path)
+        if not os.path.exists(local_path):
+            print(f"Warning: Image path not found: {img_path}")
+            continue
+
+        filename = os.path.basename(img_path)
+        digest = file_hash(local_path)
+        if state["attachments"].get(filename) == digest:
+            print(f"Skipping unchanged attachment {filename}")
+        else:
+            uploads.append((local_path, filename, digest))
+        replacements[img_path] = f'<ac:image><ri:attachment ri:filename="{filename}" /></ac:image>'
+
+    upload_attachments(conf, page_id, uploads, max_workers=upload_workers)
+
+    # 4. Rewrite images chunk by chunk and hash the storage HTML incrementally;
+    # the full body is only joined when the page actually needs an update
+    body_digest = hashlib.sha256()
+    for index, chunk in enumerate(html_chunks):
+        html_chunks[index] = rewrite_images(chunk, replacements)
+        body_digest.update(html_chunks[index].encode("utf-8"))
+    body_hash = HASH_MARKER + body_digest.hexdigest()
+
+    # 5. Update the page with the final content, unless it is already published
+    if state["hash"] == body_hash:
+        print(f"Page content unchanged; skipped update of ID: {page_id}")
+        return page_id
+
+    conf.update_page(
+        page_id=page_id,
+        title=title,
+        body="".join(html_chunks),
+        representation='storage',
+        version_comment=body_hash,
+        always_update=True,
+    )
+    print(f"Published successfully to ID: {page_id}")
+    return page_id
+
+
+def load_manifest(path):
+    """Load a batch manifest: a JSON list of {"file", "title", "parent"?, "space"?} entries."""
+    with open(path, "r", encoding="utf-8") as fh:
+        entries = json.load(fh)
+    if not isinstance(entries, list):
+        raise ValueError("Manifest must contain a list of entries")
+    for entry in entries:
+        if not isinstance(entry, dict) or not entry.get("file") or not entry.get("title"):
+            raise ValueError("Each manifest entry must be an object with 'file' and 'title'")
+    return entries
+
+
+def pooled_session(pool_size, verify=True):
+    """Return a requests session whose connection pool fits ``pool_size`` concurrent calls.
+
+    The Confluence client takes TLS verification from the session it is given,
+    so ``verify`` must be set here rather than through ``verify_ssl``.
+    """
+    session = requests.Session()
+    session.verify = verify
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(pool_size, 1))
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def publish_batch(
+    conf,
+    entries,
+    space,
+    parent=None,
+    img_base_path=DEFAULT_IMG_BASE_PATH,
+    concurrency=DEFAULT_CONCURRENCY,
+    upload_workers=DEFAULT_UPLOAD_WORKERS,
+    render_cache=None,
+    chunked=False,
+):
+    """Publish manifest entries concurrently over one Confluence session.
+
+    Returns one result per entry, in manifest order, with the page id or the
+    error and the elapsed seconds.
+    """
+
+    def _publish(entry):
+        started = time.perf_counter()
+        result = {"file": entry["file"], "title": entry["title"], "page_id": None, "error": None}
+        try:
+            result["page_id"] = publish_markdown(
+                conf,
+                entry["file"],
+                entry["title"],
+                entry.get("space", space),
+                entry.get("parent", parent),
+                img_base_path=entry.get("img_base", img_base_path),
+                upload_workers=upload_workers,
+                render_cache=render_cache,
+                chunked=chunked,
+            )
+        except Exception as exc:
+            result["error"] = str(exc)
+        result["seconds"] = round(time.perf_counter() - started, 3)
+        return result
+
+    render_cache = render_cache or RenderCache()
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        return list(pool.map(_publish, entries))
+
+
+def print_batch_summary(results):
+    print("\nBatch publish summary:")
+    for result in results:
+        outcome = f"FAILED: {result['error']}" if result["error"] else f"page {result['page_id']}"
+        print(f"  {result['seconds']:>8.2f}s  {result['title']}  ({outcome})")
+    failures = sum(1 for result in results if result["error"])
+    print(f"Published {len(results) - failures}/{len(results)} page(s); {failures} failure(s).")
+    return failures
+
+
 def publish_report():
     print("Processing configurations and arguments...")
     parser = argparse.ArgumentParser(description="Publish Markdown to Confluence via PAT")
-    
-    # Required Arguments
-    parser.add_argument("--file", required=True, help="Path to the .md file")
-    parser.add_argument("--title", required=True, help="Title of the Confluence page")
-        
+
+    # Required Arguments (either --file/--title or --manifest)
+    parser.add_argument("--file", help="Path to the .md file")
+    parser.add_argument("--title", help="Title of the Confluence page")
+    parser.add_argument("--manifest", help="JSON list of {file, title, parent} entries to publish in one session")
+
     # Configuration
     parser.add_argument("--url", default=os.getenv("CONFLUENCE_URL"), help="Base URL")
     parser.add_argument("--token", default=os.getenv("CONFLUENCE_PAT"), help="Personal Access Token")
     parser.add_argument("--space", default=os.getenv("CONFLUENCE_SPACE_KEY"), help="Confluence Space key")
     parser.add_argument("--parent", default=os.getenv("CONFLUENCE_PARENT_PAGE_ID"), help="The ID of the parent page to nest this report under")
     parser.add_argument("--insecure", action="store_true", help="Skip SSL verification")
+    parser.add_argument("--img-base", default=DEFAULT_IMG_BASE_PATH, help="Directory that image paths in the markdown are relative to")
+    parser.add_argument("--upload-workers", type=int, default=DEFAULT_UPLOAD_WORKERS, help="Maximum concurrent attachment uploads")
+    parser.add_argument("--render-cache", default=os.getenv("TEAM_BEACON_RENDER_CACHE"), help="Directory for cached Markdown renders reused across runs")
+    parser.add_argument("--stream", action="store_true", help="Render the Markdown section by section, reusing cached sections (the HTML can differ from a whole-document render)")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="Maximum pages published concurrently in --manifest mode")
 
 
     args = parser.parse_args()
 
+    if not args.manifest and not (args.file and args.title):
+        parser.error("Provide --file and --title, or --manifest")
+
     if not args.url or not args.token:
         print("Error: Missing URL or PAT. Set CONFLUENCE_URL and CONFLUENCE_PAT env vars.")
         sys.exit(1)
 
-    conf = Confluence(url=args.url, token=args.token, verify_ssl=not args.insecure)
+    session = pooled_session(args.concurrency * args.upload_workers, verify=not args.insecure)
+    conf = Confluence(url=args.url, token=args.token, verify_ssl=not args.insecure, session=session)
 
+    render_cache = RenderCache(args.render_cache)
 
-    # 1. Read Markdown
-    print(f"Reading Markdown file: {args.file}")
-    with open(args.file, "r", encoding="utf-8") as f:
-        md_content = f.read()
+    if args.manifest:
+        results = publish_batch(
+            conf,
+            load_manifest(args.manifest),
+            args.space,
+            args.parent,
+            img_base_path=args.img_base,
+            concurrency=args.concurrency,
+            upload_workers=args.upload_workers,
+            render_cache=render_cache,
+            chunked=args.stream,
+        )
+        if print_batch_summary(results):
+            sys.exit(1)
+        return
 
-    # 2. Get or Create Page ID (Needed to attach files)
-    if conf.page_exists(args.space, args.title):
-        page_id = conf.get_page_id(args.space, args.title)
-    else:
-        res = conf.create_page(args.space, args.title, body="", parent_id=args.parent)
-        page_id = res['id']
-    print(f"Using page ID: {page_id} for updates and attachments.")
-
-
-    # 3. Convert remaining MD to HTML
-    html_body = markdown2.markdown(md_content, extras=["tables", "fenced-code-blocks"])
-    print("Converted Markdown to HTML. Final content length:", len(html_body))
-
-    # TODO: move below to config or env vars
-    img_base_path = "./reports/"
-
-    # 4. Handle Images: Find all ![alt](path)
-    # finditer gives us access to the 'full match' and the 'groups'
-    image_matches = list(re.finditer(r'!\[.*?\]\((.*?)\)', md_content))
-
-    for match in image_matches:
-        full_md_match = match.group(0)  # The entire string: ![alt](path)
-        img_path = match.group(1)      # Just the path: path/to/image.png
-        
-        if os.path.exists(img_base_path + img_path):
-            filename = os.path.basename(img_path)
-            
-            print(f"Uploading {filename}...")
-            conf.attach_file(img_base_path + img_path, name=filename, page_id=page_id)
-            
-            # Create the Confluence-specific XML
-            confluence_img_xml = f'<ac:image><ri:attachment ri:filename="{filename}" /></ac:image>'
-            
-            # Replace the specific full match in the content
-            html_body = re.sub(rf'<img src="{re.escape(img_path)}".*?>', confluence_img_xml, html_body)
-            #md_content = md_content.replace(full_md_match, confluence_img_xml)
-        else:
-            print(f"Warning: Image path not found: {img_path}")
-
-    # 5. Update the page with the final content
-    conf.update_page(
-        page_id=page_id,
-        title=args.title,
-        body=html_body,
-        representation='storage'
+    publish_markdown(
+        conf,
+        args.file,
+        args.title,
+        args.space,
+        args.parent,
+        img_base_path=args.img_base,
+        upload_workers=args.upload_workers,
+        render_cache=render_cache,
+        chunked=args.stream,
     )
-    print(f"Published successfully to ID: {page_id}")
 
 if __name__ == "__main__":
-    publish_report()
\ No newline at end of file
+    publish_report()
@@ -0,0 +1,255 @@
+"""Deterministic markdown rendering of the tabular report sections.
+
+Reports are filled from ``string.Template`` templates: the built-in ones
+below, or ``<name>.md`` in the ``templates`` folder of the config directory
+when present. Sections that need judgement are left as
+``<!-- narrative: ... -->`` markers for the insight workflows to fill in;
+the markers are invisible once published.
+"""
+
+from __future__ import annotations
+
+import datetime
+import os
+import shutil
+from pathlib import Path
+from string import Template
+from typing import Iterable, Mapping, Sequence
+
+from dateutil import parser
+
+from .io_utils import _config_dir
+
+
+SPRINT_REPORT = "Report-Sprint-Insights.md"
+TEAM_REPORT = "Report-Team-Insights.md"
+INITIATIVE_REPORT = "Report-Initiative-Insights.md"
+
+SPRINT_TEMPLATE = """\
+### Sprint Overview
+- Name: $name
+- Start Date: $start
+- End Date: $end
+- Days Remaining: $days_remaining
+### Stages
+- Total Issues: $total_issues
+- To Do: $todo
+- In Progress: $in_progress
+- Completed: $completed
+### Points
+- Total Points: $points_total
+- Points Completed: $points_completed
+- Points Remaining: $points_remaining
+
+### AI Scrum Master Insights
+<!-- narrative: insights -->
+
+---
+
+### Sprint Backlog
+$backlog
+"""
+
+TEAM_TEMPLATE = """\
+# Team Insights ($date)
+
+## Introduction
+<!-- narrative: introduction -->
+
+## Data
+$sprints
+
+$chart
+
+## Analysis
+<!-- narrative: analysis -->
+
+## Recommendation
+<!-- narrative: recommendation -->
+
+## Conclusion
+<!-- narrative: conclusion -->
+"""
+
+INITIATIVE_TEMPLATE = """\
+$epics
+"""
+
+BUILTIN_TEMPLATES = {
+    "sprint_insights": SPRINT_TEMPLATE,
+    "team_insights": TEAM_TEMPLATE,
+    "initiative_insights": INITIATIVE_TEMPLATE,
+}
+DATE_COLUMNS = ("StartDate", "EndDate", "CompletedDate")
+
+
+def _reports_dir() -> Path:
+    path = Path(os.getenv("TEAM_BEACON_REPORTS_DIR", "./reports"))
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def load_template(name: str) -> Template:
+    """Template ``name`` from ``<config dir>/templates/<name>.md``, else the built-in one."""
+
+    path = _config_dir() / "templates" / f"{name}.md"
+    if path.exists():
+        return Template(path.read_text(encoding="utf-8"))
+    return Template(BUILTIN_TEMPLATES[name])
+
+
+def markdown_table(headers: Sequence[str], rows: Iterable[Sequence]) -> str:
+    lines = ["| " + " | ".join(headers) + " |", "|" + "|".join("---" for _ in headers) + "|"]
+    for row in rows:
+        cells = ("" if value is None else str(value).replace("|", "\\|").replace("\n", " ") for value in row)
+        lines.append("| " + " | ".join(cells) + " |")
+    return "\n".join(lines)
+
+
+def _number(value) -> str:
+    try:
+        number = float(value or 0)
+    except (TypeError, ValueError):
+        return str(value)
+    return str(int(number)) if number.is_integer() else f"{number:g}"
+
+
+def _date(value, fmt: str = "%d-%b-%Y") -> str:
+    if not value or value == "N/A":
+        return "N/A"
+    try:
+        return parser.parse(str(value)).strftime(fmt)
+    except (ValueError, OverflowError):
+        return str(value)
+
+
+def _link(text, key, base_url) -> str:
+    if not key:
+        return text or ""
+    return f"[{text or key}]({base_url}/browse/{key})" if base_url else str(text or key)
+
+
+def working_days_left(end, today: datetime.date | None = None) -> int:
+    """Weekdays after ``today`` and before the sprint's last day."""
+
+    if not end:
+        return 0
+    try:
+        end_date = parser.parse(str(end)).date()
+    except (ValueError, OverflowError):
+        return 0
+    day = (today or datetime.date.today()) + datetime.timedelta(days=1)
+    days = 0
+    while day < end_date:
+        if day.weekday() < 5:
+            days += 1
+        day += datetime.timedelta(days=1)
+    return days
+
+
+def render_sprint_insights(dataset: Mapping, today: datetime.date | None = None) -> str:
+    """Overview, stages, points and backlog sections of the active sprint report."""
+
+    info = dataset.get("sprint_info") or {}
+    stages = dataset.get("stages") or {}
+    points = dataset.get("points") or {}
+    base_url = info.get("jira_base_url")
+    backlog = markdown_table(
+        ("Epic", "Card", "Title", "Assignee", "Points", "Status", "Scope creep"),
+        (
+            (
+                _link(issue.get("epic_title"), issue.get("epic_key"), base_url),
+                _link(issue.get("key"), issue.get("key"), base_url),
+                issue.get("title"),
+                issue.get("assignee"),
+                _number(issue.get("points")),
+                issue.get("status"),
+                "Yes" if issue.get("is_creep") else "No",
+            )
+            for issue in dataset.get("issue_collection", [])
+        ),
+    )
+    return load_template("sprint_insights").safe_substitute(
+        name=info.get("name", "N/A"),
+        start=_date(info.get("start")),
+        end=_date(info.get("end")),
+        days_remaining=working_days_left(info.get("end"), today),
+        total_issues=(dataset.get("metrics") or {}).get("total_issues", 0),
+        todo=stages.get("To Do", 0),
+        in_progress=stages.get("In Progress", 0),
+        completed=stages.get("Done", 0),
+        points_total=_number(points.get("total")),
+        points_completed=_number(points.get("completed")),
+        points_remaining=_number(points.get("remaining")),
+        backlog=backlog,
+    )
+
+
+def render_team_insights(sprint_rows: Sequence[Mapping], chart: str | None = None, today: datetime.date | None = None) -> str:
+    """Team report with the sprint dataset table and velocity chart filled in."""
+
+    columns = list(sprint_rows[0]) if sprint_rows else []
+    table = markdown_table(
+        columns,
+        ([_date(row.get(name), "%Y-%m-%d") if name in DATE_COLUMNS else row.get(name) for name in columns] for row in sprint_rows),
+    )
+    return load_template("team_insights").safe_substitute(
+        date=(today or datetime.date.today()).isoformat(),
+        sprints=table,
+        chart=f"![Velocity and cycle time]({chart})" if chart else "",
+    )
+
+
+def rag_status(percentage_done) -> str:
+    done = float(percentage_done or 0)
+    if done > 66:
+        return "🟢 Green"
+    if done < 40:
+        return "🔴 Red"
+    return "🟠 Amber"
+
+
+def render_initiative_insights(groups: Iterable[Mapping]) -> str:
+    """Epic progress table of the initiative report; the Insights column is left blank."""
+
+    rows = []
+    seen = set()
+    for group in groups:
+        for epic in group.get("epics", []):
+            key = epic.get("key")
+            if key in seen or epic.get("total_issues") is None:
+                continue
+            seen.add(key)
+            link = epic.get("link")
+            rows.append(
+                (
+                    f"[{key}]({link})" if link else key,
+                    epic.get("title"),
+                    epic.get("total_issues"),
+                    f"**{round(float(epic.get('percentage_done') or 0))}%**",
+                    f"**{round(float(epic.get('percentage_inprogress') or 0))}%**",
+                    f"**{round(float(epic.get('percentage_todo') or 0))}%**",
+                    rag_status(epic.get("percentage_done")),
+                    "",
+                )
+            )
+    table = markdown_table(("Epic", "Initiative", "Count", "Completed", "In Progress", "To Do", "RAG", "Insights"), rows)
+    return load_template("initiative_insights").safe_substitute(epics=table)
+
+
+def write_report(text: str, filename: str | os.PathLike) -> Path:
+    path = Path(filename)
+    if not path.is_absolute():
+        path = _reports_dir() / path
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+def copy_to_reports(source: str | os.PathLike) -> str | None:
+    """Copy an image next to the reports so they can reference it by name."""
+
+    source = Path(source)
+    if not source.exists():
+        return None
+    shutil.copyfile(source, _reports_dir() / source.name)
+    return source.name
@@ -0,0 +1,136 @@
+"""Deterministic partitioning of extraction work across shards, and merging of their outputs."""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterable
+
+from .forecast_service import load_sprint_rows
+from .io_utils import resolve_path
+
+
+_SHARD_SPEC = re.compile(r"^\s*(\d+)\s*/\s*(\d+)\s*$")
+
+
+class ShardMergeError(RuntimeError):
+    """Raised when the shard outputs of a dataset are missing or inconsistent."""
+
+
+@dataclass(frozen=True)
+class Shard:
+    """Shard ``index`` (1-based) of ``count``.
+
+    A unit belongs to the shard selected by the CRC-32 of its key, so every
+    process, machine and run assigns it to the same shard without
+    coordination (unlike ``hash()``, which is salted per process).
+    """
+
+    index: int
+    count: int
+
+    def __str__(self) -> str:
+        return f"{self.index}/{self.count}"
+
+    def owns(self, key) -> bool:
+        return zlib.crc32(str(key).encode("utf-8")) % self.count == self.index - 1
+
+    def select(self, units: Iterable, key: Callable = lambda unit: unit) -> list:
+        return [unit for unit in units if self.owns(key(unit))]
+
+    def filename(self, filename: str | os.PathLike) -> str:
+        """Partial output name of this shard, e.g. ``sprints_dataset.shard-2-of-4.csv``."""
+
+        path = Path(filename)
+        return str(path.with_name(f"{path.stem}.shard-{self.index}-of-{self.count}{path.suffix}"))
+
+
+def parse_shard(value: str) -> Shard:
+    """Parse an ``i/N`` shard spec such as ``2/4``."""
+
+    match = _SHARD_SPEC.match(value or "")
+    if match:
+        index, count = int(match.group(1)), int(match.group(2))
+        if 1 <= index <= count:
+            return Shard(index, count)
+    raise ValueError(f"Invalid shard '{value}': expected i/N with 1 <= i <= N")
+
+
+def _shard_candidates(path: Path):
+    pattern = re.compile(rf"^{re.escape(path.stem)}\.shard-(\d+)-of-(\d+){re.escape(path.suffix)}$")
+    for candidate in path.parent.iterdir():
+        match = pattern.match(candidate.name)
+        if match:
+            yield candidate, int(match.group(1)), int(match.group(2))
+
+
+def find_shard_files(filename: str | os.PathLike) -> list[Path]:
+    """Partial outputs of every shard of ``filename``, in shard order.
+
+    Returns an empty list when no shard wrote ``filename``; raises
+    ``ShardMergeError`` when some shards are missing or outputs of runs with
+    different shard counts are mixed.
+    """
+
+    path = resolve_path(filename)
+    found = {(count, index): candidate for candidate, index, count in _shard_candidates(path)}
+
+    counts = sorted({count for count, _ in found})
+    if not counts:
+        return []
+    if len(counts) > 1:
+        raise ShardMergeError(f"Shard outputs for {path.name} mix shard counts {counts}; remove the stale ones")
+    count = counts[0]
+    missing = [index for index in range(1, count + 1) if (count, index) not in found]
+    if missing:
+        raise ShardMergeError(f"Shard(s) {missing} of {count} have not written {path.name} yet")
+    return [found[(count, index)] for index in range(1, count + 1)]
+
+
+def merge_sprint_shards(filename: str | os.PathLike) -> list[dict] | None:
+    """Combine the partial sprint datasets into one, most recent sprint first.
+
+    Returns ``None`` when no shard wrote the dataset.
+    """
+
+    paths = find_shard_files(filename)
+    if not paths:
+        return None
+    rows = [row for path in paths for row in load_sprint_rows(path)]
+    # Same order as fetch_closed_sprints, which the unsharded dataset follows.
+    rows.sort(key=lambda row: row.get("StartDate") or "", reverse=True)
+    return rows
+
+
+def merge_epic_shards(filename: str | os.PathLike) -> list[dict] | None:
+    """Combine the partial epics datasets (one metrics record per epic).
+
+    Returns ``None`` when no shard wrote the dataset.
+    """
+
+    paths = find_shard_files(filename)
+    if not paths:
+        return None
+    records: list[dict] = []
+    for path in paths:
+        with path.open("r", encoding="utf-8") as fh:
+            records.extend(json.load(fh))
+    return records
+
+
+def remove_shard_files(filename: str | os.PathLike) -> int:
+    """Delete every partial output of ``filename`` once it has been merged.
+
+    Leaving merged partials behind would let a later merge silently combine
+    them with the outputs of a newer, incomplete run. Returns the number of
+    files removed.
+    """
+
+    paths = [candidate for candidate, _, _ in _shard_candidates(resolve_path(filename))]
+    for path in paths:
+        path.unlink()
+    return len(paths)
@@ -0,0 +1,172 @@
+"""Point-in-time history of the active sprint dataset as compressed deltas.
+
+Every recorded snapshot stores only what changed since the previous one:
+top-level sections that differ, the changed fields of changed issues, new
+issues, removed keys and (when it changed) the issue order. Values that only
+move with the clock (issue ages and the sprint's remaining days) are left out
+and recomputed from the stored timestamps as of the snapshot's time, so an
+unchanged issue costs nothing however long it ages. Every
+``KEYFRAME_INTERVAL``-th snapshot of a sprint stores the full state instead,
+so rebuilding any moment replays at most that many deltas.
+"""
+
+from __future__ import annotations
+
+import datetime
+import json
+import zlib
+from typing import Mapping
+
+from dateutil import parser
+
+from .local_store import LocalStore, to_utc_timestamp
+
+
+KEYFRAME_INTERVAL = 24
+META_SECTIONS = ("sprint_info", "metrics", "stages", "points", "creep_issues")
+AGE_FIELDS = ("days_in_status", "blocked_days")
+
+
+def _without_ages(issue: dict) -> dict:
+    # Entries without ``status_since`` predate stored timestamps; keep their ages.
+    if "status_since" not in issue:
+        return issue
+    return {name: value for name, value in issue.items() if name not in AGE_FIELDS}
+
+
+def snapshot_state(dataset: Mapping) -> dict:
+    """Split an active sprint dataset into its sections and issues keyed by issue key."""
+
+    # Round-trip through JSON so the state compares equal to a decoded one.
+    dataset = json.loads(json.dumps(dataset, default=str))
+    issues = dataset.get("issue_collection", [])
+    meta = {name: dataset.get(name) for name in META_SECTIONS}
+    sprint_info = meta["sprint_info"]
+    if isinstance(sprint_info, dict) and "end" in sprint_info:
+        meta["sprint_info"] = {name: value for name, value in sprint_info.items() if name != "remaining_days"}
+    return {
+        "meta": meta,
+        "issues": {issue["key"]: _without_ages(issue) for issue in issues},
+        "order": [issue["key"] for issue in issues],
+    }
+
+
+def state_to_dataset(state: Mapping, now: datetime.datetime | None = None) -> dict:
+    """Rebuild the dataset of a state, with ages and remaining days as of ``now``."""
+
+    # sprint_service records snapshots itself, so import it at call time.
+    from .sprint_service import issue_ages, remaining_days
+
+    now = now or datetime.datetime.now(datetime.timezone.utc)
+    dataset = dict(state["meta"])
+    sprint_info = dataset.get("sprint_info")
+    if isinstance(sprint_info, dict) and "end" in sprint_info:
+        dataset["sprint_info"] = {**sprint_info, "remaining_days": remaining_days(sprint_info["end"], now)}
+    issues = []
+    for key in state["order"]:
+        issue = state["issues"][key]
+        if "status_since" in issue:
+            issue = {**issue, **issue_ages(issue, now)}
+        issues.append(issue)
+    dataset["issue_collection"] = issues
+    return dataset
+
+
+def diff_states(previous: Mapping | None, current: Mapping) -> dict:
+    """Delta turning ``previous`` into ``current``; the full state when ``previous`` is None."""
+
+    if previous is None:
+        return {"meta": current["meta"], "set": current["issues"], "order": current["order"]}
+
+    delta: dict = {}
+    meta = {name: value for name, value in current["meta"].items() if previous["meta"].get(name) != value}
+    if meta:
+        delta["meta"] = meta
+    changed = {}
+    for key, issue in current["issues"].items():
+        before = previous["issues"].get(key)
+        if before is None:
+            changed[key] = issue
+        elif before != issue:
+            changed[key] = {name: value for name, value in issue.items() if before.get(name) != value}
+    if changed:
+        delta["set"] = changed
+    removed = [key for key in previous["issues"] if key not in current["issues"]]
+    if removed:
+        delta["removed"] = removed
+    if current["order"] != previous["order"]:
+        delta["order"] = current["order"]
+    return delta
+
+
+def apply_delta(state: Mapping | None, delta: Mapping) -> dict:
+    state = state or {"meta": {}, "issues": {}, "order": []}
+    issues = dict(state["issues"])
+    for key in delta.get("removed", []):
+        issues.pop(key, None)
+    for key, fields in delta.get("set", {}).items():
+        issues[key] = {**issues.get(key, {}), **fields}
+    return {
+        "meta": {**state["meta"], **delta.get("meta", {})},
+        "issues": issues,
+        "order": delta.get("order", state["order"]),
+    }
+
+
+def _encode(delta: Mapping) -> bytes:
+    return zlib.compress(json.dumps(delta, separators=(",", ":"), ensure_ascii=False).encode("utf-8"), 9)
+
+
+def _replay(rows) -> dict | None:
+    state = None
+    for row in rows:
+        state = apply_delta(None if row["keyframe"] else state, json.loads(zlib.decompress(row["payload"])))
+    return state
+
+
+def record_sprint_snapshot(
+    store: LocalStore, sprint_id: int, dataset: Mapping, taken_at: datetime.datetime | str | None = None
+) -> bool:
+    """Append the dataset to the sprint's history; returns False when nothing changed."""
+
+    taken_at = to_utc_timestamp(taken_at or datetime.datetime.now(datetime.timezone.utc))
+    current = snapshot_state(dataset)
+    previous = _replay(store.snapshot_payloads(sprint_id))
+    delta = diff_states(previous, current)
+    if not delta:
+        return False
+    keyframe = previous is None or store.snapshot_count(sprint_id) % KEYFRAME_INTERVAL == 0
+    if keyframe:
+        delta = diff_states(None, current)
+    store.record_snapshot_payload(sprint_id, taken_at, keyframe, _encode(delta))
+    return True
+
+
+def sprint_snapshot_at(store: LocalStore, sprint_id: int, at: datetime.datetime | str | None = None) -> dict | None:
+    """The active sprint dataset as last recorded at or before ``at`` (default: latest).
+
+    Ages and remaining days are those of the moment that snapshot was taken.
+    """
+
+    rows = store.snapshot_payloads(sprint_id, to_utc_timestamp(at) if at else None)
+    state = _replay(rows)
+    if state is None:
+        return None
+    taken_at = parser.parse(rows[-1]["taken_at"]).replace(tzinfo=datetime.timezone.utc)
+    return state_to_dataset(state, taken_at)
+
+
+def board_snapshot_at(store: LocalStore, board_id: int, at: datetime.datetime | str) -> dict | None:
+    """The recorded dataset of the board's sprint that had started by ``at``, as of ``at``.
+
+    Sprints are tried newest first; one without a snapshot by ``at`` (e.g. it
+    started but nothing was recorded yet) falls through to the sprint before it.
+    """
+
+    at = to_utc_timestamp(at)
+    for sprint in store.sprints(board_id):
+        if sprint["start_date"] and sprint["start_date"] <= at:
+            snapshot = sprint_snapshot_at(store, sprint["id"], at)
+            if snapshot is not None:
+                return snapshot
+    return None
@@ -3,19 +3,18 @@
 from __future__ import annotations
 
 import logging
+import re
 from statistics import mean
 from typing import Iterable
 import datetime
 
 from dateutil import parser
 
-from .config import JiraRuntimeConfig
+from .config import DEFAULT_WORKFLOW, FieldAccessor, JiraRuntimeConfig, WorkflowMapping
 from .io_utils import write_dataset_to_csv, write_dataset_to_json
 from .jira_client import JiraService, fetch_closed_sprints
-
-
-IN_PROGRESS_STATUSES = ["Analysis", "Kickoff", "In Progress"]
-DONE_STATUSES = ["Closed", "Release Ready"]
+from .local_store import parse_sprint_ids
+from .snapshot_service import record_sprint_snapshot
 
 
 def get_project_data(project) -> dict:
@@ -56,7 +55,7 @@ def get_issue_data(issue, sp_field_id: str) -> dict:
     }
 
 
-def compute_cycle_time(issue) -> float | None:
+def compute_cycle_time(issue, workflow: WorkflowMapping = DEFAULT_WORKFLOW) -> float | None:
     logging.info("Computing cycle time for issue %s...", getattr(issue, "key", "unknown"))
     changelog = getattr(issue, "changelog", None)
     history_entries = getattr(changelog, "histories", [])
@@ -68,9 +67,9 @@ def compute_cycle_time(issue) -> float | None:
         for item in getattr(history, "items", []):
             if item.field != "status":
                 continue
-            if item.toString in IN_PROGRESS_STATUSES and start_date is None:
+            if item.toString in workflow.in_progress_statuses and start_date is None:
                 start_date = parser.parse(history.created)
-            if item.toString in DONE_STATUSES:
+            if item.toString in workflow.done_statuses:
                 end_date = parser.parse(history.created)
 
     if start_date and end_date:
@@ -79,12 +78,121 @@ def compute_cycle_time(issue) -> float | None:
     return None
 
 
-def get_sprint_dataset(service: JiraService, sprints, story_points_field: str) -> list[dict]:
+GREENHOPPER_SPRINT_SCHEMA = "com.pyxis.greenhopper.jira:gh-sprint"
+_SPRINT_ID_ATTR_RE = re.compile(r"\bid=(\d+)")
+
+
+def sprint_field_ids(value) -> set[int]:
+    """Return the sprint ids held in an issue's Sprint field value.
+
+    Handles the shapes Jira returns: sprint objects (or dicts) with an ``id``,
+    Jira Server's ``com.atlassian.greenhopper...Sprint@...[id=12,...]`` strings
+    and bare ids, alone or in a list.
+    """
+
+    if value is None:
+        return set()
+    if isinstance(value, (list, tuple)):
+        ids: set[int] = set()
+        for entry in value:
+            ids |= sprint_field_ids(entry)
+        return ids
+    if isinstance(value, dict):
+        value = value.get("id")
+    elif not isinstance(value, (str, int)):
+        value = getattr(value, "id", None)
+    if isinstance(value, int):
+        return {value}
+    if isinstance(value, str):
+        if value.isdigit():
+            return {int(value)}
+        return {int(match) for match in _SPRINT_ID_ATTR_RE.findall(value)}
+    return set()
+
+
+def find_sprint_field(service: JiraService, workflow: WorkflowMapping = DEFAULT_WORKFLOW):
+    """Return an accessor for the Sprint custom field, or ``None`` if it cannot be found."""
+
+    if workflow.sprint_field.candidates:
+        return workflow.sprint_field
+    try:
+        fields = service.fields()
+    except Exception as exc:  # pragma: no cover - network error path
+        logging.warning("Could not list Jira fields to find the Sprint field: %s", exc)
+        return None
+    for field in fields:
+        schema = field.get("schema") or {}
+        if schema.get("custom") == GREENHOPPER_SPRINT_SCHEMA:
+            return FieldAccessor((field["id"],))
+    return None
+
+
+def search_done_issues_by_sprint(
+    service: JiraService, sprint_ids: list[int], sprint_field, *, batch_size: int
+) -> dict[int, list]:
+    """Fetch done issues of many sprints with ``sprint in (...)`` and regroup them per sprint.
+
+    ``sprint = X`` matches every issue whose Sprint field lists X, so an issue
+    carried over between sprints is returned once per sprint. Regrouping puts
+    each issue under every requested sprint in its Sprint field, which
+    reproduces that attribution exactly.
+    """
+
+    groups: dict[int, list] = {sprint_id: [] for sprint_id in sprint_ids}
+    for offset in range(0, len(sprint_ids), batch_size):
+        chunk = sprint_ids[offset:offset + batch_size]
+        jql = f"sprint in ({', '.join(str(sprint_id) for sprint_id in chunk)}) AND statusCategory = Done"
+        issues = service.search_issues(jql, maxResults=False, expand="changelog")
+        wanted = set(chunk)
+        for issue in issues:
+            for sprint_id in sprint_field_ids(sprint_field(issue.fields)) & wanted:
+                groups[sprint_id].append(issue)
+    return groups
+
+
+def get_sprint_dataset(
+    service: JiraService,
+    sprints,
+    story_points_field: str,
+    store=None,
+    distribution=None,
+    workflow: WorkflowMapping = DEFAULT_WORKFLOW,
+    batch_size: int = 0,
+    checkpoint=None,
+) -> list[dict]:
+    """Velocity and cycle time of each sprint from its done issues.
+
+    With ``batch_size`` above zero the done issues of ``batch_size`` sprints are
+    fetched per search and regrouped by their Sprint field; without it, or when
+    the Sprint field cannot be resolved, each sprint gets its own search.
+    Sprints already finished in ``checkpoint`` are not fetched again.
+    """
+
+    finished = _checkpointed_sprints(checkpoint, "sprints_dataset", sprints)
+    grouped = None
+    if batch_size > 0:
+        sprint_field = find_sprint_field(service, workflow)
+        if sprint_field is None:
+            logging.warning("Sprint field not found; querying sprints one at a time")
+        else:
+            sprint_ids = [getattr(sprint, "id", None) for sprint in sprints]
+            pending = [sprint_id for sprint_id in sprint_ids if sprint_id not in finished]
+            grouped = search_done_issues_by_sprint(service, pending, sprint_field, batch_size=batch_size)
+
     results = []
     for sprint in sprints:
         sprint_id = getattr(sprint, "id", None)
-        jql = f"sprint = {sprint_id} AND statusCategory = Done"
-        issues = service.search_issues(jql, maxResults=1000, expand="changelog")
+        if sprint_id in finished:
+            results.append(_resume_sprint(finished[sprint_id], sprint, distribution))
+            continue
+        if grouped is not None:
+            issues = grouped[sprint_id]
+        else:
+            jql = f"sprint = {sprint_id} AND statusCategory = Done"
+            issues = service.search_issues(jql, maxResults=1000, expand="changelog")
+        if store is not None:
+            store.record_sprint(sprint)
+            store.record_issues(issues, story_points_field, sprint_id=sprint_id)
 
         total_story_points = 0.0
         cycle_times = []
@@ -95,39 +203,192 @@ def get_sprint_dataset(service: JiraService, sprints, story_points_field: str) -
             except Exception:
                 logging.warning("Could not convert story points '%s' on issue %s", points, getattr(issue, "key", ""))
 
-            cycle_days = compute_cycle_time(issue)
+            cycle_days = compute_cycle_time(issue, workflow)
             if cycle_days is not None and cycle_days >= 0:
                 cycle_times.append(cycle_days)
 
         avg_cycle_time = mean(cycle_times) if cycle_times else "N/A"
+        if distribution is not None:
+            distribution.add(sprint, cycle_times)
+
+        row = {
+            "Name": getattr(sprint, "name", "N/A"),
+            "StartDate": getattr(sprint, "startDate", "N/A"),
+            "EndDate": getattr(sprint, "endDate", "N/A"),
+            "CompletedDate": getattr(sprint, "completeDate", "N/A"),
+            "CompletedStoryPoints": total_story_points,
+            "CompletedIssues": len(issues),
+            "AverageCycleTime": avg_cycle_time,
+        }
+        results.append(row)
+        _checkpoint_sprint(checkpoint, "sprints_dataset", sprint_id, row, cycle_times, store)
+
+    if store is not None:
+        store.commit()
+    return results
+
+
+def _checkpointed_sprints(checkpoint, section: str, sprints) -> dict:
+    if checkpoint is None:
+        return {}
+    finished = {}
+    for sprint in sprints:
+        sprint_id = getattr(sprint, "id", None)
+        entry = checkpoint.get(section, sprint_id)
+        if entry is not None:
+            finished[sprint_id] = entry
+    return finished
+
+
+def _resume_sprint(entry: dict, sprint, distribution) -> dict:
+    if distribution is not None:
+        distribution.add(sprint, entry["cycle_times"])
+    return entry["row"]
+
+
+def _checkpoint_sprint(checkpoint, section: str, sprint_id, row: dict, cycle_times: list, store) -> None:
+    if checkpoint is None:
+        return
+    # Commit first so a resumed run never skips a sprint the store is missing.
+    if store is not None:
+        store.commit()
+    checkpoint.put(section, sprint_id, {"row": row, "cycle_times": cycle_times})
+
 
-        results.append(
-            {
-                "Name": getattr(sprint, "name", "N/A"),
-                "StartDate": getattr(sprint, "startDate", "N/A"),
-                "EndDate": getattr(sprint, "endDate", "N/A"),
-                "CompletedDate": getattr(sprint, "completeDate", "N/A"),
-                "CompletedStoryPoints": total_story_points,
-                "AverageCycleTime": avg_cycle_time,
-            }
-        )
+def sprint_additions(issue) -> list[tuple[datetime.datetime, set[int]]]:
+    """Return ``(timestamp, sprint ids added)`` for every sprint-membership change of an issue."""
 
+    additions = []
+    histories = getattr(getattr(issue, "changelog", None), "histories", []) or []
+    for history in histories:
+        for item in getattr(history, "items", []) or []:
+            if (getattr(item, "field", "") or "").lower() != "sprint":
+                continue
+            added = parse_sprint_ids(getattr(item, "to", None)) - parse_sprint_ids(getattr(item, "from", None))
+            if added:
+                additions.append((parser.parse(history.created), added))
+    return additions
+
+
+def get_sprint_history_dataset(
+    service: JiraService,
+    sprints,
+    story_points_field: str,
+    store=None,
+    distribution=None,
+    workflow: WorkflowMapping = DEFAULT_WORKFLOW,
+    checkpoint=None,
+) -> list[dict]:
+    """Velocity, cycle time and scope creep for every sprint from one extraction pass.
+
+    Each sprint is fetched with a single search, as in ``get_sprint_dataset``, but
+    without the ``statusCategory = Done`` filter: velocity and cycle time are
+    computed from the done issues client-side, and scope creep from the sprint
+    membership events in the changelogs of all issues. Issues carried over
+    between sprints have their changelog parsed once. Sprints already finished
+    in ``checkpoint`` are not fetched again.
+    """
+
+    finished = _checkpointed_sprints(checkpoint, "sprint_history_dataset", sprints)
+    additions_by_issue: dict[str, list] = {}
+    results = []
+    for sprint in sprints:
+        sprint_id = getattr(sprint, "id", None)
+        if sprint_id in finished:
+            results.append(_resume_sprint(finished[sprint_id], sprint, distribution))
+            continue
+        issues = service.search_issues(f"sprint = {sprint_id}", maxResults=1000, expand="changelog")
+        if store is not None:
+            store.record_sprint(sprint)
+            store.record_issues(issues, story_points_field, sprint_id=sprint_id)
+
+        start_str = getattr(sprint, "startDate", None)
+        sprint_start_dt = parser.parse(start_str) if start_str else None
+
+        total_story_points = 0.0
+        completed_issues = 0
+        cycle_times = []
+        creep_count = 0
+        creep_points = 0.0
+        for issue in issues:
+            fields = getattr(issue, "fields", None)
+            points = getattr(fields, story_points_field, 0) or 0
+            try:
+                points = float(points)
+            except Exception:
+                logging.warning("Could not convert story points '%s' on issue %s", points, getattr(issue, "key", ""))
+                points = 0.0
+
+            category = getattr(getattr(getattr(fields, "status", None), "statusCategory", None), "name", None)
+            if category == "Done":
+                total_story_points += points
+                completed_issues += 1
+                cycle_days = compute_cycle_time(issue, workflow)
+                if cycle_days is not None and cycle_days >= 0:
+                    cycle_times.append(cycle_days)
+
+            key = getattr(issue, "key", None)
+            additions = additions_by_issue.get(key)
+            if additions is None:
+                additions = additions_by_issue[key] = sprint_additions(issue)
+            if sprint_start_dt and any(
+                sprint_id in added and changed_at > sprint_start_dt for changed_at, added in additions
+            ):
+                creep_count += 1
+                creep_points += points
+
+        if distribution is not None:
+            distribution.add(sprint, cycle_times)
+
+        row = {
+            "Name": getattr(sprint, "name", "N/A"),
+            "StartDate": getattr(sprint, "startDate", "N/A"),
+            "EndDate": getattr(sprint, "endDate", "N/A"),
+            "CompletedDate": getattr(sprint, "completeDate", "N/A"),
+            "CompletedStoryPoints": total_story_points,
+            "CompletedIssues": completed_issues,
+            "AverageCycleTime": mean(cycle_times) if cycle_times else "N/A",
+            "ScopeCreepCount": creep_count,
+            "CreepStoryPoints": creep_points,
+        }
+        results.append(row)
+        _checkpoint_sprint(checkpoint, "sprint_history_dataset", sprint_id, row, cycle_times, store)
+
+    if store is not None:
+        store.commit()
     return results
 
 
-def get_sprint_insights_with_creep(service: JiraService, board_id: int, sp_field_id: str):
-    sprints = service.sprints(board_id, state="active")
-    if not sprints:
-        return "No active sprint found."
+def get_sprint_dataset_from_store(
+    store, sprint_ids: list[int], workflow: WorkflowMapping = DEFAULT_WORKFLOW
+) -> list[dict]:
+    """Answer ``get_sprint_dataset`` from the local store without calling Jira."""
 
-    active_sprint = sprints[0]
-    sprint_id = active_sprint.id
-    sprint_start_dt = parser.parse(active_sprint.startDate)
+    return store.sprint_dataset(
+        sprint_ids,
+        in_progress_statuses=workflow.in_progress_statuses,
+        done_statuses=workflow.done_statuses,
+    )
 
-    issues = service.search_issues(f"sprint = {sprint_id}", expand="changelog", maxResults=False)
 
-  
+def get_sprint_creep_from_store(store, sprint_id: int) -> list[dict]:
+    """Return the scope-creep issues of a stored sprint without calling Jira."""
+
+    return store.sprint_creep(sprint_id)
+
 
+def remaining_days(sprint_end_str: str | None, now: datetime.datetime) -> int:
+    """Whole days from ``now`` to the sprint end -- 0 if the end is missing or past."""
+
+    if not sprint_end_str:
+        return 0
+    try:
+        return max((parser.parse(sprint_end_str) - now).days, 0)
+    except Exception:
+        return 0
+
+
+def get_sprint_info(service: JiraService, active_sprint) -> dict:
     # Sprint goals extraction
     sprint_goal_str = getattr(active_sprint, "goal", None)
     if sprint_goal_str and isinstance(sprint_goal_str, str):
@@ -135,30 +396,177 @@ def get_sprint_insights_with_creep(service: JiraService, board_id: int, sp_field
     else:
         goals = []
 
-    # Remaining days -- default to 0 if endDate is missing or past
     sprint_end_str = getattr(active_sprint, "endDate", None)
-    if sprint_end_str:
+    return {
+        "name": active_sprint.name,
+        "start": active_sprint.startDate,
+        "end": sprint_end_str,
+        "goals": goals,
+        "remaining_days": remaining_days(sprint_end_str, datetime.datetime.now(datetime.timezone.utc)),
+        "jira_base_url": service.client_info() if hasattr(service, "client_info") else None,
+    }
+
+
+def build_issue_insight(
+    service: JiraService,
+    issue,
+    sprint_id,
+    sprint_start_dt,
+    sp_field_id: str,
+    now: datetime.datetime | None = None,
+    workflow: WorkflowMapping = DEFAULT_WORKFLOW,
+) -> tuple[dict, dict | None]:
+    """Return the ``issue_collection`` entry for an issue and its creep record, if any.
+
+    Sprint membership, work-in-progress aging (time in the current status),
+    blocked time and reopen counts all come from one walk over the changelog.
+    An issue counts as blocked while it is flagged or in a blocked status;
+    overlapping flag and status intervals are counted once.
+    """
+
+    now = now or datetime.datetime.now(datetime.timezone.utc)
+    is_creep = False
+    added_date = None
+    status_since = None
+    reopen_count = 0
+    blocked_events = []
+    histories = getattr(issue.changelog, "histories", [])
+    for history in histories:
+        created = None
+        sprint_seen = False
+        for item in getattr(history, "items", []):
+            field = item.field.lower()
+            if field == "sprint" and not sprint_seen and str(sprint_id) in str(item.to):
+                sprint_seen = True
+                added_date = created = created or parser.parse(history.created)
+                if added_date > sprint_start_dt:
+                    is_creep = True
+            elif field == "status":
+                created = created or parser.parse(history.created)
+                if status_since is None or created > status_since:
+                    status_since = created
+                from_status = getattr(item, "fromString", None)
+                if from_status in workflow.done_statuses and item.toString not in workflow.done_statuses:
+                    reopen_count += 1
+                blocked_events.append((created, "status", item.toString in workflow.blocked_statuses))
+            elif field == "flagged":
+                created = created or parser.parse(history.created)
+                blocked_events.append((created, "flag", bool(getattr(item, "toString", None))))
+
+    if status_since is None:
+        created_str = getattr(issue.fields, "created", None)
+        status_since = parser.parse(created_str) if isinstance(created_str, str) else None
+
+    # Finished blocked spells are summed here; a spell still open is kept as
+    # its start so ``issue_ages`` can extend it to any later moment.
+    past_blocked_seconds = 0.0
+    blocked_since = None
+    active = {"status": False, "flag": False}
+    for at, kind, on in sorted(blocked_events, key=lambda event: event[0]):
+        was_blocked = any(active.values())
+        active[kind] = on
+        if not was_blocked and any(active.values()):
+            blocked_since = at
+        elif was_blocked and not any(active.values()):
+            past_blocked_seconds += (at - blocked_since).total_seconds()
+    is_blocked = any(active.values())
+
+    category = issue.fields.status.statusCategory.name
+    points = getattr(issue.fields, sp_field_id, 0) or 0
+
+    # --- Epic Key/Title Extraction ---
+    epic_key = workflow.epic_field(issue.fields)
+    epic_title = None
+
+    # If we got an Epic key, try to fetch its summary
+    if epic_key:
         try:
-            today_dt = datetime.datetime.now(datetime.timezone.utc)
-            end_dt = parser.parse(sprint_end_str)
-            delta = (end_dt - today_dt).days
-            remaining_days = max(delta, 0)
+            epic_issue = service.issue(epic_key)
+            if hasattr(epic_issue, "fields") and hasattr(epic_issue.fields, "summary"):
+                epic_title = epic_issue.fields.summary
         except Exception:
-            remaining_days = 0
+            epic_title = None
+
+    # --- Join Assignee ---
+    join_assignee_val = workflow.join_assignee_field(issue.fields)
+    if join_assignee_val and hasattr(join_assignee_val, "displayName"):
+        join_assignee = join_assignee_val.displayName
+    elif isinstance(join_assignee_val, str):
+        join_assignee = join_assignee_val
+    elif join_assignee_val is not None:
+        join_assignee = str(join_assignee_val)
     else:
-        remaining_days = 0
+        join_assignee = "Unassigned"
+
+    # --- X day value (custom field or None) ---
+    x_day = getattr(issue.fields, "x_day", None)  # Placeholder: replace with actual field name/id if clarified
+
+    issue_data = {
+        "key": issue.key,
+        "title": issue.fields.summary,
+        "assignee": str(issue.fields.assignee) if issue.fields.assignee else "Unassigned",
+        "status": issue.fields.status.name,
+        "category": category,
+        "points": points,
+        "is_creep": is_creep,
+        "epic_key": epic_key,
+        "epic_title": epic_title,
+        "join_assignee": join_assignee,
+        "x_day": x_day,
+        "days_in_status": None,
+        "blocked_days": 0.0,
+        "is_blocked": is_blocked,
+        "reopen_count": reopen_count,
+        "status_since": status_since.isoformat() if status_since else None,
+        "blocked_since": blocked_since.isoformat() if is_blocked else None,
+        "past_blocked_days": max(0.0, past_blocked_seconds) / 86400,
+    }
+    issue_data.update(issue_ages(issue_data, now))
+
+    creep = None
+    if is_creep:
+        creep = {
+            "key": issue.key,
+            "added_at": added_date.strftime("%Y-%m-%d %H:%M") if added_date else None,
+            "points": points,
+        }
+    return issue_data, creep
+
+
+def issue_ages(issue_data: dict, now: datetime.datetime) -> dict:
+    """``days_in_status`` and ``blocked_days`` of an insight entry as of ``now``.
+
+    Entries keep the moments the ages count from rather than the ages alone,
+    so an entry built once can be aged again without its changelog.
+    """
+
+    status_since = issue_data.get("status_since")
+    blocked_since = issue_data.get("blocked_since")
+    blocked_seconds = (issue_data.get("past_blocked_days") or 0.0) * 86400
+    if blocked_since:
+        blocked_seconds += (now - parser.parse(blocked_since)).total_seconds()
+    days_in_status = None
+    if status_since:
+        days_in_status = round(max(0.0, (now - parser.parse(status_since)).total_seconds() / 86400), 2)
+    return {"days_in_status": days_in_status, "blocked_days": round(max(0.0, blocked_seconds) / 86400, 2)}
+
+
+def assemble_sprint_insights(
+    sprint_info: dict, entries: Iterable[tuple[dict, dict | None]], now: datetime.datetime | None = None
+) -> dict:
+    """Aggregate per-issue insight entries into the active sprint dataset.
+
+    Entries built by ``build_issue_insight`` are re-aged to ``now`` (default:
+    the current time), so issues that did not change since their entry was
+    built still age.
+    """
+
+    now = now or datetime.datetime.now(datetime.timezone.utc)
 
     dataset = {
-        "sprint_info": {
-            "name": active_sprint.name,
-            "start": active_sprint.startDate,
-            "end": getattr(active_sprint, "endDate", None),
-            "goals": goals,
-            "remaining_days": remaining_days,
-            "jira_base_url": service.client_info() if hasattr(service, "client_info") else None,
-        },
+        "sprint_info": sprint_info,
         "metrics": {
-            "total_issues": len(issues),
+            "total_issues": 0,
             "scope_creep_count": 0,
             "creep_points": 0,
         },
@@ -168,95 +576,59 @@ def get_sprint_insights_with_creep(service: JiraService, board_id: int, sp_field
         "creep_issues": [],
     }
 
-    for issue in issues:
-        is_creep = False
-        added_date = None
-        histories = getattr(issue.changelog, "histories", [])
-        for history in histories:
-            for item in getattr(history, "items", []):
-                if item.field.lower() == "sprint" and str(sprint_id) in str(item.to):
-                    added_date = parser.parse(history.created)
-                    if added_date > sprint_start_dt:
-                        is_creep = True
-                    break
-
-        category = issue.fields.status.statusCategory.name
+    for issue_data, creep in entries:
+        dataset["metrics"]["total_issues"] += 1
+        category = issue_data["category"]
         if category in dataset["stages"]:
             dataset["stages"][category] += 1
 
-        points = getattr(issue.fields, sp_field_id, 0) or 0
+        points = issue_data["points"]
         dataset["points"]["total"] += points
         if category == "Done":
             dataset["points"]["completed"] += points
         else:
             dataset["points"]["remaining"] += points
 
-        # --- Epic Key/Title Extraction ---
-        epic_key = None
-        epic_title = None
-
-        # Try popular field names and custom field
-        for epic_field_name in ("epic", "epicLink", "customfield_10902"):
-            if hasattr(issue.fields, epic_field_name):
-                epic_key = getattr(issue.fields, epic_field_name, None)
-                if epic_key:
-                    break
-
-        # If still none, check dict-access as fallback (less type-safe)
-        if not epic_key and hasattr(issue.fields, "__dict__"):
-            for k in ("epic", "epicLink", "customfield_10014"):
-                maybe = getattr(issue.fields, "__dict__", {}).get(k, None)
-                if maybe:
-                    epic_key = maybe
-                    break
-
-        # If we got an Epic key, try to fetch its summary
-        if epic_key:
-            try:
-                epic_issue = service.issue(epic_key)
-                if hasattr(epic_issue, "fields") and hasattr(epic_issue.fields, "summary"):
-                    epic_title = epic_issue.fields.summary
-            except Exception:
-                epic_title = None
-
-        # --- Join Assignee (customfield_17801) ---
-        join_assignee_val = getattr(issue.fields, "customfield_17801", None)
-        if join_assignee_val and hasattr(join_assignee_val, "displayName"):
-            join_assignee = join_assignee_val.displayName
-        elif isinstance(join_assignee_val, str):
-            join_assignee = join_assignee_val
-        elif join_assignee_val is not None:
-            join_assignee = str(join_assignee_val)
-        else:
-            join_assignee = "Unassigned"
-
-        # --- X day value (custom field or None) ---
-        x_day = getattr(issue.fields, "x_day", None)  # Placeholder: replace with actual field name/id if clarified
-
-        issue_data = {
-            "key": issue.key,
-            "title": issue.fields.summary,
-            "assignee": str(issue.fields.assignee) if issue.fields.assignee else "Unassigned",
-            "status": issue.fields.status.name,
-            "category": category,
-            "points": points,
-            "is_creep": is_creep,
-            "epic_key": epic_key,
-            "epic_title": epic_title,
-            "join_assignee": join_assignee,
-            "x_day": x_day,
-        }
+        if "status_since" in issue_data:
+            issue_data = {**issue_data, **issue_ages(issue_data, now)}
         dataset["issue_collection"].append(issue_data)
 
-        if is_creep:
+        if creep is not None:
             dataset["metrics"]["scope_creep_count"] += 1
             dataset["metrics"]["creep_points"] += points
-            dataset["creep_issues"].append(
-                {
-                    "key": issue.key,
-                    "added_at": added_date.strftime("%Y-%m-%d %H:%M") if added_date else None,
-                    "points": points,
-                }
-            )
+            dataset["creep_issues"].append(creep)
+
+    return dataset
+
+
+def get_sprint_insights_with_creep(
+    service: JiraService,
+    board_id: int,
+    sp_field_id: str,
+    store=None,
+    workflow: WorkflowMapping = DEFAULT_WORKFLOW,
+):
+    sprints = service.sprints(board_id, state="active")
+    if not sprints:
+        return "No active sprint found."
+
+    active_sprint = sprints[0]
+    sprint_id = active_sprint.id
+    sprint_start_dt = parser.parse(active_sprint.startDate)
+
+    issues = service.search_issues(f"sprint = {sprint_id}", expand="changelog", maxResults=False)
+
+    entries = []
+    for issue in issues:
+        entry = build_issue_insight(service, issue, sprint_id, sprint_start_dt, sp_field_id, workflow=workflow)
+        entries.append(entry)
+        if store is not None:
+            store.record_issue(issue, sp_field_id, sprint_id=sprint_id, epic_key=entry[0]["epic_key"])
+
+    dataset = assemble_sprint_insights(get_sprint_info(service, active_sprint), entries)
 
+    if store is not None:
+        store.record_sprint(active_sprint, board_id)
+        record_sprint_snapshot(store, sprint_id, dataset)
+        store.commit()
     return dataset
@@ -0,0 +1,271 @@
+"""Incremental (delta) synchronization of Jira issues into the local store."""
+
+from __future__ import annotations
+
+import datetime
+import logging
+import time
+from typing import Iterable
+
+from dateutil import parser
+
+from .config import DEFAULT_WORKFLOW, WorkflowMapping
+from .io_utils import write_dataset_to_json
+from .jira_client import JiraService
+from .local_store import LocalStore
+from .snapshot_service import record_sprint_snapshot
+from .sprint_service import assemble_sprint_insights, build_issue_insight, get_sprint_info
+
+
+DEFAULT_PAGE_SIZE = 100
+# Jira JQL dates have minute resolution, so re-read a small overlap window and
+# let the idempotent store upserts absorb the duplicates.
+WATERMARK_OVERLAP = datetime.timedelta(minutes=1)
+# Stored sprint state and membership are re-checked against Jira this often.
+SPRINT_RECHECK_INTERVAL = datetime.timedelta(hours=1)
+
+
+def format_jql_watermark(watermark: str, overlap: datetime.timedelta = WATERMARK_OVERLAP) -> str:
+    """Render a stored watermark as a JQL date literal, keeping Jira's wall-clock time."""
+
+    return (parser.parse(watermark) - overlap).strftime("%Y/%m/%d %H:%M")
+
+
+def build_delta_jql(scope_jql: str, watermark: str | None) -> str:
+    if not watermark:
+        return scope_jql
+    return f'({scope_jql}) AND updated >= "{format_jql_watermark(watermark)}"'
+
+
+def _latest_update(issues, current: str | None) -> str | None:
+    latest = current
+    latest_dt = parser.parse(current) if current else None
+    for issue in issues:
+        updated = getattr(getattr(issue, "fields", None), "updated", None)
+        if not updated:
+            continue
+        updated_dt = parser.parse(updated)
+        if latest_dt is None or updated_dt > latest_dt:
+            latest, latest_dt = updated, updated_dt
+    return latest
+
+
+def search_all_pages(service: JiraService, jql: str, *, page_size: int = DEFAULT_PAGE_SIZE, **kwargs) -> list:
+    """Run a JQL search page by page until Jira returns a short page."""
+
+    results: list = []
+    start_at = 0
+    while True:
+        batch = service.search_issues(jql, startAt=start_at, maxResults=page_size, **kwargs)
+        results.extend(batch)
+        if len(batch) < page_size:
+            break
+        start_at += page_size
+    return results
+
+
+def sprint_check_due(store: LocalStore, board_id: int, now: datetime.datetime | None = None) -> bool:
+    """True when the board's sprints were last checked against Jira over ``SPRINT_RECHECK_INTERVAL`` ago."""
+
+    checked_at = store.get_sprint_check(board_id)
+    now = now or datetime.datetime.now(datetime.timezone.utc)
+    return checked_at is None or parser.parse(checked_at).replace(tzinfo=datetime.timezone.utc) + SPRINT_RECHECK_INTERVAL <= now
+
+
+def active_sprint_ids(
+    service: JiraService, store: LocalStore, board_id: int, *, refresh: bool = False
+) -> list[int]:
+    """Return the board's active sprint ids.
+
+    Stored sprints are trusted until one of them ends or the last check is
+    ``SPRINT_RECHECK_INTERVAL`` old; then Jira is asked again, which also picks
+    up newly started sprints and closes stored ones Jira no longer reports as
+    active (sprints closed early).
+    """
+
+    now = datetime.datetime.now(datetime.timezone.utc)
+    if not refresh and not sprint_check_due(store, board_id, now):
+        stamp = now.strftime("%Y-%m-%dT%H:%M:%S")
+        stored = store.sprints(board_id, state="active")
+        if stored and all(row["end_date"] is None or row["end_date"] > stamp for row in stored):
+            return [row["id"] for row in stored]
+    sprints = service.sprints(board_id, state="active") or []
+    for sprint in sprints:
+        store.record_sprint(sprint, board_id)
+    active_ids = [sprint.id for sprint in sprints]
+    store.close_stale_active_sprints(board_id, active_ids)
+    store.set_sprint_check(board_id, now.strftime("%Y-%m-%dT%H:%M:%S"))
+    return active_ids
+
+
+def sync_sprints(
+    service: JiraService,
+    store: LocalStore,
+    board_id: int,
+    sprint_ids: Iterable[int],
+    sp_field_id: str,
+    *,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    full: bool = False,
+) -> dict[int, list]:
+    """Merge issues of the given sprints updated since the board watermark.
+
+    A board without a watermark, a sprint the store has never seen, or any
+    sprint when ``full`` is set gets a full fetch; otherwise only issues whose
+    ``updated`` timestamp moved past the watermark are requested, with the
+    changelog expanded for those issues alone. Returns the fetched issues per
+    sprint so callers can recompute derived data for them only.
+    """
+
+    watermark = store.get_watermark(board_id)
+    changed: dict[int, list] = {}
+    for sprint_id in sprint_ids:
+        since = watermark if not full and store.has_sprint_issues(sprint_id) else None
+        jql = build_delta_jql(f"sprint = {sprint_id}", since)
+        issues = search_all_pages(service, jql, page_size=page_size, expand="changelog")
+        logging.info("Delta sync for sprint %s fetched %d issue(s)", sprint_id, len(issues))
+        store.record_issues(issues, sp_field_id, sprint_id=sprint_id)
+        changed[sprint_id] = issues
+
+    latest = _latest_update((issue for issues in changed.values() for issue in issues), watermark)
+    if latest:
+        store.set_watermark(board_id, latest)
+    store.commit()
+    return changed
+
+
+def sync_board(
+    service: JiraService,
+    store: LocalStore,
+    board_id: int,
+    sp_field_id: str,
+    *,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    refresh_sprints: bool = False,
+) -> list:
+    """Delta-sync every active sprint on the board and return the changed issues.
+
+    A delta search cannot see issues moved out of a sprint, so whenever the
+    sprint state is re-checked the membership of delta-synced sprints is read
+    too (keys only) and rows of departed issues are dropped from the store.
+    """
+
+    recheck = refresh_sprints or sprint_check_due(store, board_id)
+    sprint_ids = active_sprint_ids(service, store, board_id, refresh=recheck)
+    delta_synced = [sprint_id for sprint_id in sprint_ids if store.has_sprint_issues(sprint_id)]
+    changed = sync_sprints(service, store, board_id, sprint_ids, sp_field_id, page_size=page_size)
+    if recheck:
+        for sprint_id in delta_synced:
+            removed = store.prune_sprint_issues(sprint_id, sprint_member_keys(service, sprint_id))
+            if removed:
+                logging.info("Dropped %d issue(s) that left sprint %s", removed, sprint_id)
+        store.commit()
+    return [issue for issues in changed.values() for issue in issues]
+
+
+def sprint_member_keys(service: JiraService, sprint_id: int, *, page_size: int = 500) -> set[str]:
+    """Return the keys of issues currently in the sprint using a keys-only search."""
+
+    issues = search_all_pages(service, f"sprint = {sprint_id}", page_size=page_size, fields="key")
+    return {issue.key for issue in issues}
+
+
+def watch_active_sprint(
+    service: JiraService,
+    store: LocalStore,
+    board_id: int,
+    sp_field_id: str,
+    output_filename: str,
+    *,
+    interval: float,
+    reconcile_every: int = 10,
+    max_backoff: int = 8,
+    max_ticks: int | None = None,
+    sleep=time.sleep,
+    clock=time.monotonic,
+    wall_clock=None,
+    workflow: WorkflowMapping = DEFAULT_WORKFLOW,
+) -> None:
+    """Keep ``output_filename`` in sync with the board's active sprint.
+
+    Each tick delta-syncs the sprint and recomputes insight entries only for the
+    issues that changed. Every ``reconcile_every`` ticks the active sprint and its
+    membership are re-read so removed issues drop out. The JSON file is rewritten
+    only when the assembled dataset differs from the last one written.
+
+    Entries keep the moments their ages count from, and every tick re-ages them
+    to ``wall_clock()``, so issues that did not change still age.
+
+    Memory is bounded by the sprint size: one entry per member issue and the last
+    written dataset. Ticks never overlap; an overrunning tick delays the next one
+    instead of queueing more work, and failures back off up to ``max_backoff``
+    intervals.
+    """
+
+    wall_clock = wall_clock or (lambda: datetime.datetime.now(datetime.timezone.utc))
+    entries: dict[str, tuple[dict, dict | None]] = {}
+    # Entries are built from fetched issues only, so an empty map needs every
+    # member issue, not just those updated since the store's watermark.
+    full_sync = True
+    sprint = None
+    sprint_start_dt = None
+    previous = None
+    failures = 0
+    tick = 0
+    next_due = clock()
+
+    while max_ticks is None or tick < max_ticks:
+        try:
+            reconcile = sprint is None or tick % reconcile_every == 0
+            if reconcile:
+                if hasattr(service, "clear_memo"):
+                    # Sprint lists and epic titles are memoized per service; re-read them.
+                    service.clear_memo()
+                sprints = service.sprints(board_id, state="active") or []
+                current = sprints[0] if sprints else None
+                if current is None or sprint is None or current.id != sprint.id:
+                    entries.clear()
+                    full_sync = True
+                sprint = current
+                if sprint is not None:
+                    store.record_sprint(sprint, board_id)
+                    sprint_start_dt = parser.parse(sprint.startDate)
+
+            if sprint is None:
+                logging.warning("No active sprint found on board %s", board_id)
+            else:
+                changed = sync_sprints(service, store, board_id, [sprint.id], sp_field_id, full=full_sync)[sprint.id]
+                full_sync = False
+                for issue in changed:
+                    entries[issue.key] = build_issue_insight(
+                        service, issue, sprint.id, sprint_start_dt, sp_field_id, workflow=workflow
+                    )
+                if reconcile and tick > 0:
+                    members = sprint_member_keys(service, sprint.id)
+                    for key in [key for key in entries if key not in members]:
+                        del entries[key]
+                    store.prune_sprint_issues(sprint.id, members)
+
+                dataset = assemble_sprint_insights(
+                    get_sprint_info(service, sprint), entries.values(), now=wall_clock()
+                )
+                if dataset != previous:
+                    write_dataset_to_json(dataset, filename=output_filename)
+                    record_sprint_snapshot(store, sprint.id, dataset)
+                    store.commit()
+                    logging.info("Active sprint dataset changed; wrote %s", output_filename)
+                    previous = dataset
+            failures = 0
+        except Exception as exc:  # pragma: no cover - network error path
+            failures += 1
+            logging.warning("Watch tick failed (%d in a row): %s", failures, exc)
+
+        tick += 1
+        if max_ticks is not None and tick >= max_ticks:
+            break
+        next_due += interval * min(2 ** failures, max_backoff)
+        now = clock()
+        if next_due < now:
+            # Skip missed ticks rather than bursting to catch up.
+            next_due = now
+        sleep(next_due - now)
@@ -0,0 +1,34 @@
+import os
+
+from scripts.charting import cached_render
+
+
+def test_cached_render_reuses_chart_until_data_or_output_changes(tmp_path, monkeypatch):
+    monkeypatch.setenv("TEAM_BEACON_DATA_DIR", str(tmp_path))
+    calls = []
+
+    @cached_render()
+    def plot(data_filename, output_filename, *, plt_module=None, title="Chart"):
+        calls.append(title)
+        (tmp_path / output_filename).write_bytes(b"png:" + title.encode())
+
+    data = tmp_path / "data.csv"
+    data.write_text("Name,CompletedStoryPoints\nS1,5\n")
+
+    plot(data, "chart.png")
+    plot(data, "chart.png")
+    assert calls == ["Chart"]
+
+    plot(data, "chart.png", title="Other")
+    data.write_text("Name,CompletedStoryPoints\nS1,8\n")
+    plot(data, "chart.png", title="Other")
+    assert calls == ["Chart", "Other", "Other"]
+
+    output = tmp_path / "chart.png"
+    stat = output.stat()
+    os.utime(output, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    plot(data, "chart.png", title="Other")
+    output.unlink()
+    plot(data, "chart.png", title="Other")
+    plot(data, "chart.png", title="Other", force=True)
+    assert calls == ["Chart", "Other", "Other", "Other", "Other", "Other"]
@@ -0,0 +1,112 @@
+from types import SimpleNamespace
+
+import pytest
+
+from scripts.checkpoint import Checkpoint
+from scripts.epic_service import get_epics_dataset
+from scripts.jira_client import JiraService
+from scripts.sprint_service import get_sprint_dataset
+
+
+def _done_issue(key, points):
+    status = SimpleNamespace(name="Done", statusCategory=SimpleNamespace(name="Done"))
+    fields = SimpleNamespace(summary=key, status=status, customfield_10004=points, assignee=None)
+    return SimpleNamespace(key=key, fields=fields, changelog=SimpleNamespace(histories=[]))
+
+
+class FlakyJira:
+    """Returns one done issue per sprint and fails on the sprints listed in ``fail_on``."""
+
+    def __init__(self, fail_on=()):
+        self.fail_on = set(fail_on)
+        self.queries = []
+
+    def search_issues(self, jql, maxResults=None, expand=None):
+        self.queries.append(jql)
+        sprint_id = int(jql.split()[2])
+        if sprint_id in self.fail_on:
+            raise ConnectionError("connection reset")
+        return [_done_issue(f"T-{sprint_id}", sprint_id)]
+
+
+class Distribution:
+    def __init__(self):
+        self.sprints = []
+
+    def add(self, sprint, cycle_times):
+        self.sprints.append((sprint.id, list(cycle_times)))
+
+
+def test_resume_fetches_only_unfinished_sprints(tmp_path, monkeypatch):
+    monkeypatch.setenv("TEAM_BEACON_DATA_DIR", str(tmp_path))
+    sprints = [SimpleNamespace(id=n, name=f"S{n}") for n in (1, 2, 3, 4)]
+    signature = {"task": "sprints_dataset", "board_id": 7}
+
+    checkpoint = Checkpoint.open(signature=signature)
+    with pytest.raises(ConnectionError):
+        get_sprint_dataset(JiraService(FlakyJira(fail_on={3})), sprints, "customfield_10004", checkpoint=checkpoint)
+    assert (tmp_path / "checkpoint.json").exists()
+
+    jira = FlakyJira()
+    distribution = Distribution()
+    resumed = Checkpoint.open(signature=signature, resume=True)
+    dataset = get_sprint_dataset(
+        JiraService(jira), sprints, "customfield_10004", distribution=distribution, checkpoint=resumed
+    )
+
+    assert jira.queries == ["sprint = 3 AND statusCategory = Done", "sprint = 4 AND statusCategory = Done"]
+    assert resumed.resumed == 2
+    assert [row["CompletedStoryPoints"] for row in dataset] == [1, 2, 3, 4]
+    assert [sprint_id for sprint_id, _ in distribution.sprints] == [1, 2, 3, 4]
+
+    resumed.clear()
+    assert not (tmp_path / "checkpoint.json").exists()
+
+
+def test_resume_with_other_parameters_starts_over(tmp_path, monkeypatch):
+    monkeypatch.setenv("TEAM_BEACON_DATA_DIR", str(tmp_path))
+    Checkpoint.open(signature={"board_id": 7}).put("epics_dataset", "EPIC-1", {"issue_number": "EPIC-1"})
+
+    assert Checkpoint.open(signature={"board_id": 7}, resume=True).get("epics_dataset", "EPIC-1")
+    assert Checkpoint.open(signature={"board_id": 8}, resume=True).get("epics_dataset", "EPIC-1") is None
+    assert Checkpoint.open(signature={"board_id": 7}).get("epics_dataset", "EPIC-1") is None
+
+
+def test_resume_skips_finished_epics(tmp_path, monkeypatch):
+    monkeypatch.setenv("TEAM_BEACON_DATA_DIR", str(tmp_path))
+    checkpoint = Checkpoint.open(signature={})
+    checkpoint.put("epics_dataset", "EPIC-1", {"issue_number": "EPIC-1", "title": "Cached"})
+
+    class NoJira:
+        def client_info(self):
+            return "https://jira"
+
+        def issue(self, key, expand=None):
+            raise AssertionError(f"{key} was fetched again")
+
+        def search_issues(self, jql, maxResults=None, expand=None):
+            raise AssertionError("search was issued again")
+
+    dataset = get_epics_dataset(JiraService(NoJira()), ["EPIC-1"], checkpoint=checkpoint)
+
+    assert dataset == [{"issue_number": "EPIC-1", "title": "Cached"}]
+
+
+def test_other_runs_leave_an_interrupted_checkpoint_in_place(tmp_path, monkeypatch):
+    from scripts import main
+
+    monkeypatch.setenv("TEAM_BEACON_DATA_DIR", str(tmp_path))
+    monkeypatch.setenv("JIRA_BOARD_ID", "7")
+    Checkpoint.open(signature={"tasks": ["sprints_dataset"]}).put("sprints_dataset", 1, {"Name": "S1"})
+
+    class IdleJira:
+        def sprints(self, board_id, state=None, startAt=0, maxResults=50):
+            return []
+
+    monkeypatch.setattr(main, "get_jira_credentials", lambda: ("url", "token"))
+    monkeypatch.setattr(main, "connect_jira", lambda *args, **kwargs: IdleJira())
+    main.run_cli(task="sync", store_path="store.sqlite3")
+    assert (tmp_path / "checkpoint.json").exists()
+
+    Checkpoint.open(signature={"tasks": ["epics_dataset"]}).clear()
+    assert Checkpoint.open(signature={"tasks": ["sprints_dataset"]}, resume=True).get("sprints_dataset", 1)
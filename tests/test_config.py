@@ -0,0 +1,66 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from scripts.config import FieldAccessor, WorkflowMapping, load_workflow_mapping
+
+
+def test_load_workflow_mapping_merges_board_over_default(tmp_path, monkeypatch):
+    monkeypatch.setenv("TEAM_BEACON_CONFIG_DIR", str(tmp_path))
+    (tmp_path / "workflow.json").write_text(
+        json.dumps(
+            {
+                "default": {"done_statuses": ["Done"], "excluded_key_fragments": []},
+                "boards": {"7": {"in_progress_statuses": ["Doing"], "epic_field": "customfield_1"}},
+            }
+        ),
+        encoding="utf-8",
+    )
+
+    mapping = load_workflow_mapping(7)
+
+    assert mapping.in_progress_statuses == frozenset({"Doing"})
+    assert mapping.done_statuses == frozenset({"Done"})
+    assert mapping.blocked_statuses == WorkflowMapping().blocked_statuses
+    assert mapping.epic_field(SimpleNamespace(customfield_1="EPIC-1", epic="OTHER")) == "EPIC-1"
+    assert not mapping.is_excluded("ACXRM-1")
+    assert load_workflow_mapping(8).in_progress_statuses == WorkflowMapping().in_progress_statuses
+
+
+def test_load_workflow_mapping_without_file_uses_defaults(tmp_path, monkeypatch):
+    monkeypatch.setenv("TEAM_BEACON_CONFIG_DIR", str(tmp_path))
+
+    mapping = load_workflow_mapping(1)
+
+    assert "Closed" in mapping.done_statuses
+    assert mapping.is_excluded("ACXRM-1")
+
+
+def test_load_workflow_mapping_rejects_unknown_keys(tmp_path, monkeypatch):
+    monkeypatch.setenv("TEAM_BEACON_CONFIG_DIR", str(tmp_path))
+    (tmp_path / "workflow.json").write_text(json.dumps({"default": {"done": ["Done"]}}), encoding="utf-8")
+
+    with pytest.raises(SystemExit):
+        load_workflow_mapping(1)
+
+
+@pytest.mark.parametrize(
+    "content",
+    [{"default": ["Done"]}, {"boards": ["7"]}, {"boards": {"7": "customfield_1"}}],
+)
+def test_load_workflow_mapping_rejects_non_object_sections(tmp_path, monkeypatch, content):
+    monkeypatch.setenv("TEAM_BEACON_CONFIG_DIR", str(tmp_path))
+    (tmp_path / "workflow.json").write_text(json.dumps(content), encoding="utf-8")
+
+    with pytest.raises(SystemExit):
+        load_workflow_mapping(7)
+
+
+def test_field_accessor_reads_first_populated_candidate_per_issue():
+    accessor = FieldAccessor(("epic", "customfield_10014"))
+
+    assert accessor(SimpleNamespace(epic=None)) is None
+    assert accessor(SimpleNamespace(epic=None, customfield_10014="EPIC-2")) == "EPIC-2"
+    assert accessor(SimpleNamespace(epic="EPIC-3")) == "EPIC-3"
+    assert accessor(SimpleNamespace(epic="EPIC-4", customfield_10014="OTHER")) == "EPIC-4"
@@ -0,0 +1,83 @@
+import json
+
+from scripts.export_service import compact_initiatives, compact_output_name, compact_sprint_insights, dump_compact
+
+
+def _issue(n, category, points=2, **overrides):
+    issue = {
+        "key": f"T-{n}",
+        "title": f"Issue number {n} with a fairly descriptive title",
+        "assignee": "Ada" if n % 2 else "Linus",
+        "status": category,
+        "category": category,
+        "points": points,
+        "is_creep": False,
+        "epic_key": "E-1",
+        "epic_title": "Checkout revamp",
+        "join_assignee": "Unassigned",
+        "x_day": None,
+        "days_in_status": float(n),
+        "blocked_days": 0.0,
+        "is_blocked": False,
+        "reopen_count": 0,
+    }
+    issue.update(overrides)
+    return issue
+
+
+def _sprint(issues):
+    return {
+        "sprint_info": {"name": "Sprint 9"},
+        "metrics": {"total_issues": len(issues)},
+        "stages": {"To Do": 0, "In Progress": 0, "Done": 0},
+        "points": {"total": 0.0},
+        "issue_collection": issues,
+        "creep_issues": [{"key": "T-1", "added_at": "2024-01-03 10:00", "points": 2}],
+    }
+
+
+def test_compact_sprint_insights_tabulates_issues_and_summarizes():
+    issues = [_issue(1, "In Progress", is_blocked=True), _issue(2, "Done", points=3)]
+
+    compact = compact_sprint_insights(_sprint(issues), token_budget=None)
+
+    columns = compact["issues"]["columns"]
+    assert "epic_title" not in columns and "x_day" not in columns
+    assert [dict(zip(columns, row))["key"] for row in compact["issues"]["rows"]] == ["T-1", "T-2"]
+    assert compact["epics"] == {"E-1": "Checkout revamp"}
+    assert compact["summary"]["by_epic"]["rows"] == [["E-1", 2, 5.0, 3.0]]
+    assert compact["summary"]["blocked"] == 1
+    assert "omitted" not in compact
+    assert len(dump_compact(compact)) < len(json.dumps(_sprint(issues), indent=4))
+
+
+def test_compact_sprint_insights_summarizes_tail_over_budget():
+    issues = [_issue(n, "Done" if n < 150 else "In Progress") for n in range(200)]
+
+    compact = compact_sprint_insights(_sprint(issues), token_budget=2500)
+
+    columns = compact["issues"]["columns"]
+    kept = [dict(zip(columns, row)) for row in compact["issues"]["rows"]]
+    assert len(dump_compact(compact)) <= 2500 * 4
+    assert sum(1 for issue in kept if issue["category"] == "In Progress") == 50
+    assert compact["omitted"]["issues"] == 200 - len(kept)
+    assert set(compact["omitted"]["by_category"]) == {"Done"}
+
+
+def test_compact_initiatives_drops_duplicate_fields_and_shortens_links():
+    groups = [
+        {
+            "group": "Payments",
+            "epics": [
+                {"key": "E-1", "issue_number": "E-1", "link": "http://jira/browse/E-1", "total": 4, "total_issues": 4, "completed": 1, "inprogress": 1, "todo": 2},
+                {"key": "E-2", "issue_number": "E-2", "link": "http://jira/browse/E-2", "total": 2, "total_issues": 2, "completed": 2, "inprogress": 0, "todo": 0},
+            ],
+        }
+    ]
+
+    compact = compact_initiatives(groups)
+
+    assert compact["link_template"] == "http://jira/browse/{key}"
+    assert compact["epics"]["columns"] == ["group", "key", "total_issues", "completed", "inprogress", "todo"]
+    assert compact["summary"]["rows"] == [["Payments", 2, 6.0, 3.0, 1.0, 2.0, 50.0]]
+    assert compact_output_name("epics_dataset.json") == "epics_dataset.compact.json"
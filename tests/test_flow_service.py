@@ -0,0 +1,197 @@
+import datetime
+import json
+import time
+from types import SimpleNamespace
+
+from scripts import main
+from scripts.flow_service import compute_burndown, compute_cumulative_flow
+
+
+DONE = ["Closed", "Release Ready"]
+NOW = datetime.datetime(2024, 1, 10, tzinfo=datetime.timezone.utc)
+
+
+def _history(created, *items):
+    return SimpleNamespace(created=created, items=list(items))
+
+
+def _status(to):
+    return SimpleNamespace(field="status", toString=to)
+
+
+def _sprint_change(before, after):
+    return SimpleNamespace(field="Sprint", to=after, **{"from": before})
+
+
+def _issue(key, points, histories=(), category="In Progress"):
+    status = SimpleNamespace(name=category, statusCategory=SimpleNamespace(name=category))
+    fields = SimpleNamespace(customfield_10004=points, status=status)
+    return SimpleNamespace(key=key, fields=fields, changelog=SimpleNamespace(histories=list(histories)))
+
+
+SPRINT = SimpleNamespace(id=1, name="S1", startDate="2024-01-01T09:00:00Z", endDate="2024-01-05T17:00:00Z")
+
+
+def test_compute_burndown_replays_membership_and_status():
+    issues = [
+        _issue("A", 5, [_history("2024-01-02T12:00:00Z", _status("Closed"))], category="Done"),
+        _issue("B", 3, [_history("2024-01-03T10:00:00Z", _sprint_change("", "1"))]),
+        _issue("C", 2, [_history("2024-01-04T10:00:00Z", _sprint_change("1", "2"))]),
+        _issue("D", 1, [
+            _history("2024-01-02T10:00:00Z", _status("Closed")),
+            _history("2024-01-03T10:00:00Z", _status("In Progress")),
+        ]),
+    ]
+
+    burndown = compute_burndown(issues, SPRINT, "customfield_10004", done_statuses=DONE, now=NOW)
+
+    assert burndown["date"] == ["2024-01-01", "2024-01-02", "2024-01-03", "2024-01-04", "2024-01-05"]
+    assert burndown["scope"] == [8.0, 8.0, 11.0, 9.0, 9.0]
+    assert burndown["completed"] == [0.0, 6.0, 5.0, 5.0, 5.0]
+    assert burndown["remaining"] == [8.0, 2.0, 6.0, 4.0, 4.0]
+    assert burndown["ideal"][0] == 8.0 and burndown["ideal"][-1] == 0.0
+
+
+def test_compute_burndown_finishing_in_unmapped_done_category_status():
+    def move(created, src, dst):
+        return _history(created, SimpleNamespace(field="status", fromString=src, toString=dst))
+
+    issue = _issue(
+        "E",
+        5,
+        [move("2024-01-01T10:00:00Z", "To Do", "In Progress"), move("2024-01-03T10:00:00Z", "In Progress", "Done")],
+        category="Done",
+    )
+    sprint = SimpleNamespace(id=1, name="S1", startDate="2024-01-01T09:00:00Z", endDate="2024-01-06T17:00:00Z")
+
+    burndown = compute_burndown([issue], sprint, "customfield_10004", done_statuses=DONE, now=NOW)
+
+    assert burndown["completed"] == [0.0, 0.0, 5.0, 5.0, 5.0, 5.0]
+    assert burndown["remaining"] == [5.0, 5.0, 0.0, 0.0, 0.0, 0.0]
+
+
+def test_compute_burndown_handles_large_sprints_quickly():
+    issues = [
+        _issue(
+            f"K-{n}",
+            n % 8,
+            [
+                _history(f"2024-01-0{1 + n % 3}T10:00:00Z", _sprint_change("", "1")),
+                _history(f"2024-01-0{3 + n % 5}T10:00:00Z", _status("Closed")),
+            ],
+        )
+        for n in range(1000)
+    ]
+    sprint = SimpleNamespace(id=1, name="Big", startDate="2024-01-01T00:00:00Z", endDate="2024-01-14T00:00:00Z")
+
+    started = time.perf_counter()
+    burndown = compute_burndown(issues, sprint, "customfield_10004", done_statuses=DONE, now=NOW)
+
+    assert time.perf_counter() - started < 1.0
+    assert burndown["remaining"][-1] == 0.0
+
+
+def test_plot_burndown_reads_columnar_json(monkeypatch, tmp_path):
+    data_path = tmp_path / "burndown.json"
+    data_path.write_text(
+        json.dumps({"sprint": "S", "date": ["d1"], "scope": [3], "completed": [1], "remaining": [2], "ideal": [3]})
+    )
+    calls = []
+
+    class FakePlot:
+        def subplots(self, figsize=None):
+            ax = SimpleNamespace(
+                plot=lambda *args, **kwargs: calls.append(kwargs.get("label")),
+                step=lambda *args, **kwargs: calls.append(kwargs.get("label")),
+                set_ylabel=lambda *_, **__: None,
+                set_xlabel=lambda *_, **__: None,
+                tick_params=lambda *_, **__: None,
+                set_ylim=lambda *_, **__: None,
+                set_title=lambda *_, **__: None,
+                legend=lambda *_, **__: None,
+            )
+            return SimpleNamespace(tight_layout=lambda: None), ax
+
+        def savefig(self, path):
+            calls.append(path)
+
+    monkeypatch.setattr(main, "plt", FakePlot())
+    output_path = tmp_path / "burndown.png"
+    main.plot_burndown(data_filename=data_path, output_filename=output_path)
+    assert calls[-1] == output_path
+    assert "Remaining (burndown)" in calls
+
+
+def test_compute_cumulative_flow_counts_statuses_per_day():
+    def issue(created, *transitions, status="To Do"):
+        histories = [
+            _history(at, SimpleNamespace(field="status", fromString=src, toString=dst)) for at, src, dst in transitions
+        ]
+        fields = SimpleNamespace(created=created, status=SimpleNamespace(name=status))
+        return SimpleNamespace(fields=fields, changelog=SimpleNamespace(histories=histories))
+
+    issues = [
+        issue("2024-01-01T10:00:00Z", ("2024-01-02T10:00:00Z", "To Do", "In Progress"), ("2024-01-03T10:00:00Z", "In Progress", "Closed"), status="Closed"),
+        issue("2024-01-02T10:00:00Z"),
+        issue("2023-12-01T10:00:00Z", ("2024-01-03T10:00:00Z", "To Do", "In Progress"), status="In Progress"),
+    ]
+
+    flow = compute_cumulative_flow(
+        issues,
+        start=datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc),
+        end=datetime.datetime(2024, 1, 4, tzinfo=datetime.timezone.utc),
+        in_progress_statuses=["In Progress"],
+        done_statuses=["Closed"],
+    )
+
+    assert flow["statuses"] == ["To Do", "In Progress", "Closed"]
+    assert flow["counts"]["To Do"] == [2, 2, 1, 1]
+    assert flow["counts"]["In Progress"] == [0, 1, 1, 1]
+    assert flow["counts"]["Closed"] == [0, 0, 1, 1]
+
+
+def test_get_cumulative_flow_counts_issues_untouched_in_the_window():
+    from scripts.flow_service import get_cumulative_flow
+
+    queries = []
+    untouched = SimpleNamespace(
+        fields=SimpleNamespace(created="2020-01-01T10:00:00Z", status=SimpleNamespace(name="To Do")),
+        changelog=SimpleNamespace(histories=[]),
+    )
+
+    class FlowService:
+        def search_issues(self, jql, startAt=0, maxResults=50, fields=None, expand=None):
+            queries.append(jql)
+            return [untouched] if startAt == 0 else []
+
+    flow = get_cumulative_flow(FlowService(), "PROJ", days=3)
+
+    assert "updated" not in queries[0] and "created <=" in queries[0]
+    assert flow["counts"]["To Do"] == [1, 1, 1, 1]
+
+
+def test_cycle_time_distribution_rolling_matches_full_sort():
+    import numpy as np
+
+    from scripts.flow_service import CycleTimeDistribution
+
+    samples = {
+        "S1": [1.0, 2.0, 9.0],
+        "S2": [3.0, 4.0],
+        "S3": [0.5, 7.0, 2.0, 2.0],
+        "S4": [5.0],
+    }
+    distribution = CycleTimeDistribution(window=2)
+    # add newest first, as the sprint dataset does
+    for index, (name, values) in reversed(list(enumerate(samples.items()))):
+        distribution.add(SimpleNamespace(name=name, completeDate=f"2024-01-0{index + 1}"), values)
+
+    summary = distribution.summary()
+
+    assert [s["name"] for s in summary["sprints"]] == ["S1", "S2", "S3", "S4"]
+    assert summary["sprints"][0]["p50"] == 2.0
+    names = list(samples)
+    for index in range(len(names)):
+        window = [v for name in names[max(0, index - 1): index + 1] for v in samples[name]]
+        assert summary["rolling"]["p85"][index] == round(float(np.percentile(window, 85)), 2)
+    assert sum(summary["histogram"]["total"]) == 10
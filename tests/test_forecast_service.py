@@ -0,0 +1,68 @@
+import datetime
+import time
+
+import numpy as np
+
+from scripts.forecast_service import forecast_delivery, simulate_sprints_to_complete
+
+
+def _rows(throughputs):
+    return [
+        {"StartDate": "2024-01-01", "EndDate": "2024-01-15", "CompletedIssues": str(value)}
+        for value in throughputs
+    ]
+
+
+def test_simulate_sprints_to_complete_with_constant_throughput():
+    result = simulate_sprints_to_complete([0, 5, 6, 20], [5], trials=4, horizon=3)
+
+    assert result.shape == (4, 4)
+    assert np.all(result[:, 0] == 0)
+    assert np.all(result[:, 1] == 1)
+    assert np.all(result[:, 2] == 2)
+    assert np.all(np.isinf(result[:, 3]))
+
+
+def test_forecast_delivery_reports_epics_and_pooled_initiatives():
+    groups = [
+        {"group": "A", "epics": [{"key": "E-1", "total_issues": 10, "completed": 4}, {"key": "E-2", "total_issues": 6, "completed": 6}]},
+        {"group": "B", "epics": [{"key": "E-1", "total_issues": 10, "completed": 4}, {"key": "E-3", "total_issues": 9, "completed": 0}]},
+    ]
+
+    forecast = forecast_delivery(groups, _rows([3, 3]), trials=100, start=datetime.date(2024, 2, 1), seed=7)
+
+    epics = {entry["key"]: entry for entry in forecast["epics"]}
+    assert list(epics) == ["E-1", "E-2", "E-3"]
+    assert epics["E-1"]["sprints"] == {"p50": 2, "p85": 2, "p95": 2}
+    assert epics["E-1"]["dates"]["p85"] == "2024-02-29"
+    assert epics["E-2"]["sprints"]["p95"] == 0
+    group_b = forecast["initiatives"][1]
+    assert group_b["remaining"] == 15
+    assert group_b["sprints"]["p50"] == 5
+    assert forecast["sprint_length_days"] == 14
+
+
+def test_forecast_delivery_without_throughput_is_open_ended():
+    groups = [{"group": "A", "epics": [{"key": "E-1", "total_issues": 3, "completed": 0}]}]
+
+    forecast = forecast_delivery(groups, [{"StartDate": "2024-01-01", "EndDate": "2024-01-15"}], trials=10)
+
+    assert forecast["epics"][0]["sprints"]["p50"] is None
+    assert forecast["initiatives"][0]["dates"]["p95"] is None
+
+
+def test_forecast_delivery_scales_to_hundred_epics():
+    groups = [
+        {
+            "group": f"G{g}",
+            "epics": [{"key": f"E-{g * 10 + i}", "total_issues": 40 + i, "completed": i} for i in range(10)],
+        }
+        for g in range(10)
+    ]
+
+    started = time.perf_counter()
+    forecast = forecast_delivery(groups, _rows([8, 12, 3, 15, 9, 0, 11]), trials=10_000, seed=1)
+    elapsed = time.perf_counter() - started
+
+    assert len(forecast["epics"]) == 100
+    assert elapsed < 1.0
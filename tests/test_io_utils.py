@@ -5,6 +5,8 @@ import pytest
 
 from scripts.io_utils import (
     InitiativeLoadError,
+    collect_epic_keys,
+    index_epic_metrics,
     load_epic_keys_from_initiatives,
     load_initiatives,
     merge_initiatives_with_epic_metrics,
@@ -106,4 +108,24 @@ def test_merge_initiatives_with_epic_metrics_enriches_data():
     assert e2 == {"key": "E2"}
 
     # ensure original input not mutated
-    assert initiatives[0]["epics"][0].get("title") is None
\ No newline at end of file
+    assert initiatives[0]["epics"][0].get("title") is None
+
+
+def test_collect_epic_keys_dedupes_across_initiative_sets():
+    first = [{"group": "A", "epics": [{"key": "E1"}, {"key": "E2"}]}]
+    second = [{"group": "B", "epics": [{"key": "E2"}, {"key": "E3"}]}, {"group": "C", "epics": []}]
+
+    assert collect_epic_keys([first, second]) == ["E1", "E2", "E3"]
+
+
+def test_merge_initiatives_with_shared_epic_index():
+    index = index_epic_metrics([{"issue_number": "E1", "title": "Epic One", "total_issues": 2}])
+    first = [{"group": "A", "epics": [{"key": "E1"}]}]
+    second = [{"group": "B", "epics": [{"key": "E1", "note": "shared"}]}]
+
+    a = merge_initiatives_with_epic_metrics(first, epic_index=index)
+    b = merge_initiatives_with_epic_metrics(second, epic_index=index)
+
+    assert a[0]["epics"][0]["total"] == b[0]["epics"][0]["total"] == 2
+    assert b[0]["epics"][0]["note"] == "shared"
+    assert "title" not in first[0]["epics"][0]
@@ -0,0 +1,209 @@
+import json
+import threading
+from concurrent.futures import Future
+from types import SimpleNamespace
+
+from scripts import jira_client
+from scripts.jira_client import JiraService, MemoCache, RawRecord
+from scripts.sprint_service import compute_cycle_time
+
+
+def _raw_issue(key, status="Closed"):
+    return {
+        "key": key,
+        "fields": {
+            "summary": f"Issue {key}",
+            "status": {"name": status, "statusCategory": {"name": "Done"}},
+            "assignee": {"displayName": "Ada", "name": "ada"},
+            "customfield_10004": 3,
+        },
+        "changelog": {
+            "histories": [
+                {"created": "2024-01-01T00:00:00.000+0000", "items": [{"field": "status", "fromString": "To Do", "toString": "In Progress"}]},
+                {"created": "2024-01-03T00:00:00.000+0000", "items": [{"field": "status", "fromString": "In Progress", "toString": status}]},
+            ]
+        },
+    }
+
+
+class FakeSession:
+    def __init__(self, issues, changelogs=None):
+        self.issues = issues
+        self.changelogs = changelogs or {}
+        self.calls = []
+        self.changelog_calls = []
+
+    def get(self, url, params):
+        start, size = params["startAt"], params["maxResults"]
+        if url.endswith("/changelog"):
+            key = url.split("/")[-2]
+            self.changelog_calls.append((key, start))
+            values = self.changelogs[key]
+            body = {"startAt": start, "total": len(values), "values": values[start:start + size]}
+        else:
+            self.calls.append(params)
+            body = {"startAt": start, "total": len(self.issues), "issues": self.issues[start:start + size]}
+        return SimpleNamespace(content=json.dumps(body).encode(), raise_for_status=lambda: None)
+
+
+class FakeClient:
+    def __init__(self, issues, changelogs=None):
+        self._session = FakeSession(issues, changelogs)
+        self.object_calls = 0
+
+    def _get_url(self, path):
+        return f"http://jira.local/rest/api/2/{path}"
+
+    def search_issues(self, *args, **kwargs):
+        self.object_calls += 1
+        return []
+
+
+def test_raw_search_pages_until_total_and_reads_like_resources(monkeypatch):
+    monkeypatch.setattr("scripts.jira_client.RAW_SEARCH_PAGE_SIZE", 2)
+    client = FakeClient([_raw_issue(f"A-{n}") for n in range(5)])
+    service = JiraService(client)
+
+    issues = service.search_issues("sprint = 1", maxResults=False, expand="changelog")
+
+    assert [issue.key for issue in issues] == ["A-0", "A-1", "A-2", "A-3", "A-4"]
+    assert [call["startAt"] for call in client._session.calls] == [0, 2, 4]
+    assert client._session.calls[0]["expand"] == "changelog"
+    assert issues[0].fields.status.statusCategory.name == "Done"
+    assert str(issues[0].fields.assignee) == "Ada"
+    assert getattr(issues[0].fields, "customfield_99999", None) is None
+    assert compute_cycle_time(issues[0]) == 2
+    assert client.object_calls == 0
+
+
+def test_raw_search_respects_max_results():
+    client = FakeClient([_raw_issue(f"A-{n}") for n in range(5)])
+
+    issues = JiraService(client).search_issues("sprint = 1", maxResults=3)
+
+    assert len(issues) == 3
+    assert client._session.calls[0]["maxResults"] == 3
+
+
+def test_raw_search_falls_back_to_object_path():
+    client = FakeClient([])
+
+    def broken_get(url, params):
+        raise RuntimeError("boom")
+
+    client._session.get = broken_get
+    service = JiraService(client)
+
+    assert service.search_issues("sprint = 1") == []
+    assert client.object_calls == 1
+    service.search_issues("sprint = 1")
+    assert client.object_calls == 2
+
+
+def test_raw_record_renders_like_a_resource():
+    record = RawRecord(displayName="Ada", name="ada")
+
+    assert str(record) == "Ada"
+    assert str(RawRecord(name="Closed")) == "Closed"
+
+
+def _history(history_id, created, to_status):
+    return {"id": str(history_id), "created": created, "items": [{"field": "status", "toString": to_status}]}
+
+
+def test_truncated_changelogs_are_completed_from_paged_endpoint(monkeypatch):
+    monkeypatch.setattr("scripts.jira_client.CHANGELOG_PAGE_SIZE", 2)
+    full = [
+        _history(1, "2024-01-01T00:00:00.000+0000", "In Progress"),
+        _history(2, "2024-01-02T00:00:00.000+0000", "Review"),
+        _history(3, "2024-01-04T00:00:00.000+0000", "Closed"),
+    ]
+    truncated = _raw_issue("A-1")
+    truncated["changelog"] = {"startAt": 0, "maxResults": 1, "total": 3, "histories": full[:1]}
+    complete = _raw_issue("A-2")
+    complete["changelog"]["total"] = 2
+    client = FakeClient([truncated, complete], changelogs={"A-1": full})
+    service = JiraService(client, changelog_workers=2)
+
+    issues = service.search_issues("sprint = 1", maxResults=False, expand="changelog")
+
+    assert [history.id for history in issues[0].changelog.histories] == ["1", "2", "3"]
+    assert compute_cycle_time(issues[0]) == 3
+    assert client._session.changelog_calls == [("A-1", 0), ("A-1", 2)]
+    assert service.changelog_counters == {"checked": 2, "truncated": 1, "histories_fetched": 3, "fallbacks": 0}
+
+
+def test_truncated_changelog_falls_back_to_issue_read():
+    history = SimpleNamespace(id="2", created="2024-01-02T00:00:00.000+0000", items=[])
+    changelog = SimpleNamespace(total=2, histories=[SimpleNamespace(id="1", created="2024-01-01T00:00:00.000+0000", items=[])])
+    issue = SimpleNamespace(key="A-1", changelog=changelog)
+
+    class ObjectClient:
+        def search_issues(self, *args, **kwargs):
+            return [issue]
+
+        def issue(self, key, expand=None):
+            return SimpleNamespace(changelog=SimpleNamespace(histories=[changelog.histories[0], history]))
+
+    service = JiraService(ObjectClient())
+    service.search_issues("sprint = 1", expand="changelog")
+
+    assert [entry.id for entry in issue.changelog.histories] == ["1", "2"]
+    assert service.changelog_counters["fallbacks"] == 1
+
+
+def test_memo_coalesces_concurrent_requests_and_counts_hits(monkeypatch):
+    calls = []
+    # The loader returns only once the three other callers are waiting on its
+    # in-flight future, so all four requests overlap on every run.
+    waiting = threading.Barrier(4, timeout=5)
+
+    class WaitedFuture(Future):
+        def result(self, timeout=None):
+            waiting.wait()
+            return super().result(timeout)
+
+    monkeypatch.setattr(jira_client, "Future", WaitedFuture)
+
+    class SlowClient:
+        def issue(self, key, expand=None):
+            calls.append(key)
+            waiting.wait()
+            return SimpleNamespace(key=key)
+
+        def client_info(self):
+            calls.append("info")
+            return "http://jira.local"
+
+    service = JiraService(SlowClient())
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(service.issue("EPIC-1"))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert calls == ["EPIC-1"]
+    assert len({id(result) for result in results}) == 1
+    service.issue("EPIC-1")
+    service.client_info()
+    service.client_info()
+    assert calls == ["EPIC-1", "info"]
+    assert service.memo_counters == {"hits": 2, "misses": 2, "coalesced": 3, "size": 2}
+
+
+def test_memo_is_bounded_and_does_not_cache_failures():
+    memo = MemoCache(max_entries=2)
+    for key in ("a", "b", "c"):
+        memo.get(key, lambda key=key: key.upper())
+    assert memo.counters()["size"] == 2
+    assert memo.get("a", lambda: "again") == "again"
+
+    def boom():
+        raise RuntimeError("down")
+
+    try:
+        memo.get("x", boom)
+    except RuntimeError:
+        pass
+    assert memo.get("x", lambda: "ok") == "ok"
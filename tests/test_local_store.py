@@ -0,0 +1,119 @@
+from types import SimpleNamespace
+
+from scripts.epic_service import get_epics_dataset, get_epics_dataset_from_store
+from scripts.local_store import open_store, parse_sprint_ids, to_utc_timestamp
+from scripts.sprint_service import (
+    get_sprint_creep_from_store,
+    get_sprint_dataset,
+    get_sprint_dataset_from_store,
+)
+
+
+def _history(created, *items):
+    return SimpleNamespace(created=created, items=list(items))
+
+
+def _status(to):
+    return SimpleNamespace(field="status", fromString=None, toString=to)
+
+
+def _issue(key, category="Done", points=3, histories=None, with_changelog=True):
+    status = SimpleNamespace(name=category, statusCategory=SimpleNamespace(name=category))
+    fields = SimpleNamespace(summary=key, status=status, customfield_10004=points, assignee=None)
+    changelog = SimpleNamespace(histories=histories or []) if with_changelog else None
+    return SimpleNamespace(key=key, fields=fields, changelog=changelog)
+
+
+class FakeService:
+    def __init__(self, issues):
+        self._issues = issues
+
+    def search_issues(self, *args, **kwargs):
+        return list(self._issues)
+
+    def issue(self, key, expand=None):
+        return SimpleNamespace(key=key, fields=SimpleNamespace(summary=f"Epic {key}"))
+
+    def client_info(self):
+        return "http://jira.local"
+
+
+def test_helpers_normalize_values():
+    assert to_utc_timestamp("2024-01-05T10:00:00.000+1000") == "2024-01-05T00:00:00"
+    assert to_utc_timestamp(None) is None
+    assert parse_sprint_ids("12, 14") == {12, 14}
+    assert parse_sprint_ids(None) == set()
+
+
+def test_sprint_dataset_from_store_matches_live_computation():
+    issues = [
+        _issue(
+            "A-1",
+            points=5,
+            histories=[
+                _history("2024-01-02T00:00:00Z", _status("In Progress")),
+                _history("2024-01-04T00:00:00Z", _status("Closed")),
+            ],
+        ),
+        _issue("A-2", points=2),
+    ]
+    sprint = SimpleNamespace(id=7, name="S7", state="closed", startDate="2024-01-01", endDate="2024-01-14")
+    store = open_store(":memory:")
+
+    live = get_sprint_dataset(FakeService(issues), [sprint], "customfield_10004", store=store)
+    local = get_sprint_dataset_from_store(store, [7])
+
+    assert live[0]["CompletedStoryPoints"] == local[0]["CompletedStoryPoints"] == 7
+    assert live[0]["AverageCycleTime"] == local[0]["AverageCycleTime"] == 2
+    assert local[0]["Name"] == "S7"
+    assert store.sprints(state="closed")[0]["id"] == 7
+
+
+def test_record_issue_replaces_transitions_on_update():
+    store = open_store(":memory:")
+    first = _issue("A-1", histories=[_history("2024-01-02T00:00:00Z", _status("In Progress"))])
+    second = _issue(
+        "A-1",
+        histories=[
+            _history("2024-01-02T00:00:00Z", _status("In Progress")),
+            _history("2024-01-03T00:00:00Z", _status("Closed")),
+        ],
+    )
+    store.record_issue(first, "customfield_10004")
+    store.record_issue(second, "customfield_10004")
+
+    count = store.connection.execute("SELECT COUNT(*) FROM status_transitions").fetchone()[0]
+    assert count == 2
+
+
+def test_sprint_creep_from_store():
+    store = open_store(":memory:")
+    sprint = SimpleNamespace(id=1, name="S1", state="active", startDate="2024-01-01T00:00:00Z")
+    store.record_sprint(sprint, board_id=9)
+    late = _issue(
+        "A-1",
+        category="To Do",
+        histories=[_history("2024-01-05T00:00:00Z", SimpleNamespace(field="Sprint", to="1", **{"from": ""}))],
+    )
+    early = _issue(
+        "A-2",
+        category="To Do",
+        histories=[_history("2023-12-30T00:00:00Z", SimpleNamespace(field="Sprint", to="1", **{"from": ""}))],
+    )
+    store.record_issues([late, early], "customfield_10004", sprint_id=1)
+
+    assert get_sprint_creep_from_store(store, 1) == [{"key": "A-1", "added_at": "2024-01-05 00:00", "points": 3}]
+
+
+def test_epic_metrics_from_store_matches_live_computation():
+    children = [
+        _issue("CEGBUPOL-1", category="Done", with_changelog=False),
+        _issue("ACXRM-1", category="Done", with_changelog=False),
+        _issue("CEGBUPOL-2", category="In Progress", with_changelog=False),
+    ]
+    store = open_store(":memory:")
+
+    live = get_epics_dataset(FakeService(children), ["EPIC-1"], store=store)
+    local = get_epics_dataset_from_store(store, ["EPIC-1"], "http://jira.local")
+
+    assert local == live
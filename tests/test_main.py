@@ -1,4 +1,5 @@
 import builtins
+import datetime
 import io
 import json
 from types import SimpleNamespace
@@ -7,6 +8,7 @@ import pytest
 
 from scripts import main
 from scripts.io_utils import InitiativeLoadError
+from scripts.sprint_service import build_issue_insight
 
 
 class DummyJira:
@@ -302,6 +304,37 @@ def test_get_sprint_insights_with_creep():
     assert ic["x_day"] == 5
 
 
+def test_build_issue_insight_ages_wip_and_counts_blocked_time():
+    def status(before, after):
+        return SimpleNamespace(field="status", fromString=before, toString=after)
+
+    histories = [
+        SimpleNamespace(created="2024-01-02T00:00:00Z", items=[status("To Do", "In Progress")]),
+        SimpleNamespace(created="2024-01-03T00:00:00Z", items=[SimpleNamespace(field="Flagged", toString="Impediment")]),
+        SimpleNamespace(created="2024-01-04T00:00:00Z", items=[status("In Progress", "Blocked")]),
+        SimpleNamespace(created="2024-01-05T00:00:00Z", items=[SimpleNamespace(field="Flagged", toString="")]),
+        SimpleNamespace(created="2024-01-06T00:00:00Z", items=[status("Blocked", "Closed")]),
+        SimpleNamespace(created="2024-01-07T00:00:00Z", items=[status("Closed", "In Progress")]),
+    ]
+    fields = SimpleNamespace(
+        summary="Issue",
+        status=SimpleNamespace(name="In Progress", statusCategory=SimpleNamespace(name="In Progress")),
+        customfield_10004=2,
+        assignee=None,
+    )
+    issue = SimpleNamespace(key="ISSUE-1", fields=fields, changelog=SimpleNamespace(histories=histories))
+    now = datetime.datetime(2024, 1, 9, 12, tzinfo=datetime.timezone.utc)
+    start = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+
+    data, creep = build_issue_insight(DummyJira(), issue, 1, start, "customfield_10004", now=now)
+
+    assert creep is None
+    assert data["days_in_status"] == 2.5
+    assert data["blocked_days"] == 3  # flagged 3rd-5th overlaps Blocked 4th-6th
+    assert data["is_blocked"] is False
+    assert data["reopen_count"] == 1
+
+
 def test_write_dataset_to_json(tmp_path, capsys):
     file_path = tmp_path / "out.json"
     data = {"hello": "world"}
@@ -493,3 +526,108 @@ def test_main_cli_task_active_sprint_custom_out(monkeypatch):
         assert json_called["filename"] == custom_active_sprint_file
     finally:
         sys.argv = old_argv
+
+
+def test_get_sprint_history_dataset_counts_creep():
+    sprint = SimpleNamespace(id=1, name="Sprint", startDate="2024-01-01T00:00:00Z", endDate="e", completeDate="c")
+    added_late = SimpleNamespace(
+        histories=[
+            SimpleNamespace(
+                created="2024-01-05T00:00:00Z",
+                items=[SimpleNamespace(field="Sprint", to="1", **{"from": ""})],
+            )
+        ]
+    )
+    issues = [
+        build_issue(summary="A", points=5, changelog=added_late),
+        build_issue(summary="B", category="In Progress", points=2),
+        build_issue(summary="C", points=3),
+    ]
+    jira = DummyJira(issues=issues)
+
+    dataset = main.get_sprint_history_dataset([sprint], jira)
+
+    assert dataset[0]["CompletedStoryPoints"] == 8
+    assert dataset[0]["ScopeCreepCount"] == 1
+    assert dataset[0]["CreepStoryPoints"] == 5
+
+
+def test_run_cli_epics_multiple_initiative_files_share_fetch(monkeypatch):
+    monkeypatch.setenv("JIRA_BOARD_ID", "123")
+    monkeypatch.setattr(main, "get_jira_credentials", lambda: ("url", "token"))
+    monkeypatch.setattr(main, "connect_jira", lambda *args, **kwargs: DummyJira())
+    initiatives = {
+        "a.json": [{"group": "A", "epics": [{"key": "E-1"}, {"key": "E-2"}]}],
+        "b.json": [{"group": "B", "epics": [{"key": "E-2"}, {"key": "E-3"}]}],
+    }
+    monkeypatch.setattr(main, "load_initiatives", lambda filename: initiatives[filename])
+    fetched = []
+
+    def fake_get_epics_dataset(jira, epic_keys, **kwargs):
+        fetched.append(list(epic_keys))
+        return [{"issue_number": key, "total_issues": 1} for key in epic_keys]
+
+    written = {}
+    monkeypatch.setattr(main, "get_epics_dataset", fake_get_epics_dataset)
+    monkeypatch.setattr(main, "write_dataset_to_json", lambda data, filename: written.setdefault(filename, data))
+
+    main.run_cli(task="epics_dataset", epics_out="epics.json", initiatives_files=["a.json", "b.json"])
+
+    assert fetched == [["E-1", "E-2", "E-3"]]
+    assert sorted(written) == ["epics_a.json", "epics_b.json"]
+    assert [epic["total_issues"] for epic in written["epics_b.json"][0]["epics"]] == [1, 1]
+
+
+def test_get_sprint_dataset_batches_sprints_and_regroups_by_sprint_field():
+    def done_issue(key, points, sprint_value):
+        issue = build_issue(summary=key, points=points)
+        issue.fields.customfield_10005 = sprint_value
+        return issue
+
+    issues = [
+        done_issue("A", 5, ["com.atlassian.greenhopper.service.sprint.Sprint@1a[id=1,rapidViewId=9,name=S1]"]),
+        # carried over from sprint 1 into sprint 2: both per-sprint queries return it
+        done_issue("B", 3, [SimpleNamespace(id=1), SimpleNamespace(id=2)]),
+        done_issue("C", 2, [{"id": 3}]),
+    ]
+
+    class BatchJira(DummyJira):
+        def __init__(self):
+            super().__init__(issues=issues)
+            self.queries = []
+
+        def search_issues(self, jql, maxResults=None, expand=None):
+            self.queries.append(jql)
+            return list(self._issues)
+
+        def fields(self):
+            return [{"id": "customfield_10005", "schema": {"custom": "com.pyxis.greenhopper.jira:gh-sprint"}}]
+
+    jira = BatchJira()
+    sprints = [SimpleNamespace(id=n, name=f"S{n}") for n in (1, 2, 3)]
+
+    dataset = main.get_sprint_dataset(sprints, jira, batch_size=2)
+
+    assert jira.queries == [
+        "sprint in (1, 2) AND statusCategory = Done",
+        "sprint in (3) AND statusCategory = Done",
+    ]
+    assert [row["CompletedStoryPoints"] for row in dataset] == [8, 3, 2]
+    assert [row["CompletedIssues"] for row in dataset] == [2, 1, 1]
+
+
+def test_main_rejects_sprint_batch_size_with_creep(monkeypatch):
+    import sys
+
+    monkeypatch.setattr(main, "run_cli", lambda **kwargs: pytest.fail("run_cli must not start"))
+    monkeypatch.setattr(sys, "argv", ["main.py", "--sprint-batch-size", "5", "--with-creep"])
+    with pytest.raises(SystemExit):
+        main.main()
+
+
+def test_run_cli_rejects_initiatives_files_with_the_same_name(monkeypatch):
+    monkeypatch.setattr(main, "get_jira_credentials", lambda: pytest.fail("must fail before connecting"))
+    assert main.clashing_initiative_stems(["initiatives.json"]) == []
+
+    with pytest.raises(ValueError, match="repeated: initiatives"):
+        main.run_cli(task="epics_dataset", initiatives_files=["a/initiatives.json", "b/initiatives.json"])
@@ -0,0 +1,185 @@
+import pytest
+
+from scripts import publish_report
+
+
+class FakeConfluence:
+    def __init__(self, page=None):
+        self.page = page
+        self.gets = 0
+        self.created = []
+        self.attached = []
+        self.updated = []
+
+    def get(self, path, params=None):
+        self.gets += 1
+        return {"results": [self.page] if self.page else []}
+
+    def create_page(self, space, title, body, parent_id=None):
+        self.created.append(title)
+        return {"id": "100"}
+
+    def attach_file(self, filename, name=None, page_id=None, comment=None):
+        self.attached.append((name, comment))
+
+    def update_page(self, **kwargs):
+        self.updated.append(kwargs)
+
+
+def _write_report(tmp_path):
+    reports = tmp_path / "reports"
+    reports.mkdir()
+    (reports / "chart.png").write_bytes(b"png-bytes")
+    md_file = reports / "report.md"
+    md_file.write_text("# Report\n\n![Chart](chart.png)\n", encoding="utf-8")
+    return md_file, f"{reports}/"
+
+
+def test_publish_markdown_creates_page_and_uploads(tmp_path):
+    md_file, base = _write_report(tmp_path)
+    conf = FakeConfluence()
+
+    page_id = publish_report.publish_markdown(conf, str(md_file), "Report", "SPACE", "1", base)
+
+    assert page_id == "100"
+    assert conf.created == ["Report"]
+    assert conf.attached == [("chart.png", publish_report.content_hash(b"png-bytes"))]
+    body = conf.updated[0]["body"]
+    assert '<ri:attachment ri:filename="chart.png" />' in body
+    assert conf.updated[0]["version_comment"] == publish_report.content_hash(body)
+
+
+def test_publish_markdown_missing_file_leaves_no_page(tmp_path):
+    conf = FakeConfluence()
+
+    with pytest.raises(FileNotFoundError):
+        publish_report.publish_markdown(conf, str(tmp_path / "missing.md"), "Report", "SPACE")
+
+    assert conf.gets == 0 and conf.created == []
+
+
+def test_publish_markdown_skips_unchanged_content(tmp_path):
+    md_file, base = _write_report(tmp_path)
+    first = FakeConfluence()
+    publish_report.publish_markdown(first, str(md_file), "Report", "SPACE", None, base)
+
+    page = {
+        "id": "100",
+        "version": {"message": first.updated[0]["version_comment"]},
+        "children": {
+            "attachment": {
+                "results": [{"title": "chart.png", "metadata": {"comment": first.attached[0][1]}}],
+                "_links": {},
+            }
+        },
+    }
+    conf = FakeConfluence(page=page)
+
+    publish_report.publish_markdown(conf, str(md_file), "Report", "SPACE", None, base)
+
+    assert conf.gets == 1
+    assert conf.created == conf.attached == conf.updated == []
+
+
+def test_rewrite_images_single_pass_leaves_unknown_tags():
+    html = '<p><img src="a.png" alt="A" /><img src="b.png" alt="B" /><img src="a.png" /></p>'
+    result = publish_report.rewrite_images(html, {"a.png": "<A/>"})
+    assert result == '<p><A/><img src="b.png" alt="B" /><A/></p>'
+
+
+def test_publish_markdown_uploads_each_image_once(tmp_path):
+    md_file, base = _write_report(tmp_path)
+    (tmp_path / "reports" / "other.png").write_bytes(b"other")
+    md_file.write_text("![a](chart.png)\n![b](other.png)\n![c](chart.png)\n", encoding="utf-8")
+    conf = FakeConfluence()
+
+    publish_report.publish_markdown(conf, str(md_file), "Report", "SPACE", None, base.rstrip("/"), upload_workers=2)
+
+    assert sorted(name for name, _ in conf.attached) == ["chart.png", "other.png"]
+    assert "<img" not in conf.updated[0]["body"]
+
+
+def test_load_manifest_validates_entries(tmp_path):
+    import json
+
+    import pytest
+
+    manifest = tmp_path / "manifest.json"
+    manifest.write_text(json.dumps([{"file": "a.md", "title": "A", "parent": "1"}]), encoding="utf-8")
+    assert publish_report.load_manifest(manifest)[0]["parent"] == "1"
+
+    manifest.write_text(json.dumps([{"file": "a.md"}]), encoding="utf-8")
+    with pytest.raises(ValueError):
+        publish_report.load_manifest(manifest)
+
+
+def test_publish_batch_reports_timings_and_failures(tmp_path):
+    md_file, base = _write_report(tmp_path)
+    conf = FakeConfluence()
+    entries = [
+        {"file": str(md_file), "title": "Sprint"},
+        {"file": str(tmp_path / "missing.md"), "title": "Team"},
+    ]
+
+    results = publish_report.publish_batch(conf, entries, "SPACE", img_base_path=base, concurrency=2)
+
+    assert [r["title"] for r in results] == ["Sprint", "Team"]
+    assert results[0]["page_id"] == "100" and results[0]["error"] is None
+    assert results[1]["error"] and results[1]["page_id"] is None
+    assert all(r["seconds"] >= 0 for r in results)
+    assert publish_report.print_batch_summary(results) == 1
+
+
+def test_iter_markdown_sections_keeps_fenced_blocks_together():
+    lines = ["# A\n", "text\n", "```\n", "# not a heading\n", "```\n", "## B\n", "| x |\n"]
+    sections = list(publish_report.iter_markdown_sections(lines))
+    assert sections == ["# A\ntext\n```\n# not a heading\n```\n", "## B\n| x |\n"]
+
+
+def test_render_cache_reuses_renders_across_instances(tmp_path):
+    cache = publish_report.RenderCache(tmp_path)
+    html = cache.render("# Title\n")
+    assert cache.render("# Title\n") == html
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    other = publish_report.RenderCache(tmp_path)
+    assert other.render("# Title\n") == html
+    assert (other.hits, other.misses) == (1, 0)
+    assert sorted(path.suffix for path in tmp_path.iterdir()) == [".html"]
+    assert other.key("# Title\n", ["tables"]) != other.key("# Title\n", ["tables", "fenced-code-blocks"])
+
+
+def test_pooled_session_carries_tls_verification():
+    assert publish_report.pooled_session(4).verify is True
+    assert publish_report.pooled_session(4, verify=False).verify is False
+
+
+def test_publish_markdown_renders_whole_document_unless_chunked(tmp_path):
+    import datetime
+
+    from scripts.report_renderer import render_sprint_insights, render_team_insights
+    from tests.test_report_renderer import _active_sprint
+
+    rows = [{"Name": "S1", "StartDate": "2024-01-01T09:00:00.000Z", "CompletedStoryPoints": "13.0"}]
+    reports = [
+        render_sprint_insights(_active_sprint(), today=datetime.date(2024, 3, 8)),
+        render_team_insights(rows, "chart.png", today=datetime.date(2024, 3, 8)),
+    ]
+    for index, report in enumerate(reports):
+        md_file = tmp_path / f"report-{index}.md"
+        md_file.write_text(report, encoding="utf-8")
+        whole = publish_report.RenderCache().render(report)
+        chunked = "".join(
+            publish_report.RenderCache().render(section)
+            for section in publish_report.iter_markdown_sections(report.splitlines(True))
+        )
+        # markdown2 output differs between the two for these reports (nested
+        # headings, dropped blank lines), which is why chunking is opt-in.
+        assert chunked != whole
+
+        conf = FakeConfluence()
+        publish_report.publish_markdown(conf, str(md_file), "Report", "SPACE", img_base_path=f"{tmp_path}/")
+        assert conf.updated[0]["body"] == whole
+        conf = FakeConfluence()
+        publish_report.publish_markdown(conf, str(md_file), "Report", "SPACE", img_base_path=f"{tmp_path}/", chunked=True)
+        assert conf.updated[0]["body"] == chunked
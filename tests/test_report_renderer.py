@@ -0,0 +1,73 @@
+import datetime
+
+from scripts.report_renderer import (
+    markdown_table,
+    rag_status,
+    render_initiative_insights,
+    render_sprint_insights,
+    render_team_insights,
+    working_days_left,
+    write_report,
+)
+
+
+def _active_sprint():
+    return {
+        "sprint_info": {
+            "name": "Polaris 12",
+            "start": "2024-03-04T09:00:00.000Z",
+            "end": "2024-03-15T17:00:00.000Z",
+            "jira_base_url": "https://jira.local",
+        },
+        "metrics": {"total_issues": 2},
+        "stages": {"To Do": 1, "In Progress": 0, "Done": 1},
+        "points": {"total": 8.0, "completed": 5.0, "remaining": 3.0},
+        "issue_collection": [
+            {"key": "T-1", "title": "Pay | refund", "assignee": "Ada", "points": 5, "status": "Done", "is_creep": False, "epic_key": "E-1", "epic_title": "Payments"},
+            {"key": "T-2", "title": "Audit", "assignee": "Unassigned", "points": 3.0, "status": "To Do", "is_creep": True, "epic_key": None, "epic_title": None},
+        ],
+    }
+
+
+def test_render_sprint_insights_fills_tabular_sections():
+    report = render_sprint_insights(_active_sprint(), today=datetime.date(2024, 3, 8))
+
+    assert "- Start Date: 04-Mar-2024" in report
+    assert "- Days Remaining: 4" in report
+    assert "- Points Completed: 5" in report
+    assert "<!-- narrative: insights -->" in report
+    assert "| [Payments](https://jira.local/browse/E-1) | [T-1](https://jira.local/browse/T-1) | Pay \\| refund | Ada | 5 | Done | No |" in report
+    assert "|  | [T-2](https://jira.local/browse/T-2) | Audit | Unassigned | 3 | To Do | Yes |" in report
+
+
+def test_render_sprint_insights_uses_template_from_config(tmp_path, monkeypatch):
+    monkeypatch.setenv("TEAM_BEACON_CONFIG_DIR", str(tmp_path))
+    (tmp_path / "templates").mkdir()
+    (tmp_path / "templates" / "sprint_insights.md").write_text("$name: $points_remaining left", encoding="utf-8")
+
+    assert render_sprint_insights(_active_sprint()) == "Polaris 12: 3 left"
+
+
+def test_render_team_and_initiative_insights(tmp_path, monkeypatch):
+    monkeypatch.setenv("TEAM_BEACON_REPORTS_DIR", str(tmp_path))
+    rows = [{"Name": "S1", "StartDate": "2024-01-01T09:00:00.000Z", "CompletedStoryPoints": "13.0"}]
+    groups = [
+        {"group": "A", "epics": [{"key": "E-1", "title": "Checkout", "link": "https://jira.local/browse/E-1", "total_issues": 10, "percentage_done": 70.4, "percentage_inprogress": 19.6, "percentage_todo": 10}]},
+        {"group": "B", "epics": [{"key": "E-1"}, {"key": "E-2"}]},
+    ]
+
+    team = render_team_insights(rows, "velocity_cycle_time.png", today=datetime.date(2024, 3, 8))
+    initiatives = render_initiative_insights(groups)
+
+    assert team.startswith("# Team Insights (2024-03-08)")
+    assert "| S1 | 2024-01-01 | 13.0 |" in team
+    assert "![Velocity and cycle time](velocity_cycle_time.png)" in team
+    assert initiatives.strip().splitlines()[2] == "| [E-1](https://jira.local/browse/E-1) | Checkout | 10 | **70%** | **20%** | **10%** | 🟢 Green |  |"
+    assert len(initiatives.strip().splitlines()) == 3
+    assert write_report(team, "Report-Team-Insights.md") == tmp_path / "Report-Team-Insights.md"
+
+
+def test_rag_status_and_working_days():
+    assert [rag_status(value) for value in (20, 40, 66, 67)] == ["🔴 Red", "🟠 Amber", "🟠 Amber", "🟢 Green"]
+    assert working_days_left("2024-03-15", today=datetime.date(2024, 3, 15)) == 0
+    assert markdown_table(("A",), [(None,)]).splitlines()[-1] == "|  |"
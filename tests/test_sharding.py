@@ -0,0 +1,87 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from scripts import main
+from scripts.sharding import ShardMergeError, Shard, merge_epic_shards, merge_sprint_shards, parse_shard
+
+
+def test_shards_partition_units_deterministically():
+    keys = [f"EPIC-{n}" for n in range(200)]
+    shards = [Shard(index, 3) for index in (1, 2, 3)]
+
+    selections = [shard.select(keys) for shard in shards]
+
+    assert sorted(key for selection in selections for key in selection) == sorted(keys)
+    assert all(selection for selection in selections)
+    assert selections[1] == Shard(2, 3).select(list(reversed(keys)))[::-1]
+    assert Shard(2, 3).filename("sprints_dataset.csv") == "sprints_dataset.shard-2-of-3.csv"
+
+
+@pytest.mark.parametrize("value", ["0/2", "3/2", "2", "a/b", ""])
+def test_parse_shard_rejects_invalid_specs(value):
+    with pytest.raises(ValueError):
+        parse_shard(value)
+
+
+def test_merge_requires_every_shard(tmp_path, monkeypatch):
+    monkeypatch.setenv("TEAM_BEACON_DATA_DIR", str(tmp_path))
+    (tmp_path / "epics.shard-1-of-2.json").write_text(json.dumps([{"issue_number": "E-1"}]), encoding="utf-8")
+
+    assert merge_sprint_shards("sprints.csv") is None
+    with pytest.raises(ShardMergeError):
+        merge_epic_shards("epics.json")
+
+    (tmp_path / "epics.shard-2-of-2.json").write_text(json.dumps([{"issue_number": "E-2"}]), encoding="utf-8")
+    assert [record["issue_number"] for record in merge_epic_shards("epics.json")] == ["E-1", "E-2"]
+
+
+class ShardJira:
+    def __init__(self, closed):
+        self.closed = closed
+        self.queries = []
+
+    def sprints(self, board_id, state=None, startAt=0, maxResults=50):
+        return self.closed[startAt:startAt + maxResults]
+
+    def search_issues(self, jql, maxResults=None, expand=None):
+        self.queries.append(jql)
+        status = SimpleNamespace(name="Done", statusCategory=SimpleNamespace(name="Done"))
+        fields = SimpleNamespace(summary="T", status=status, customfield_10004=2, assignee=None)
+        return [SimpleNamespace(key="T-1", fields=fields, changelog=SimpleNamespace(histories=[]))]
+
+    def client_info(self):
+        return "http://jira.local"
+
+
+def test_run_cli_shards_then_merges_sprint_dataset(tmp_path, monkeypatch):
+    monkeypatch.setenv("TEAM_BEACON_DATA_DIR", str(tmp_path))
+    monkeypatch.setenv("JIRA_BOARD_ID", "123")
+    monkeypatch.setattr(main, "get_jira_credentials", lambda: ("url", "token"))
+    monkeypatch.setattr(main, "plot_velocity_cycle_time", lambda **kwargs: None)
+    closed = [SimpleNamespace(id=n, name=f"S{n}", startDate=f"2024-01-{n:02d}") for n in range(1, 9)]
+    clients = []
+
+    def connect(*args, **kwargs):
+        clients.append(ShardJira(closed))
+        return clients[-1]
+
+    monkeypatch.setattr(main, "connect_jira", connect)
+
+    for shard in ("1/2", "2/2"):
+        main.run_cli(task="sprints_dataset", sprints_out="sprints.csv", sprint_count=8, shard=shard)
+    assert not (tmp_path / "sprints.csv").exists()
+    assert all(client.queries for client in clients)
+    assert sum(len(client.queries) for client in clients) == 8
+
+    def no_jira(*args, **kwargs):
+        raise AssertionError("merge must not need Jira")
+
+    monkeypatch.setattr(main, "get_jira_credentials", no_jira)
+    monkeypatch.setattr(main, "connect_jira", no_jira)
+    main.run_cli(task="merge", sprints_out="sprints.csv", epics_out="epics.json")
+
+    rows = main.load_sprint_rows("sprints.csv")
+    assert [row["Name"] for row in rows] == [f"S{n}" for n in range(8, 0, -1)]
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["sprints.csv"]
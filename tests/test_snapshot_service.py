@@ -0,0 +1,89 @@
+import copy
+import datetime
+import json
+from types import SimpleNamespace
+
+from scripts.local_store import open_store
+from scripts.snapshot_service import board_snapshot_at, record_sprint_snapshot, sprint_snapshot_at
+from scripts.sprint_service import issue_ages, remaining_days
+
+
+def _dataset(issue_count=60):
+    return {
+        "sprint_info": {"name": "Sprint 7", "start": "2024-03-04T09:00:00Z", "end": "2024-03-15T17:00:00+00:00", "remaining_days": 10},
+        "metrics": {"total_issues": issue_count, "scope_creep_count": 0, "creep_points": 0},
+        "stages": {"To Do": issue_count, "In Progress": 0, "Done": 0},
+        "points": {"total": 3.0 * issue_count, "completed": 0.0, "remaining": 3.0 * issue_count},
+        "issue_collection": [
+            {
+                "key": f"T-{n}",
+                "title": f"Implement part {n} of the new checkout flow",
+                "assignee": "Ada Lovelace",
+                "status": "To Do",
+                "category": "To Do",
+                "points": 3,
+                "is_creep": False,
+                "epic_key": "E-1",
+                "epic_title": "Checkout",
+                "days_in_status": 0.0,
+                "blocked_days": 0.0,
+                "is_blocked": False,
+                "status_since": "2024-03-01T09:00:00+00:00",
+                "blocked_since": "2024-03-01T09:00:00+00:00" if n % 10 == 0 else None,
+                "past_blocked_days": 0.5,
+            }
+            for n in range(issue_count)
+        ],
+        "creep_issues": [],
+    }
+
+
+def test_hourly_snapshots_rebuild_any_hour_and_stay_small():
+    store = open_store(":memory:")
+    start = datetime.datetime(2024, 3, 4, 9, tzinfo=datetime.timezone.utc)
+    dataset = _dataset()
+    history = {}
+    full_size = 0
+    for hour in range(240):
+        taken_at = start + datetime.timedelta(hours=hour)
+        issue = dataset["issue_collection"][hour % 60]
+        issue["status"] = issue["category"] = "Done" if issue["category"] == "In Progress" else "In Progress"
+        issue["status_since"] = taken_at.isoformat()
+        dataset["stages"]["Done"] = sum(1 for item in dataset["issue_collection"] if item["category"] == "Done")
+        if hour == 100:
+            dataset["issue_collection"].pop(0)
+            dataset["issue_collection"].append({**issue, "key": "T-99", "is_creep": True})
+        # Every open issue ages and the sprint end draws nearer each hour.
+        dataset["sprint_info"]["remaining_days"] = remaining_days(dataset["sprint_info"]["end"], taken_at)
+        for item in dataset["issue_collection"]:
+            item.update(issue_ages(item, taken_at))
+        assert record_sprint_snapshot(store, 7, dataset, taken_at)
+        history[hour] = copy.deepcopy(dataset)
+        full_size += len(json.dumps(dataset))
+
+    assert not record_sprint_snapshot(store, 7, dataset, start + datetime.timedelta(hours=240))
+    stored_size = store.connection.execute("SELECT SUM(LENGTH(payload)) FROM sprint_snapshots").fetchone()[0]
+    assert stored_size * 100 < full_size
+
+    for hour in (0, 57, 100, 101, 239):
+        at = start + datetime.timedelta(hours=hour, minutes=30)
+        assert sprint_snapshot_at(store, 7, at) == history[hour]
+    assert sprint_snapshot_at(store, 7, start - datetime.timedelta(hours=1)) is None
+    assert sprint_snapshot_at(store, 7) == history[239]
+
+
+def test_board_snapshot_at_picks_sprint_running_at_that_time():
+    store = open_store(":memory:")
+    for sprint_id, start in ((1, "2024-02-19T09:00:00Z"), (2, "2024-03-04T09:00:00Z")):
+        store.record_sprint(SimpleNamespace(id=sprint_id, name=f"S{sprint_id}", state="closed", startDate=start), 5)
+        dataset = _dataset(2)
+        dataset["sprint_info"]["name"] = f"S{sprint_id}"
+        record_sprint_snapshot(store, sprint_id, dataset, start)
+
+    assert board_snapshot_at(store, 5, "2024-02-25T12:00:00Z")["sprint_info"]["name"] == "S1"
+    assert board_snapshot_at(store, 5, "2024-03-05T12:00:00Z")["sprint_info"]["name"] == "S2"
+    assert board_snapshot_at(store, 5, "2024-01-01T00:00:00Z") is None
+
+    # A newer sprint that started without any recorded snapshot is skipped.
+    store.record_sprint(SimpleNamespace(id=3, name="S3", state="active", startDate="2024-03-18T09:00:00Z"), 5)
+    assert board_snapshot_at(store, 5, "2024-03-19T12:00:00Z")["sprint_info"]["name"] == "S2"
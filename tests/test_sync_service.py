@@ -0,0 +1,184 @@
+from types import SimpleNamespace
+
+from scripts.local_store import open_store
+from scripts.sync_service import build_delta_jql, search_all_pages, sync_board
+
+
+def _issue(key, updated, category="To Do"):
+    status = SimpleNamespace(name=category, statusCategory=SimpleNamespace(name=category))
+    fields = SimpleNamespace(summary=key, status=status, customfield_10004=1, assignee=None, updated=updated)
+    return SimpleNamespace(key=key, fields=fields, changelog=SimpleNamespace(histories=[]))
+
+
+class PagedService:
+    def __init__(self, pages, sprint=None):
+        self.pages = list(pages)
+        self.queries = []
+        self.sprint_calls = 0
+        self.sprint = sprint or SimpleNamespace(id=5, name="S5", state="active", startDate="2024-01-01")
+
+    def search_issues(self, jql, startAt=0, maxResults=50, expand=None, fields=None):
+        self.queries.append((jql, startAt, expand))
+        return self.pages.pop(0) if self.pages else []
+
+    def sprints(self, board_id, state=None):
+        self.sprint_calls += 1
+        return [self.sprint]
+
+
+def test_build_delta_jql_applies_overlap():
+    assert build_delta_jql("sprint = 1", None) == "sprint = 1"
+    assert (
+        build_delta_jql("sprint = 1", "2024-03-01T10:30:00.000+1100")
+        == '(sprint = 1) AND updated >= "2024/03/01 10:29"'
+    )
+
+
+def test_search_all_pages_follows_start_at():
+    service = PagedService([[1, 2], [3, 4], [5]])
+    assert search_all_pages(service, "jql", page_size=2) == [1, 2, 3, 4, 5]
+    assert [start for _, start, _ in service.queries] == [0, 2, 4]
+
+
+def test_sync_board_advances_watermark_and_merges():
+    store = open_store(":memory:")
+    service = PagedService(
+        [
+            [_issue("A-1", "2024-03-01T10:00:00.000+0000"), _issue("A-2", "2024-03-01T11:00:00.000+0000")],
+            [_issue("A-2", "2024-03-01T12:00:00.000+0000", category="Done")],
+        ]
+    )
+
+    first = sync_board(service, store, 9, "customfield_10004")
+    second = sync_board(service, store, 9, "customfield_10004")
+
+    assert len(first) == 2 and len(second) == 1
+    assert service.queries[0][0] == "sprint = 5"
+    assert service.queries[1][0] == '(sprint = 5) AND updated >= "2024/03/01 10:59"'
+    assert service.queries[1][2] == "changelog"
+    assert store.get_watermark(9) == "2024-03-01T12:00:00.000+0000"
+    row = store.connection.execute("SELECT status_category FROM issues WHERE key = 'A-2'").fetchone()
+    assert row[0] == "Done"
+    # active sprint list is served from the store on the second sync
+    assert service.sprint_calls == 1
+
+
+def test_watch_active_sprint_rewrites_only_on_change(tmp_path, monkeypatch):
+    from scripts import sync_service
+
+    writes = []
+    monkeypatch.setattr(sync_service, "write_dataset_to_json", lambda data, filename: writes.append(data))
+
+    sprint = SimpleNamespace(id=5, name="S5", state="active", startDate="2024-01-01T00:00:00Z")
+    pages = [
+        [_issue("A-1", "2024-03-01T10:00:00.000+0000")],
+        [],
+        [_issue("A-1", "2024-03-01T11:00:00.000+0000", category="Done")],
+    ]
+
+    class WatchService(PagedService):
+        def issue(self, key, expand=None):
+            raise AssertionError("no epic lookups expected")
+
+        def client_info(self):
+            return "http://jira.local"
+
+    service = WatchService(pages, sprint=sprint)
+    sleeps = []
+    store = open_store(":memory:")
+
+    sync_service.watch_active_sprint(
+        service,
+        store,
+        9,
+        "customfield_10004",
+        "active.json",
+        interval=60,
+        max_ticks=3,
+        sleep=sleeps.append,
+        clock=lambda: 0.0,
+    )
+
+    assert len(writes) == 2
+    assert writes[0]["stages"]["To Do"] == 1
+    assert writes[1]["stages"]["Done"] == 1
+    assert writes[1]["metrics"]["total_issues"] == 1
+    assert sleeps == [60, 120]
+
+
+def test_watch_active_sprint_first_tick_fetches_whole_sprint(monkeypatch):
+    from scripts import sync_service
+
+    writes = []
+    monkeypatch.setattr(sync_service, "write_dataset_to_json", lambda data, filename: writes.append(data))
+    store = open_store(":memory:")
+    sprint = SimpleNamespace(id=5, name="S5", state="active", startDate="2024-01-01T00:00:00Z")
+    # An earlier sync left a watermark and membership for the sprint.
+    sync_board(PagedService([[_issue("A-1", "2024-03-01T10:00:00.000+0000")]], sprint=sprint), store, 9, "customfield_10004")
+
+    class WatchService(PagedService):
+        def client_info(self):
+            return "http://jira.local"
+
+    service = WatchService(
+        [[_issue("A-1", "2024-03-01T10:00:00.000+0000"), _issue("A-2", "2024-03-01T09:00:00.000+0000")]],
+        sprint=sprint,
+    )
+    sync_service.watch_active_sprint(
+        service, store, 9, "customfield_10004", "active.json", interval=60, max_ticks=1, sleep=lambda _: None
+    )
+
+    assert service.queries[0][0] == "sprint = 5"
+    assert writes[0]["metrics"]["total_issues"] == 2
+
+
+def test_sync_board_recheck_prunes_departed_issues_and_closes_ended_sprints():
+    store = open_store(":memory:")
+    service = PagedService(
+        [
+            [_issue("A-1", "2024-03-01T10:00:00.000+0000"), _issue("A-2", "2024-03-01T11:00:00.000+0000")],
+            [],
+            [SimpleNamespace(key="A-1")],
+        ]
+    )
+    sync_board(service, store, 9, "customfield_10004")
+    store.record_sprint(SimpleNamespace(id=4, name="S4", state="active", startDate="2024-01-01"), 9)
+
+    sync_board(service, store, 9, "customfield_10004", refresh_sprints=True)
+
+    members = store.connection.execute("SELECT issue_key FROM sprint_issues WHERE sprint_id = 5").fetchall()
+    assert [row[0] for row in members] == ["A-1"]
+    assert service.queries[-1][0] == "sprint = 5"
+    assert [row["id"] for row in store.sprints(9, state="active")] == [5]
+    assert service.sprint_calls == 2
+
+
+def test_watch_active_sprint_ages_unchanged_issues(monkeypatch):
+    import datetime
+
+    from scripts import sync_service
+
+    writes = []
+    monkeypatch.setattr(sync_service, "write_dataset_to_json", lambda data, filename: writes.append(data))
+    issue = _issue("A-1", "2024-03-01T10:00:00.000+0000", category="In Progress")
+    issue.fields.created = "2024-03-01T00:00:00+00:00"
+
+    class WatchService(PagedService):
+        def client_info(self):
+            return "http://jira.local"
+
+    sprint = SimpleNamespace(id=5, name="S5", state="active", startDate="2024-01-01T00:00:00Z")
+    days = iter(range(2, 5))
+    sync_service.watch_active_sprint(
+        WatchService([[issue]], sprint=sprint),
+        open_store(":memory:"),
+        9,
+        "customfield_10004",
+        "active.json",
+        interval=60,
+        max_ticks=3,
+        sleep=lambda _: None,
+        wall_clock=lambda: datetime.datetime(2024, 3, next(days), tzinfo=datetime.timezone.utc),
+    )
+
+    assert [data["issue_collection"][0]["days_in_status"] for data in writes] == [1.0, 2.0, 3.0]